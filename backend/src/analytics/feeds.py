@@ -0,0 +1,118 @@
+"""
+Reference data feeds, such as spot prices and FX rates: loading of the files dropped on the
+server, and per-process caches kept consistent across workers.
+"""
+
+import asyncio
+import csv
+import shutil
+from collections.abc import Awaitable, Callable, Sequence
+from logging import Logger
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.feed_version import get_feed_version
+from utils.logger import get_logger
+
+logger: Logger = get_logger(__name__)
+
+FEED_FILE_SUFFIXES = (".csv", ".json")
+LOADED_DIR = "loaded"
+FAILED_DIR = "failed"
+
+
+def parse_feed_file(path: Path, adapter: TypeAdapter[list[Any]]) -> list[BaseModel]:
+    """
+    Parse a feed file: CSV with a header naming the fields, or a JSON array of objects.
+
+    Raises:
+        ValueError: If the file is not valid
+    """
+    if path.suffix == ".json":
+        return adapter.validate_json(path.read_bytes())
+
+    with path.open(newline="", encoding="utf-8-sig") as file:
+        return adapter.validate_python(list(csv.DictReader(file)))
+
+
+async def load_dropped_files(
+    session: AsyncSession,
+    drop_dir: Path,
+    adapter: TypeAdapter[list[Any]],
+    store: Callable[[AsyncSession, Sequence[dict[str, Any]]], Awaitable[None]],
+) -> int:
+    """
+    Load the feed files waiting in `drop_dir`, oldest name first, one transaction each.
+
+    Loaded files are moved to its `loaded` subdirectory and invalid ones to `failed`, so each
+    file is read once. Writers must create files under another suffix and rename them when
+    complete, or a half-written file may be picked up.
+
+    Returns:
+        The number of records loaded
+    """
+    if not drop_dir.is_dir():
+        return 0
+
+    loaded: int = 0
+    for path in sorted(path for path in drop_dir.iterdir() if path.suffix in FEED_FILE_SUFFIXES and path.is_file()):
+        try:
+            records: list[BaseModel] = parse_feed_file(path, adapter)
+        except (ValueError, csv.Error):
+            logger.exception("Invalid feed file %s", path)
+            move_to(path, FAILED_DIR)
+            continue
+
+        await store(session, [record.model_dump() for record in records])
+        await session.commit()
+        move_to(path, LOADED_DIR)
+        loaded += len(records)
+        logger.info("Loaded %d records from %s", len(records), path)
+
+    return loaded
+
+
+def move_to(path: Path, directory: str) -> None:
+    target_dir: Path = path.parent / directory
+    target_dir.mkdir(exist_ok=True)
+    shutil.move(path, target_dir / path.name)
+
+
+class FeedCache:
+    """
+    Per-process copy of a feed, reloaded whenever the feed's version changes.
+
+    Each read checks the version with one primary key lookup, so a load committed by any
+    worker is seen by every worker on its next read, however many values the copy then
+    serves. Concurrent reloads share one query.
+    """
+
+    def __init__(self, feed: str, load: Callable[[AsyncSession], Awaitable[Any]]) -> None:
+        self.feed: str = feed
+        self._load = load
+        self._value: Any = None
+        self._version: int | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def get(self, session: AsyncSession) -> Any:
+        """The feed as returned by its load function."""
+        version: int = await get_feed_version(session, self.feed)
+        if self._value is not None and self._version == version:
+            return self._value
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._value is not None and self._version == version:
+                return self._value
+
+            # Read after the version, so the copy is at least as recent as the version it is kept for
+            value: Any = await self._load(session)
+            self._value, self._version = value, version
+            return value
+
+    def invalidate(self) -> None:
+        self._value = self._version = None
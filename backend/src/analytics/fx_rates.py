@@ -0,0 +1,125 @@
+"""
+FX rates against the euro, loaded from the rate files dropped on the server, and conversion
+of prices held in arrays.
+"""
+
+from collections.abc import Sequence
+from datetime import date
+from itertools import groupby
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.feeds import FeedCache, load_dropped_files
+from models.fx_rate import FX_RATES_FEED, FxRate, upsert_fx_rates
+from schemas.fx_rate import FxRateQuote
+from settings import settings
+from utils.enums import Currency
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+rate_list_adapter: TypeAdapter[list[FxRateQuote]] = TypeAdapter(list[FxRateQuote])
+
+
+class FxRates:
+    """
+    Daily rates of every currency against the euro, to convert prices outside the database.
+
+    Conversions follow `models.fx_rate.fx_rate`: a price is converted at the latest rate
+    quoted on or before its date, else at the earliest one, and is NaN without any rate.
+    """
+
+    def __init__(self, rates: dict[Currency, tuple[IntArray, FloatArray]]) -> None:
+        # Per currency, the days of its rates as sorted day numbers and the rates
+        self._rates = rates
+
+    def rates_on(self, currency: Currency, days: IntArray) -> FloatArray:
+        """Rate of `currency` per euro on each of `days`."""
+        if currency == Currency.EUR:
+            return np.ones(len(days))
+        if currency not in self._rates:
+            return np.full(len(days), np.nan)
+
+        quoted_days, rates = self._rates[currency]
+        return rates[np.maximum(np.searchsorted(quoted_days, days, side="right") - 1, 0)]
+
+    def convert(
+        self, prices: Sequence[int], currencies: Sequence[str], dates: Sequence[date], target: Currency
+    ) -> FloatArray:
+        """Convert prices in pennies/cents to `target`, each at the rates of its date."""
+        converted: FloatArray = np.asarray(prices, dtype=np.float64)
+        currency_column: npt.NDArray[np.object_] = np.asarray(currencies, dtype=object)
+        days: IntArray = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+        # One pass per distinct currency, never per price
+        for currency in set(currency_column.tolist()) - {target}:
+            rows = currency_column == currency
+            converted[rows] *= self.rates_on(target, days[rows]) / self.rates_on(Currency(currency), days[rows])
+        return converted
+
+    def value_items(
+        self,
+        item_ids: Sequence[str],
+        prices: Sequence[int],
+        currencies: Sequence[str],
+        dates: Sequence[date],
+        is_purchase: Sequence[bool],
+        target: Currency,
+    ) -> tuple[FloatArray, npt.NDArray[np.object_]]:
+        """
+        Value the prices of items in `target` like `models.item_latest_price.latest_valuation_in`.
+
+        The prices of an item are converted when all of them can be. Otherwise the item is
+        valued unconverted in the currency of its purchase price, and its prices in other
+        currencies are NaN, so the prices of an item always share one currency.
+
+        Returns:
+            The prices, and the currency each one is in
+        """
+        converted: FloatArray = self.convert(prices, currencies, dates, target)
+        currency_column: npt.NDArray[np.object_] = np.asarray(currencies, dtype=object)
+        item_codes, item_index = np.unique(np.asarray(item_ids, dtype=object), return_inverse=True)
+        purchase: npt.NDArray[np.bool_] = np.asarray(is_purchase, dtype=bool)
+
+        unconverted = np.bincount(item_index, weights=np.isnan(converted), minlength=len(item_codes)) > 0
+        item_currency: npt.NDArray[np.object_] = np.full(len(item_codes), target, dtype=object)
+        purchased_unconverted = purchase & unconverted[item_index]
+        item_currency[unconverted] = None
+        item_currency[item_index[purchased_unconverted]] = currency_column[purchased_unconverted]
+
+        row_currency: npt.NDArray[np.object_] = item_currency[item_index]
+        in_own_currency = np.asarray(prices, dtype=np.float64)
+        in_own_currency[currency_column != row_currency] = np.nan
+        return np.where(unconverted[item_index], in_own_currency, converted), row_currency
+
+
+async def load_fx_rates(session: AsyncSession) -> FxRates:
+    result = await session.execute(
+        select(FxRate.currency, FxRate.date, FxRate.rate).order_by(FxRate.currency, FxRate.date)
+    )
+    rates: dict[Currency, tuple[IntArray, FloatArray]] = {}
+    for currency, rows in groupby(result, key=lambda row: row.currency):
+        _, dates, values = zip(*rows, strict=True)
+        rates[currency] = (
+            np.asarray(dates, dtype="datetime64[D]").astype(np.int64),
+            np.asarray(values, dtype=np.float64),
+        )
+    return FxRates(rates)
+
+
+fx_rate_cache = FeedCache(FX_RATES_FEED, load_fx_rates)
+
+
+async def load_fx_rate_files(session: AsyncSession) -> int:
+    """
+    Load the rate files waiting in the drop directory: CSV with a `currency,date,rate` header,
+    or a JSON array of objects with those keys. Rates are units of the currency per euro.
+
+    Returns:
+        The number of rates loaded
+    """
+    return await load_dropped_files(session, settings.fx_rates.drop_dir, rate_list_adapter, upsert_fx_rates)
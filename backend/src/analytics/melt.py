@@ -0,0 +1,57 @@
+"""
+Vectorised melt (bullion) value of items from their material, weight and the spot prices.
+
+An item's weight is taken as its content of pure metal: items carry no fineness, so the melt
+value of an alloy is only known once a spot price is quoted for that material itself.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+TROY_OUNCE_GRAMS = 31.1034768
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+class MeltValuation(NamedTuple):
+    """Melt values per item, and their totals per material."""
+
+    item_values: FloatArray  # pennies/cents, NaN without a weight or a spot price
+    materials: npt.NDArray[np.object_]  # distinct materials, sorted
+    item_count: IntArray  # items of each material
+    weight: FloatArray  # known weight in grams of each material
+    melt_value: FloatArray  # pennies/cents of each material's valued items
+
+
+def melt_valuation(
+    materials: Sequence[str],
+    weights: Sequence[float | None],
+    spot_prices: Mapping[str, int],
+) -> MeltValuation:
+    """
+    Value every item at the spot price per troy ounce of its material, in one pass over arrays.
+
+    Only the distinct materials are looked up in `spot_prices`; items are never visited one
+    by one in Python.
+    """
+    material_codes, material_index = np.unique(np.asarray(materials, dtype=object), return_inverse=True)
+    weight: FloatArray = np.asarray(weights, dtype=np.float64)  # None becomes NaN
+
+    spot_per_gram: FloatArray = (
+        np.array([spot_prices.get(material, np.nan) for material in material_codes], dtype=np.float64)
+        / TROY_OUNCE_GRAMS
+    )
+    item_values: FloatArray = weight * spot_per_gram[material_index]
+
+    known_weight: FloatArray = np.nan_to_num(weight)
+    return MeltValuation(
+        item_values=item_values,
+        materials=material_codes,
+        item_count=np.bincount(material_index, minlength=len(material_codes)).astype(np.int64),
+        weight=np.bincount(material_index, weights=known_weight, minlength=len(material_codes)),
+        melt_value=np.bincount(material_index, weights=np.nan_to_num(item_values), minlength=len(material_codes)),
+    )
@@ -0,0 +1,196 @@
+"""
+Vectorised performance metrics of items and portfolios from their price history.
+
+The whole price history of a portfolio is held as one set of NumPy columns and every metric
+is computed with array operations over all items at once, never with a Python loop per item
+or per price entry. Results are floats, NaN where a metric is undefined.
+"""
+
+from collections.abc import Sequence
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+DAYS_PER_YEAR = 365.25
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+class ItemMetrics(NamedTuple):
+    """Metrics of every valued item, one array element per item."""
+
+    item_ids: npt.NDArray[np.object_]
+    purchase_dates: npt.NDArray[np.object_]
+    valued_at: npt.NDArray[np.object_]  # date of the latest valuation
+    cost: IntArray
+    value: IntArray
+    roi: FloatArray
+    cagr: FloatArray
+    volatility: FloatArray
+    max_drawdown: FloatArray
+
+
+class PortfolioMetrics(NamedTuple):
+    """Metrics of a whole portfolio, with returns time-weighted so that purchases are not gains."""
+
+    cost: int
+    value: int
+    roi: float
+    cagr: float
+    volatility: float
+    max_drawdown: float
+
+
+class ValuationSeries:
+    """
+    Valuations of items over time: each item's purchase price, then its market prices.
+
+    An item is valued from its purchase date on. Market prices dated before it and items
+    without a purchase price are left out. The rows are sorted by item and date, so each
+    item is a contiguous segment that starts with its purchase price.
+    """
+
+    def __init__(
+        self,
+        item_ids: Sequence[str],
+        dates: Sequence[date],
+        prices: Sequence[int],
+        is_purchase: Sequence[bool],
+    ) -> None:
+        item_codes, item_index = np.unique(np.asarray(item_ids, dtype=object), return_inverse=True)
+        days: IntArray = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        price_column: IntArray = np.asarray(prices, dtype=np.int64)
+        purchase: npt.NDArray[np.bool_] = np.asarray(is_purchase, dtype=bool)
+
+        never = np.iinfo(np.int64).max
+        purchase_day: IntArray = np.full(len(item_codes), never, dtype=np.int64)
+        np.minimum.at(purchase_day, item_index[purchase], days[purchase])
+
+        # Sort by item, date, purchase price first on its day
+        order = np.lexsort((~purchase, days, item_index))
+        item_index, days, price_column, purchase = item_index[order], days[order], price_column[order], purchase[order]
+        row_purchase_day = purchase_day[item_index]
+        keep = (row_purchase_day != never) & (days >= row_purchase_day) & (~purchase | (days == row_purchase_day))
+        item_index, days, price_column, purchase = item_index[keep], days[keep], price_column[keep], purchase[keep]
+
+        # Only the first purchase price of an item counts
+        keep = ~purchase | self._segment_starts(item_index)
+        item_index, days, price_column = item_index[keep], days[keep], price_column[keep]
+
+        self.is_start: npt.NDArray[np.bool_] = self._segment_starts(item_index)
+        self.starts: IntArray = np.flatnonzero(self.is_start)
+        self.ends: IntArray = np.r_[self.starts[1:], len(item_index)][: len(self.starts)].astype(np.int64) - 1
+        self.segments: IntArray = np.cumsum(self.is_start) - 1
+        self.item_ids: npt.NDArray[np.object_] = item_codes[item_index[self.starts]]
+        self.days: IntArray = days
+        self.prices: IntArray = price_column
+
+    def __len__(self) -> int:
+        """Number of valued items."""
+        return len(self.starts)
+
+    @staticmethod
+    def _segment_starts(groups: IntArray) -> npt.NDArray[np.bool_]:
+        return np.r_[True, groups[1:] != groups[:-1]] if len(groups) else np.zeros(0, dtype=bool)
+
+    def item_metrics(self, window: int) -> ItemMetrics:
+        """
+        Metrics of every item.
+
+        ROI and CAGR compare the latest valuation with the purchase price, CAGR annualised
+        over the time between them. Volatility is the standard deviation of the log returns
+        between the item's last `window` + 1 valuations, and max drawdown the largest fall
+        from a previous high of its valuations, as a fraction of that high.
+        """
+        cost: IntArray = self.prices[self.starts]
+        value: IntArray = self.prices[self.ends]
+        years: FloatArray = (self.days[self.ends] - self.days[self.starts]) / DAYS_PER_YEAR
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth: FloatArray = np.where(cost > 0, value / cost, np.nan)
+            cagr: FloatArray = np.where(years > 0, growth ** (1 / np.where(years > 0, years, 1)) - 1, np.nan)
+
+            log_returns: FloatArray = np.full(len(self.prices), np.nan)
+            log_returns[1:] = np.log(self.prices[1:] / self.prices[:-1])
+        log_returns[self.is_start | ~np.isfinite(log_returns)] = np.nan
+
+        return ItemMetrics(
+            item_ids=self.item_ids,
+            purchase_dates=self._dates(self.days[self.starts]),
+            valued_at=self._dates(self.days[self.ends]),
+            cost=cost,
+            value=value,
+            roi=growth - 1,
+            cagr=cagr,
+            volatility=self._trailing_std(log_returns, window),
+            max_drawdown=self._max_drawdown(self.prices.astype(np.float64), self.segments, len(self)),
+        )
+
+    def portfolio_metrics(self, window: int) -> PortfolioMetrics:
+        """
+        Metrics of all items together.
+
+        The portfolio is valued on every day with a valuation, each item at its latest value.
+        Returns between those days exclude the purchases made on them (time-weighted returns),
+        and CAGR, volatility and max drawdown are computed on the index they compound to.
+        """
+        if not len(self):
+            return PortfolioMetrics(cost=0, value=0, roi=np.nan, cagr=np.nan, volatility=np.nan, max_drawdown=np.nan)
+
+        # Each valuation changes the portfolio value by the difference with the item's previous one
+        changes: IntArray = np.diff(self.prices, prepend=0)
+        changes[self.starts] = self.prices[self.starts]
+        purchases: IntArray = np.where(self.is_start, self.prices, 0)
+
+        days, day_index = np.unique(self.days, return_inverse=True)
+        value: FloatArray = np.cumsum(np.bincount(day_index, weights=changes))
+        inflow: FloatArray = np.bincount(day_index, weights=purchases)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns: FloatArray = np.where(value[:-1] > 0, (value[1:] - inflow[1:]) / value[:-1] - 1, 0.0)
+            log_returns: FloatArray = np.log1p(returns)
+        performance: FloatArray = np.r_[1.0, np.cumprod(1 + returns)]
+
+        cost = int(purchases.sum())
+        years: float = (days[-1] - days[0]) / DAYS_PER_YEAR
+        trailing: FloatArray = log_returns[-window:]
+        return PortfolioMetrics(
+            cost=cost,
+            value=int(round(value[-1])),
+            roi=value[-1] / cost - 1 if cost > 0 else np.nan,
+            cagr=performance[-1] ** (1 / years) - 1 if years > 0 else np.nan,
+            volatility=float(np.std(trailing, ddof=1)) if len(trailing) > 1 else np.nan,
+            max_drawdown=float(self._max_drawdown(performance, np.zeros(len(performance), dtype=np.int64), 1)[0]),
+        )
+
+    def _trailing_std(self, values: FloatArray, window: int) -> FloatArray:
+        """Sample standard deviation per item of its last `window` rows, NaN rows left out."""
+        included = ~np.isnan(values) & (self.ends[self.segments] - np.arange(len(values)) < window)
+        groups, included_values = self.segments[included], values[included]
+
+        count: FloatArray = np.bincount(groups, minlength=len(self)).astype(np.float64)
+        total: FloatArray = np.bincount(groups, weights=included_values, minlength=len(self))
+        squares: FloatArray = np.bincount(groups, weights=included_values**2, minlength=len(self))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance: FloatArray = (squares - total**2 / count) / (count - 1)
+        return np.where(count > 1, np.sqrt(np.maximum(variance, 0)), np.nan)
+
+    @staticmethod
+    def _max_drawdown(values: FloatArray, groups: IntArray, group_count: int) -> FloatArray:
+        """Largest fall from a running high within each group of rows sorted by group."""
+        # Offsetting each group above the previous ones keeps the running maximum within groups
+        offset: FloatArray = groups * (values.max(initial=0) + 1)
+        running_high: FloatArray = np.maximum.accumulate(values + offset) - offset
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown: FloatArray = np.where(running_high > 0, 1 - values / running_high, 0.0)
+
+        result: FloatArray = np.zeros(group_count)
+        np.maximum.at(result, groups, drawdown)
+        return result
+
+    @staticmethod
+    def _dates(days: IntArray) -> npt.NDArray[np.object_]:
+        return days.astype("datetime64[D]").astype(object)
@@ -0,0 +1,26 @@
+"""Spot prices of metals, loaded from the quote files dropped on the server."""
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.feeds import FeedCache, load_dropped_files
+from models.spot_price import SPOT_PRICES_FEED, latest_spot_prices, upsert_spot_prices
+from schemas.spot_price import SpotPriceQuote
+from settings import settings
+
+quote_list_adapter: TypeAdapter[list[SpotPriceQuote]] = TypeAdapter(list[SpotPriceQuote])
+
+# Latest price per troy ounce with its date and currency, per material with any quote
+spot_price_cache = FeedCache(SPOT_PRICES_FEED, latest_spot_prices)
+
+
+async def load_quote_files(session: AsyncSession) -> int:
+    """
+    Load the quote files waiting in the drop directory: CSV with a `material,date,price`
+    header, or a JSON array of objects with those keys. Prices are per troy ounce in
+    pennies/cents, in US dollars unless a `currency` column or key says otherwise.
+
+    Returns:
+        The number of quotes loaded
+    """
+    return await load_dropped_files(session, settings.spot_prices.drop_dir, quote_list_adapter, upsert_spot_prices)
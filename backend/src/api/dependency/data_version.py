@@ -0,0 +1,78 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependency.database import get_session
+from api.routes.fastapi_users import current_active_user
+from models import FeedVersion, User
+from models.fx_rate import FX_RATES_FEED
+from utils.types import UserIdType
+
+ETAG_HEADER = "ETag"
+
+
+async def bump_data_version(session: AsyncSession, user_id: UserIdType) -> None:
+    """
+    Invalidate every ETag handed out for the user's data.
+
+    Must run inside the transaction of each change to the user's items, price history,
+    collections or dealers, so the new version is visible exactly when the change is.
+    """
+    await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag: str = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque_tag for candidate in if_none_match.split(","))
+
+
+async def data_version_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+) -> str:
+    """
+    Dependency that answers conditional GETs from the user's data version.
+
+    The weak ETag combines the user's data version with the request URL and Accept header,
+    so every representation gets its own tag. Prices are shown converted to the user's
+    display currency, so the tag also covers that currency and the version of the FX rates.
+    When If-None-Match already holds it, 304 Not Modified is returned before the route runs
+    any of its queries.
+
+    Returns:
+        The ETag, already set on the injected response; routes that build their own
+        Response object must set it themselves
+
+    Raises:
+        HTTPException: 304 Not Modified when the client's copy is current
+    """
+    fx_version = select(FeedVersion.version).where(FeedVersion.name == FX_RATES_FEED).scalar_subquery()
+    data_version, rates_version = (
+        await session.execute(select(User.data_version, fx_version).where(User.id == current_user.id))
+    ).one_or_none() or (None, None)
+    representation: bytes = (
+        f"{request.url.path}?{request.url.query}|{request.headers.get('accept', '')}"
+        f"|{current_user.currency}.{rates_version or 0}"
+    ).encode()
+    digest: str = hashlib.blake2b(representation, digest_size=8).hexdigest()
+    etag: str = f'W/"{current_user.id}.{data_version or 0}.{digest}"'
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
+
+    response.headers[ETAG_HEADER] = etag
+    return etag
@@ -0,0 +1,39 @@
+from collections.abc import Callable
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+
+def sparse_fields(schema: type[BaseModel]) -> Callable[[str | None], tuple[str, ...] | None]:
+    """
+    Build a dependency that parses a `fields` query parameter against a read schema.
+
+    Args:
+        schema: The read schema whose fields may be requested
+
+    Returns:
+        A dependency returning the requested fields in schema order, or None when the
+        parameter is omitted and every field should be returned
+    """
+    allowed: tuple[str, ...] = tuple(schema.model_fields)
+
+    def get_fields(
+        fields: str | None = Query(
+            None,
+            description=f"Comma-separated subset of fields to return, out of: {', '.join(allowed)}",
+        ),
+    ) -> tuple[str, ...] | None:
+        if fields is None:
+            return None
+
+        requested: set[str] = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown: set[str] = requested.difference(allowed)
+        if not requested or unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields requested",
+            )
+
+        return tuple(field for field in allowed if field in requested)
+
+    return get_fields
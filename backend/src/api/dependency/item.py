@@ -1,12 +1,15 @@
+from datetime import date
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependency.database import get_session
 from api.routes.fastapi_users import current_active_user
 from models import Item, User
+from schemas.item import ItemFilter
+from utils.enums import Material
 
 
 async def verify_item_ownership(
@@ -34,3 +37,31 @@ async def verify_item_ownership(
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
     return item
+
+
+def get_item_filter(
+    material: list[Material] | None = Query(None, description="Only items made of these materials"),
+    year_from: str | None = Query(None, max_length=10, description="Minimum year of issue (inclusive)"),
+    year_to: str | None = Query(None, max_length=10, description="Maximum year of issue (inclusive)"),
+    collection_id: str | None = Query(None, description="Only items in this collection"),
+    purchase_price_min: int | None = Query(None, ge=0, description="Minimum purchase price in pennies/cents"),
+    purchase_price_max: int | None = Query(None, ge=0, description="Maximum purchase price in pennies/cents"),
+    purchase_date_from: date | None = Query(None, description="Earliest purchase date (inclusive)"),
+    purchase_date_to: date | None = Query(None, description="Latest purchase date (inclusive)"),
+) -> ItemFilter:
+    """
+    Dependency that collects item listing filters from the query string.
+
+    Returns:
+        The filters to apply; omitted parameters are None and do not filter
+    """
+    return ItemFilter(
+        material=material,
+        year_from=year_from,
+        year_to=year_to,
+        collection_id=collection_id,
+        purchase_price_min=purchase_price_min,
+        purchase_price_max=purchase_price_max,
+        purchase_date_from=purchase_date_from,
+        purchase_date_to=purchase_date_to,
+    )
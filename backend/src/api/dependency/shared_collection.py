@@ -0,0 +1,96 @@
+import asyncio
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from api.dependency.data_version import etag_matches
+from api.dependency.database import get_session
+from models import Collection
+from settings import settings
+from sharing.snapshots import Representation, SharedCollection, Snapshot, read_snapshot, render_shared_collection
+from utils.cache import AsyncLRUCache
+from utils.types import UserIdType
+
+
+def not_modified(representation: Representation, if_none_match: str | None, if_modified_since: str | None) -> bool:
+    """
+    Whether a conditional GET of a representation may be answered with 304 Not Modified.
+
+    If-None-Match matches the ETag of the body in any coding. If-Modified-Since is only
+    evaluated without If-None-Match, to the second as HTTP dates are.
+    """
+    if if_none_match:
+        return any(
+            etag_matches(if_none_match, representation.etag(encoding)) for encoding in (None, *representation.encodings)
+        )
+    if not if_modified_since:
+        return False
+    try:
+        modified_since: datetime = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if modified_since.tzinfo is None:
+        modified_since = modified_since.replace(tzinfo=UTC)
+    return representation.last_modified.replace(microsecond=0) <= modified_since
+
+
+shared_collection_cache = AsyncLRUCache(
+    max_entries=settings.shared_collections.cache_max_entries,
+    ttl_seconds=settings.shared_collections.cache_ttl_seconds,
+    tags=lambda shared: (("collection", shared.collection_id), ("user", shared.user_id)),
+)
+
+
+def invalidate_shared_collection(collection_id: str) -> None:
+    """
+    Drop the cached shared view of a collection.
+
+    Call it after committing a change to the collection, its share token or its items;
+    invalidating before the commit lets a concurrent read cache the old data again.
+    """
+    shared_collection_cache.invalidate_tag(("collection", collection_id))
+
+
+def invalidate_shared_collections(user_id: UserIdType) -> None:
+    """Drop the cached shared views of all the user's collections, after committing a change to them."""
+    shared_collection_cache.invalidate_tag(("user", user_id))
+
+
+async def load_shared_collection(session: AsyncSession, share_token: str) -> SharedCollection | None:
+    collection: Collection | None = await session.scalar(
+        select(Collection).options(selectinload(Collection.items)).where(Collection.share_token == share_token)
+    )
+    if collection is None:
+        return None
+
+    return await render_shared_collection(collection)
+
+
+async def get_shared_collection_by_token(
+    share_token: str,
+    session: AsyncSession = Depends(get_session),
+) -> Representation:
+    """
+    Dependency that returns the collection shared under a token.
+
+    The snapshot on disk is returned when there is one, without querying the database.
+    Otherwise the collection comes from the in-memory cache, and concurrent requests for a
+    token that is not cached share a single query.
+
+    Raises:
+        HTTPException: If no collection is shared under the token
+    """
+    snapshot: Snapshot | None = await asyncio.to_thread(read_snapshot, share_token)
+    if snapshot is not None:
+        return snapshot
+
+    shared: SharedCollection | None = await shared_collection_cache.get(
+        share_token, lambda: load_shared_collection(session, share_token)
+    )
+    if shared is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shared collection not found")
+    return shared
@@ -0,0 +1,15 @@
+from fastapi import Query, Request
+
+from utils.streaming import NDJSON_MEDIA_TYPE
+
+
+async def stream_requested(
+    request: Request,
+    stream: bool = Query(False, description=f"Stream the listing as {NDJSON_MEDIA_TYPE}"),
+) -> bool:
+    """
+    Dependency that tells whether the client asked for a streamed NDJSON listing.
+
+    Streaming is selected with `?stream=1` or an `Accept: application/x-ndjson` header.
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
@@ -0,0 +1,62 @@
+from collections.abc import Awaitable, Callable
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.routes.fastapi_users import current_active_user
+from models import User, UserCounters
+from models.user_counters import lock_user_counters
+from utils.enums import SubscriptionTier
+
+# Tiers that include report export, see README
+REPORT_TIERS: tuple[SubscriptionTier, ...] = (SubscriptionTier.ADVANCED, SubscriptionTier.PRO)
+
+# Maximum number of items of each tier, None for unlimited; see README
+TIER_ITEM_LIMITS: dict[SubscriptionTier, int | None] = {
+    SubscriptionTier.FREE: 100,
+    SubscriptionTier.ADVANCED: 500,
+    SubscriptionTier.PRO: None,
+}
+
+
+def require_tier(*tiers: SubscriptionTier) -> Callable[..., Awaitable[User]]:
+    """
+    Build a dependency that returns the current user if their subscription tier is one of `tiers`.
+
+    Raises:
+        HTTPException: 403 Forbidden for users of any other tier
+    """
+    allowed: str = " or ".join(tier.value.capitalize() for tier in tiers)
+
+    async def dependency(current_user: User = Depends(current_active_user)) -> User:
+        if current_user.tier not in tiers:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"This feature requires the {allowed} tier",
+            )
+        return current_user
+
+    return dependency
+
+
+async def check_item_limit(session: AsyncSession, user: User, count: int) -> None:
+    """
+    Check that the user's tier allows `count` more items, from their counters rather than a count.
+
+    The counters stay locked until the transaction ends, so the caller must insert the items
+    and update the counters in the same transaction.
+
+    Raises:
+        HTTPException: 403 Forbidden when the items would exceed the tier's limit
+    """
+    limit: int | None = TIER_ITEM_LIMITS[user.tier]
+    if limit is None:
+        return
+
+    counters: UserCounters = await lock_user_counters(session, user.id)
+    if counters.items + count > limit:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"The {user.tier.value.capitalize()} tier is limited to {limit} items, "
+            f"{max(limit - counters.items, 0)} more can be added",
+        )
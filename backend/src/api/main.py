@@ -6,8 +6,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
+# The routes load before the dependencies, which import the routes' authentication in turn
 from api.routes import router
+
+# isort: split
+from api.dependency.data_version import ETAG_HEADER
+from api.routes.items import NEXT_CURSOR_HEADER
 from database import database
+from jobs import job_runner
+from reports.jobs import report_renderer
 from settings import settings
 from utils.logger import get_logger
 
@@ -17,8 +24,11 @@ logger: Logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting API server")
+    job_runner.start()
     yield
     logger.info("Gracefully shutdown API server")
+    await job_runner.stop()
+    report_renderer.shutdown()
     await database.close()
 
 
@@ -26,7 +36,8 @@ app = FastAPI(
     title=settings.api.title,
     description=settings.api.description,
     version=settings.api.version,
-    default_response=ORJSONResponse,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -39,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
 
@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends
 from fastapi.security import HTTPBearer
 
+from .analytics import router as analytics_router
 from .auth import router as auth_router
 from .collections import router as collections_router
 from .dealers import router as dealers_router
 from .items import router as items_router
+from .portfolio import router as portfolio_router
+from .price_history import router as price_history_router
+from .reports import router as reports_router
+from .search import router as search_router
 from .users import router as users_router
 
 http_bearer = HTTPBearer(auto_error=False)
@@ -13,5 +18,10 @@ router = APIRouter(prefix="/api", dependencies=[Depends(http_bearer)])
 router.include_router(auth_router)
 router.include_router(users_router)
 router.include_router(items_router)
+router.include_router(price_history_router)
 router.include_router(collections_router)
 router.include_router(dealers_router)
+router.include_router(search_router)
+router.include_router(portfolio_router)
+router.include_router(analytics_router)
+router.include_router(reports_router)
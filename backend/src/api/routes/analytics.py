@@ -0,0 +1,118 @@
+import math
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+
+from analytics.fx_rates import FxRates, fx_rate_cache
+from analytics.portfolio import ItemMetrics, PortfolioMetrics, ValuationSeries
+from api.dependency.data_version import data_version_etag
+from api.dependency.database import SessionDependency
+from api.routes.fastapi_users import current_active_user
+from models import Item, ItemPriceHistory, User
+from schemas.analytics import AnalyticsMetrics, ItemAnalytics, PortfolioAnalytics
+from utils.enums import Currency, PriceType
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+ANALYTICS_WINDOW = 12
+ANALYTICS_MAX_WINDOW = 1000
+
+
+def finite_or_none(value: float) -> float | None:
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+@router.get("/items", response_model=PortfolioAnalytics)
+async def get_item_analytics(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    collection_id: str | None = Query(None, description="Only items in this collection"),
+    window: int = Query(
+        ANALYTICS_WINDOW, ge=2, le=ANALYTICS_MAX_WINDOW, description="Number of latest returns for volatility"
+    ),
+    _: str = Depends(data_version_etag),
+) -> PortfolioAnalytics:
+    """
+    Get ROI, CAGR, volatility and max drawdown of each of the user's items and of the portfolio.
+
+    The price history of all items is read in one query and the metrics are computed over
+    it with NumPy array operations, so the cost per item stays small for large portfolios
+    with long histories. Items are ordered by ID.
+
+    Prices are converted to the user's display currency at the rates of their dates, with
+    the rates held in a per-process cache. Items priced in a currency without FX rates are
+    valued in that currency instead and left out of the portfolio metrics.
+    """
+    item_filter: list[Any] = [Item.user_id == current_user.id]
+    if collection_id is not None:
+        item_filter.append(Item.collection_id == collection_id)
+
+    rows = (
+        await session.execute(
+            select(
+                ItemPriceHistory.item_id,
+                ItemPriceHistory.date,
+                ItemPriceHistory.price,
+                ItemPriceHistory.type == PriceType.PURCHASE,
+                ItemPriceHistory.currency,
+            )
+            .join(Item, Item.id == ItemPriceHistory.item_id)
+            .where(*item_filter)
+        )
+    ).all()
+    item_ids, dates, prices, is_purchase, currencies = zip(*rows, strict=True) if rows else ((), (), (), (), ())
+    fx_rates: FxRates = await fx_rate_cache.get(session)
+    values, value_currencies = fx_rates.value_items(
+        item_ids, prices, currencies, dates, is_purchase, current_user.currency
+    )
+    known = ~np.isnan(values)
+    columns = (
+        np.asarray(item_ids, dtype=object),
+        np.asarray(dates, dtype="datetime64[D]"),
+        np.rint(np.where(known, values, 0)).astype(np.int64),
+        np.asarray(is_purchase, dtype=bool),
+    )
+    series = ValuationSeries(*(column[known] for column in columns))
+    # Items valued in another currency are left out of the portfolio, whose value is in the user's
+    converted = known & (value_currencies == current_user.currency)
+    converted_series = ValuationSeries(*(column[converted] for column in columns))
+    item_currencies: dict[str, Currency] = dict(
+        zip(columns[0][known].tolist(), value_currencies[known].tolist(), strict=True)
+    )
+
+    names: dict[str, str] = dict((await session.execute(select(Item.id, Item.name).where(*item_filter))).all())
+    items: ItemMetrics = series.item_metrics(window)
+    portfolio: PortfolioMetrics = converted_series.portfolio_metrics(window)
+
+    return PortfolioAnalytics(
+        window=window,
+        currency=current_user.currency,
+        portfolio=AnalyticsMetrics(
+            cost=portfolio.cost,
+            value=portfolio.value,
+            roi=finite_or_none(portfolio.roi),
+            cagr=finite_or_none(portfolio.cagr),
+            volatility=finite_or_none(portfolio.volatility),
+            max_drawdown=finite_or_none(portfolio.max_drawdown),
+        ),
+        items=[
+            ItemAnalytics(
+                item_id=item_id,
+                name=names[item_id],
+                currency=item_currencies[item_id],
+                purchase_date=purchase_date,
+                valued_at=valued_at,
+                cost=cost,
+                value=value,
+                roi=finite_or_none(roi),
+                cagr=finite_or_none(cagr),
+                volatility=finite_or_none(volatility),
+                max_drawdown=finite_or_none(max_drawdown),
+            )
+            for item_id, purchase_date, valued_at, cost, value, roi, cagr, volatility, max_drawdown in zip(
+                *(column.tolist() for column in items), strict=True
+            )
+        ],
+    )
@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import UTC
+from email.utils import format_datetime
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
+from api.dependency.data_version import ETAG_HEADER, bump_data_version, data_version_etag
 from api.dependency.database import SessionDependency
-from api.routes.fastapi_users import current_active_user
+from api.dependency.fields import sparse_fields
+from api.dependency.shared_collection import (
+    get_shared_collection_by_token,
+    invalidate_shared_collection,
+    not_modified,
+    shared_collection_cache,
+)
+from api.routes.fastapi_users import current_active_superuser, current_active_user
 from models import Collection, Item, User
+from models.collection import touch_collections
+from models.user_counters import update_user_counters
+from schemas.cache import CacheStats
 from schemas.collection import (
     CollectionAddItem,
     CollectionCreate,
@@ -14,7 +30,10 @@ from schemas.collection import (
     CollectionWithItems,
     SharedCollectionRead,
 )
-from schemas.item import ItemRead
+from schemas.serialization import collection_read_serializer, collection_with_items_serializer
+from settings import settings
+from sharing.snapshots import SharedCollection, Snapshot, publish_shared_collections
+from utils.encoding import negotiate_encoding
 from utils.tokens import generate_share_token
 
 router = APIRouter(prefix="/collections", tags=["Collections"])
@@ -28,17 +47,28 @@ async def get_user_collections(
         None,
         description="Filter collections by type: 'shared' for collections with share tokens",
     ),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(CollectionRead)),
+    etag: str = Depends(data_version_etag),
 ):
-    """Get collections for the current user. Use filter='shared' to get only shared collections."""
+    """
+    Get collections for the current user. Use filter='shared' to get only shared collections.
+
+    With `fields`, only the requested columns are loaded and returned.
+    """
     query = select(Collection).where(Collection.user_id == current_user.id)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(Collection, field) for field in fields)))
 
     if filter == "shared":
         query = query.where(Collection.share_token.isnot(None))
 
     query = query.order_by(Collection.created_at.desc())
     result = await session.execute(query)
-    collections = result.scalars().all()
-    return collections
+    return Response(
+        content=collection_read_serializer.only(fields).dumps_many(result.scalars()),
+        media_type="application/json",
+        headers={ETAG_HEADER: etag},
+    )
 
 
 @router.post("/", response_model=CollectionRead, status_code=status.HTTP_201_CREATED)
@@ -50,33 +80,63 @@ async def create_collection(
     """Create a new collection."""
     collection = Collection(**collection_data.model_dump(), user_id=current_user.id)
     session.add(collection)
+    await update_user_counters(session, current_user.id, collections=1)
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(collection)
     return collection
 
 
-@router.get("/shared/{share_token}", response_model=SharedCollectionRead)
+@router.get(
+    "/shared/{share_token}",
+    response_model=SharedCollectionRead,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The client's copy is current"}},
+)
 async def get_shared_collection(
-    share_token: str,
-    session: SessionDependency,
+    request: Request,
+    shared: SharedCollection | Snapshot = Depends(get_shared_collection_by_token),
 ):
-    """Get a publicly shared collection by its share token."""
-    result = await session.execute(
-        select(Collection).options(selectinload(Collection.items)).where(Collection.share_token == share_token)
-    )
-    collection = result.scalar_one_or_none()
+    """
+    Get a publicly shared collection by its share token.
 
-    if not collection:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shared collection not found")
-
-    return SharedCollectionRead(
-        id=collection.id,
-        name=collection.name,
-        description=collection.description,
-        items=[ItemRead.model_validate(item) for item in collection.items],
-        created_at=collection.created_at,
-        updated_at=collection.updated_at,
-    )
+    Every change to a shared collection or its items writes a snapshot of it to disk, which is
+    served as a file without querying the database. Collections without a snapshot yet are cached
+    in memory and refreshed when they change.
+
+    Responses may be cached publicly, by browsers and by proxies or CDNs, for the configured max-age
+    and served stale while they revalidate. The body is stored precompressed and sent in the client's
+    preferred coding of brotli and gzip; each coding has its own strong ETag. Conditional requests
+    with If-None-Match or If-Modified-Since get 304 Not Modified while the collection is unchanged.
+    """
+    encoding: str | None = negotiate_encoding(request.headers.get("accept-encoding"), shared.encodings)
+    headers: dict[str, str] = {
+        ETAG_HEADER: shared.etag(encoding),
+        "Last-Modified": format_datetime(shared.last_modified.astimezone(UTC), usegmt=True),
+        "Cache-Control": (
+            f"public, max-age={settings.shared_collections.max_age_seconds}, "
+            f"stale-while-revalidate={settings.shared_collections.stale_while_revalidate_seconds}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+
+    if not_modified(shared, request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    if isinstance(shared, Snapshot):
+        path: Path = shared.path if encoding is None else shared.encodings[encoding]
+        return FileResponse(path, media_type="application/json", headers=headers)
+    body: bytes = shared.body if encoding is None else shared.encodings[encoding]
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/shared-cache/stats", response_model=CacheStats)
+async def get_shared_collection_cache_stats(
+    current_user: User = Depends(current_active_superuser),
+):
+    """Get the hit rate and counters of this process's shared collection cache. Superusers only."""
+    return shared_collection_cache.stats()
 
 
 @router.get("/{collection_id}", response_model=CollectionWithItems)
@@ -84,6 +144,7 @@ async def get_collection(
     collection_id: str,
     session: SessionDependency,
     current_user: User = Depends(current_active_user),
+    etag: str = Depends(data_version_etag),
 ):
     """Get a specific collection by ID with its items."""
     result = await session.execute(
@@ -96,7 +157,11 @@ async def get_collection(
     if not collection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
 
-    return collection
+    return Response(
+        content=collection_with_items_serializer.dumps(collection),
+        media_type="application/json",
+        headers={ETAG_HEADER: etag},
+    )
 
 
 @router.put("/{collection_id}", response_model=CollectionRead)
@@ -120,7 +185,10 @@ async def update_collection(
     for field, value in update_data.items():
         setattr(collection, field, value)
 
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, [collection_id])
+    invalidate_shared_collection(collection_id)
     await session.refresh(collection)
     return collection
 
@@ -140,8 +208,13 @@ async def delete_collection(
     if not collection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
 
+    share_token: str | None = collection.share_token
     await session.delete(collection)
+    await update_user_counters(session, current_user.id, collections=-1)
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, revoked_tokens=[share_token])
+    invalidate_shared_collection(collection_id)
 
 
 @router.post("/{collection_id}/items", status_code=status.HTTP_204_NO_CONTENT)
@@ -179,7 +252,11 @@ async def add_item_to_collection(
 
     # Add item to collection
     item.collection_id = collection_id
+    await touch_collections(session, [collection_id])
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, [collection_id])
+    invalidate_shared_collection(collection_id)
 
 
 @router.delete("/{collection_id}/items", status_code=status.HTTP_204_NO_CONTENT)
@@ -217,7 +294,11 @@ async def remove_item_from_collection(
 
     # Remove item from collection
     item.collection_id = None
+    await touch_collections(session, [collection_id])
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, [collection_id])
+    invalidate_shared_collection(collection_id)
 
 
 @router.post("/{collection_id}/share", response_model=CollectionRead)
@@ -244,7 +325,9 @@ async def generate_share_link(
     # Generate share token if not exists
     if not collection.share_token:
         collection.share_token = generate_share_token()
+        await bump_data_version(session, current_user.id)
         await session.commit()
+        await publish_shared_collections(session, [collection_id])
         await session.refresh(collection)
 
     return collection
@@ -273,8 +356,12 @@ async def regenerate_share_link(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
 
     # Always generate a new token, even if one exists
+    revoked_token: str | None = collection.share_token
     collection.share_token = generate_share_token()
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, [collection_id], revoked_tokens=[revoked_token])
+    invalidate_shared_collection(collection_id)
     await session.refresh(collection)
     return collection
 
@@ -300,7 +387,11 @@ async def revoke_share_link(
     if not collection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
 
+    revoked_token: str | None = collection.share_token
     collection.share_token = None
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, revoked_tokens=[revoked_token])
+    invalidate_shared_collection(collection_id)
     await session.refresh(collection)
     return collection
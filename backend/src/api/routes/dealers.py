@@ -1,18 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
+from api.dependency.data_version import ETAG_HEADER, bump_data_version, data_version_etag
 from api.dependency.database import SessionDependency
+from api.dependency.fields import sparse_fields
 from api.routes.fastapi_users import current_active_user
 from models import Dealer, User
+from models.user_counters import update_user_counters
 from schemas.dealer import DealerCreate, DealerRead, DealerUpdate
+from schemas.serialization import dealer_read_serializer
 
 router = APIRouter(prefix="/dealers", tags=["Dealers"])
 
 
 @router.get("/", response_model=list[DealerRead])
-async def get_dealers(session: SessionDependency, current_user: User = Depends(current_active_user)):
-    result = await session.execute(select(Dealer).where(Dealer.user_id == current_user.id).order_by(Dealer.name))
-    return result.scalars().all()
+async def get_dealers(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(DealerRead)),
+    etag: str = Depends(data_version_etag),
+):
+    query = select(Dealer).where(Dealer.user_id == current_user.id).order_by(Dealer.name)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(Dealer, field) for field in fields)))
+
+    result = await session.execute(query)
+    return Response(
+        content=dealer_read_serializer.only(fields).dumps_many(result.scalars()),
+        media_type="application/json",
+        headers={ETAG_HEADER: etag},
+    )
 
 
 @router.get("/{dealer_id}", response_model=DealerRead)
@@ -20,6 +38,7 @@ async def get_dealer(
     dealer_id: int,
     session: SessionDependency,
     current_user: User = Depends(current_active_user),
+    _: str = Depends(data_version_etag),
 ):
     dealer = await session.get(Dealer, dealer_id)
     if not dealer or dealer.user_id != current_user.id:
@@ -36,6 +55,8 @@ async def create_dealer(
 ):
     dealer = Dealer(**dealer_data.model_dump(), user_id=current_user.id)
     session.add(dealer)
+    await update_user_counters(session, current_user.id, dealers=1)
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(dealer)
     return dealer
@@ -56,6 +77,7 @@ async def update_dealer(
     for field, value in update_data.items():
         setattr(dealer, field, value)
 
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(dealer)
     return dealer
@@ -72,4 +94,6 @@ async def delete_dealer(
         raise HTTPException(status_code=404, detail="Dealer not found")
 
     await session.delete(dealer)
+    await update_user_counters(session, current_user.id, dealers=-1)
+    await bump_data_version(session, current_user.id)
     await session.commit()
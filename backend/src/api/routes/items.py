@@ -1,20 +1,55 @@
 from collections.abc import Sequence
-from datetime import date
+from datetime import date, timedelta
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select
-from sqlalchemy.engine import Result
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Select,
+    and_,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    type_coerce,
+    update,
+)
+from sqlalchemy.engine import Result, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from api.dependency.data_version import ETAG_HEADER, bump_data_version, data_version_etag
 from api.dependency.database import SessionDependency
-from api.dependency.item import verify_item_ownership
+from api.dependency.fields import sparse_fields
+from api.dependency.item import get_item_filter, verify_item_ownership
+from api.dependency.shared_collection import invalidate_shared_collection
+from api.dependency.streaming import stream_requested
+from api.dependency.tier import check_item_limit
 from api.routes.fastapi_users import current_active_user
-from models import Item, ItemPriceHistory, User
+from models import Collection, Item, ItemLatestPrice, ItemPriceHistory, User
+from models.collection import touch_collections
+from models.fx_rate import price_in
+from models.item_latest_price import refresh_item_latest_prices
+from models.user_counters import update_user_counters
 from schemas.item import (
+    ITEMS_BULK_MAX_SIZE,
+    ItemBulkCreateResult,
+    ItemBulkDelete,
+    ItemBulkDeleteResult,
+    ItemBulkRowError,
+    ItemBulkUpdate,
+    ItemBulkUpdateResult,
     ItemCreate,
+    ItemFilter,
+    ItemImportResult,
+    ItemImportRowError,
     ItemRead,
     ItemReadWithPriceHistory,
     ItemReadWithPurchasePrice,
@@ -24,39 +59,381 @@ from schemas.item_price_history import (
     ItemPriceHistoryCreate,
     ItemPriceHistoryRead,
     ItemPriceHistoryUpdate,
+    PricePoint,
+    PriceSeries,
+)
+from schemas.serialization import (
+    RowSerializer,
+    item_price_history_read_serializer,
+    item_read_with_purchase_price_serializer,
 )
-from utils.enums import PriceType
+from sharing.snapshots import publish_shared_collections
+from utils.csv_stream import CSV_MAX_RECORD_SIZE, iter_csv_records
+from utils.cursor import decode_cursor, encode_cursor
+from utils.enums import Currency, ItemSort, PriceBucket, PriceType
+from utils.streaming import NDJSON_MEDIA_TYPE, stream_ndjson
+from utils.types import UserIdType
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+ITEMS_PAGE_SIZE = 100
+ITEMS_MAX_PAGE_SIZE = 1000
+ITEMS_IMPORT_BATCH_SIZE = 2000
+# Rejected rows of an import beyond this many are only counted
+ITEMS_IMPORT_MAX_ERRORS = 100
+PRICE_SERIES_MAX_POINTS = 10000
+
+# Columns an item listing may be sorted by, keyed by the ItemSort value without its "-" prefix.
+# Every key is also a field of ItemReadWithPurchasePrice, which is how the next cursor is built.
+# Purchase prices are sorted in the user's currency, see purchase_price_in.
+ITEM_SORT_COLUMNS: dict[str, ColumnElement[Any]] = {
+    "name": Item.name,
+    "year": Item.year,
+    "purchase_price": ItemPriceHistory.price,
+    "purchase_date": ItemPriceHistory.date,
+}
+
+# Selectable columns of an item listing, keyed by ItemReadWithPurchasePrice field
+ITEM_LISTING_COLUMNS: dict[str, ColumnElement[Any]] = {
+    "name": Item.name,
+    "year": Item.year,
+    "description": Item.description,
+    "images": Item.images,
+    "material": Item.material,
+    "weight": Item.weight,
+    "id": Item.id,
+    "user_id": Item.user_id,
+    "collection_id": Item.collection_id,
+    "purchase_price": ItemPriceHistory.price.label("purchase_price"),
+    "purchase_date": ItemPriceHistory.date.label("purchase_date"),
+    "purchase_currency": ItemPriceHistory.currency.label("purchase_currency"),
+}
+
+
+def purchase_price_in(currency: Currency) -> tuple[ColumnElement[int], ColumnElement[Currency]]:
+    """
+    Price of the joined purchase entry converted to `currency` at the rates of its date, and
+    the currency it ends up in: its own when it has no rate to be converted at.
+    """
+    return price_in(ItemPriceHistory.price, ItemPriceHistory.currency, ItemPriceHistory.date, currency)
+
+
+def item_listing_columns(currency: Currency) -> dict[str, ColumnElement[Any]]:
+    """Selectable columns of an item listing, with purchase prices converted to `currency`."""
+    purchase_price, purchase_currency = purchase_price_in(currency)
+    return ITEM_LISTING_COLUMNS | {
+        "purchase_price": purchase_price.label("purchase_price"),
+        "purchase_currency": purchase_currency.label("purchase_currency"),
+    }
+
 
 router = APIRouter(prefix="/items", tags=["Items"])
 price_history_router = APIRouter(prefix="/{item_id}/price-history", tags=["Price History"])
 
 
-@router.get("/", response_model=list[ItemReadWithPurchasePrice])
-async def get_user_items(
-    session: SessionDependency,
-    current_user: User = Depends(current_active_user),
+async def insert_items(
+    session: AsyncSession, user: User, items: Sequence[ItemCreate]
 ) -> list[ItemReadWithPurchasePrice]:
-    """Get all items for the current user with their purchase price information."""
-    result: Result[Any] = await session.execute(
+    """
+    Insert items with their purchase prices and latest prices and count them, without committing.
+    Purchase prices without a currency are in the user's display currency.
+
+    Each table is written with one multi-row INSERT ... RETURNING, so the number of
+    round-trips does not grow with the number of items.
+
+    Returns:
+        The created items, in the order of `items`
+    """
+    item_rows: list[dict[str, Any]] = [
+        {**item_data.model_dump(exclude={"purchase_price", "purchase_date", "purchase_currency"}), "user_id": user.id}
+        for item_data in items
+    ]
+    item_result: Result[Any] = await session.execute(
+        insert(Item).returning(
+            *(ITEM_LISTING_COLUMNS[field] for field in ItemRead.model_fields), sort_by_parameter_order=True
+        ),
+        item_rows,
+    )
+    created_items: Sequence[Row[Any]] = item_result.all()
+
+    # A purchase date left out falls back to the column's server default, today
+    price_rows: list[dict[str, Any]] = [
+        {
+            "item_id": item.id,
+            "price": item_data.purchase_price,
+            "type": PriceType.PURCHASE,
+            "currency": item_data.purchase_currency or user.currency,
+        }
+        | ({"date": item_data.purchase_date} if item_data.purchase_date else {})
+        for item, item_data in zip(created_items, items, strict=True)
+    ]
+    price_result: Result[Any] = await session.execute(
+        insert(ItemPriceHistory).returning(
+            ItemPriceHistory.price, ItemPriceHistory.date, ItemPriceHistory.currency, sort_by_parameter_order=True
+        ),
+        price_rows,
+    )
+    purchase_prices: Sequence[Row[Any]] = price_result.all()
+
+    await session.execute(
+        insert(ItemLatestPrice),
+        [
+            {
+                "item_id": item.id,
+                "purchase_price": price.price,
+                "purchase_date": price.date,
+                "purchase_currency": price.currency,
+            }
+            for item, price in zip(created_items, purchase_prices, strict=True)
+        ],
+    )
+    await update_user_counters(session, user.id, items=len(created_items))
+
+    return [
+        ItemReadWithPurchasePrice(
+            **item._asdict(), purchase_price=price.price, purchase_date=price.date, purchase_currency=price.currency
+        )
+        for item, price in zip(created_items, purchase_prices, strict=True)
+    ]
+
+
+async def import_item_batch(session: AsyncSession, user: User, batch: Sequence[ItemCreate]) -> int:
+    """
+    Insert and commit the items of one import batch that the user does not have yet.
+
+    An item is a duplicate when the user already has one with the same name, year, material
+    and purchase price and currency, and the same purchase date if the row gives one.
+
+    Returns:
+        The number of items inserted
+
+    Raises:
+        HTTPException: 403 Forbidden when the new items would exceed the user's tier limit
+    """
+    user_id: UserIdType = user.id
+    existing: Result[Any] = await session.execute(
         select(
-            Item.id,
             Item.name,
             Item.year,
-            Item.description,
-            Item.images,
             Item.material,
-            Item.weight,
-            Item.user_id,
-            Item.collection_id,
-            ItemPriceHistory.price.label("purchase_price"),
-            ItemPriceHistory.date.label("purchase_date"),
+            ItemPriceHistory.price,
+            ItemPriceHistory.currency,
+            ItemPriceHistory.date,
+        )
+        .join(ItemPriceHistory, and_(ItemPriceHistory.item_id == Item.id, ItemPriceHistory.type == PriceType.PURCHASE))
+        .where(Item.user_id == user_id, Item.name.in_({item_data.name for item_data in batch}))
+    )
+    dated_keys: set[tuple[Any, ...]] = set()
+    undated_keys: set[tuple[Any, ...]] = set()
+    for row in existing:
+        dated_keys.add(tuple(row))
+        undated_keys.add(tuple(row)[:-1])
+
+    new_items: list[ItemCreate] = []
+    for item_data in batch:
+        key: tuple[Any, ...] = (
+            item_data.name,
+            item_data.year,
+            item_data.material,
+            item_data.purchase_price,
+            item_data.purchase_currency or user.currency,
+        )
+        if (key + (item_data.purchase_date,) in dated_keys) if item_data.purchase_date else (key in undated_keys):
+            continue
+        dated_keys.add(key + (item_data.purchase_date,))
+        undated_keys.add(key)
+        new_items.append(item_data)
+
+    if new_items:
+        await check_item_limit(session, user, len(new_items))
+        await insert_items(session, user, new_items)
+        await bump_data_version(session, user_id)
+        await session.commit()
+    return len(new_items)
+
+
+async def delete_user_items(
+    session: AsyncSession, user_id: UserIdType, item_ids: Sequence[str]
+) -> tuple[int, set[str | None]]:
+    """
+    Delete the user's items among `item_ids` together with their price history and latest prices,
+    uncount them and touch the collections they were in, without committing.
+
+    IDs of items that do not exist or belong to another user are ignored.
+
+    Returns:
+        The number of items deleted and the IDs of the collections they were in
+    """
+    owned_item_ids: Select[Any] = select(Item.id).where(Item.user_id == user_id, Item.id.in_(item_ids))
+    collection_ids: set[str | None] = set(
+        await session.scalars(
+            select(Item.collection_id).distinct().where(Item.user_id == user_id, Item.id.in_(item_ids))
         )
-        .join(ItemPriceHistory, Item.id == ItemPriceHistory.item_id)
-        .where(Item.user_id == current_user.id, ItemPriceHistory.type == PriceType.PURCHASE)
-        .order_by(Item.name)
     )
+    await touch_collections(session, collection_ids)
+    for model in (ItemPriceHistory, ItemLatestPrice):
+        await session.execute(
+            delete(model).where(model.item_id.in_(owned_item_ids)).execution_options(synchronize_session=False)
+        )
+
+    result: Result[Any] = await session.execute(
+        delete(Item).where(Item.user_id == user_id, Item.id.in_(item_ids)).execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        await update_user_counters(session, user_id, items=-result.rowcount)
+    return result.rowcount, collection_ids
+
+
+def csv_record_too_long_error() -> dict[str, Any]:
+    """Error of a CSV row dropped for being too long or unterminated, in the format of a validation error."""
+    return {
+        "type": "record_too_long",
+        "loc": [],
+        "msg": (
+            f"CSV record is unterminated or longer than {CSV_MAX_RECORD_SIZE} characters, check for an unbalanced quote"
+        ),
+        "input": None,
+    }
 
-    return [ItemReadWithPurchasePrice(**dict(row._mapping)) for row in result]
+
+def apply_item_filters(query: Select[Any], filters: ItemFilter, currency: Currency) -> Select[Any]:
+    """
+    Narrow an item query joined to its purchase price entry by the given filters, with
+    purchase prices compared in `currency`.
+    """
+    if filters.material:
+        query = query.where(Item.material.in_(filters.material))
+    if filters.year_from is not None:
+        query = query.where(Item.year >= filters.year_from)
+    if filters.year_to is not None:
+        query = query.where(Item.year <= filters.year_to)
+    if filters.collection_id is not None:
+        query = query.where(Item.collection_id == filters.collection_id)
+    if filters.purchase_price_min is not None:
+        query = query.where(purchase_price_in(currency)[0] >= filters.purchase_price_min)
+    if filters.purchase_price_max is not None:
+        query = query.where(purchase_price_in(currency)[0] <= filters.purchase_price_max)
+    if filters.purchase_date_from is not None:
+        query = query.where(ItemPriceHistory.date >= filters.purchase_date_from)
+    if filters.purchase_date_to is not None:
+        query = query.where(ItemPriceHistory.date <= filters.purchase_date_to)
+    return query
+
+
+def apply_item_keyset(query: Select[Any], sort: ItemSort, cursor: str | None, currency: Currency) -> Select[Any]:
+    """
+    Order an item query by the requested sort and seek past the cursor, if any. Purchase
+    prices are sorted in `currency`.
+
+    The item ID is always the tie-breaker, so the (sort column, id) pair is unique and
+    a page boundary never skips or repeats an item.
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for a different sort
+    """
+    descending: bool = sort.startswith("-")
+    sort_field: str = sort.removeprefix("-")
+    column: ColumnElement[Any] = (
+        purchase_price_in(currency)[0] if sort_field == "purchase_price" else ITEM_SORT_COLUMNS[sort_field]
+    )
+
+    if descending:
+        query = query.order_by(column.desc(), Item.id.desc())
+    else:
+        query = query.order_by(column, Item.id)
+
+    if cursor is None:
+        return query
+
+    try:
+        cursor_sort, last_value, last_id = decode_cursor(cursor)
+        if cursor_sort != sort:
+            raise ValueError("Cursor was issued for a different sort")
+        if column.type.python_type is date:
+            last_value = date.fromisoformat(last_value)
+        else:
+            last_value = column.type.python_type(last_value)
+        last_id = str(UUID(last_id))
+    except (TypeError, ValueError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+
+    if descending:
+        return query.where(tuple_(column, Item.id) < (last_value, last_id))
+    return query.where(tuple_(column, Item.id) > (last_value, last_id))
+
+
+@router.get(
+    "/",
+    response_model=list[ItemReadWithPurchasePrice],
+    responses={status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def get_user_items(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    etag: str = Depends(data_version_etag),
+    filters: ItemFilter = Depends(get_item_filter),
+    stream: bool = Depends(stream_requested),
+    sort: ItemSort = Query(ItemSort.NAME, description="Sort order; a leading '-' sorts descending"),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=ITEMS_MAX_PAGE_SIZE,
+        description=f"Maximum number of items per page, {ITEMS_PAGE_SIZE} by default; streams are unlimited by default",
+    ),
+    cursor: str | None = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(ItemReadWithPurchasePrice)),
+) -> Response:
+    """
+    Get a filtered page of items for the current user with their purchase price information.
+
+    Items are ordered by the requested sort and paginated with a keyset cursor, so every page
+    costs the same index seek regardless of how deep the client pages. When more items are
+    available, the cursor for the next page is returned in the X-Next-Cursor header.
+
+    In stream mode every matching item after the cursor is sent as NDJSON from a server-side
+    cursor instead, so memory use stays flat regardless of the inventory size.
+
+    With `fields`, only the requested columns are selected and returned, so list screens do
+    not pull large text columns such as description and images out of the database.
+
+    Purchase prices are converted to the user's display currency in the query, at the rates
+    of their purchase dates; price filters and sorting apply to the converted prices. A price
+    in a currency without FX rates is returned unconverted, with its own purchase_currency.
+    """
+    serializer: RowSerializer = item_read_with_purchase_price_serializer.only(fields)
+    columns: dict[str, ColumnElement[Any]] = item_listing_columns(current_user.currency)
+
+    # The id and the sort column are always selected because the next cursor is built from them
+    selected: set[str] = {"id", sort.removeprefix("-"), *(fields or columns)}
+    query = select(*(column for field, column in columns.items() if field in selected))
+    query = query.join(ItemPriceHistory, Item.id == ItemPriceHistory.item_id)
+    query = query.where(Item.user_id == current_user.id, ItemPriceHistory.type == PriceType.PURCHASE)
+    query = apply_item_filters(query, filters, current_user.currency)
+    query = apply_item_keyset(query, sort, cursor, current_user.currency)
+
+    if stream:
+        if limit is not None:
+            query = query.limit(limit)
+        return StreamingResponse(
+            stream_ndjson(session, query, serializer),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={ETAG_HEADER: etag},
+        )
+
+    limit = limit or ITEMS_PAGE_SIZE
+    result: Result[Any] = await session.execute(query.limit(limit + 1))
+    rows: Sequence[Row[Any]] = result.all()
+
+    headers: dict[str, str] = {ETAG_HEADER: etag}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_value: Any = getattr(rows[-1], sort.removeprefix("-"))
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(sort.value, last_value, rows[-1].id)
+
+    return Response(
+        content=serializer.dumps_many(rows),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @router.get("/{item_id}", response_model=ItemReadWithPriceHistory)
@@ -64,6 +441,7 @@ async def get_item(
     item_id: UUID,
     session: SessionDependency,
     current_user: User = Depends(current_active_user),
+    _: str = Depends(data_version_etag),
 ) -> Item:
     result: Result[Any] = await session.execute(
         select(Item)
@@ -84,9 +462,12 @@ async def create_item(
     session: SessionDependency,
     current_user: User = Depends(current_active_user),
 ) -> ItemReadWithPurchasePrice:
+    await check_item_limit(session, current_user, 1)
+
     item_dict: dict[str, Any] = item_data.model_dump()
     purchase_price: int = item_dict.pop("purchase_price")
     purchase_date: date | None = item_dict.pop("purchase_date", None)
+    purchase_currency: Currency = item_dict.pop("purchase_currency", None) or current_user.currency
 
     item: Item = Item(**item_dict, user_id=current_user.id)
     session.add(item)
@@ -97,8 +478,12 @@ async def create_item(
         price=purchase_price,
         type=PriceType.PURCHASE,
         date=purchase_date,
+        currency=purchase_currency,
     )
     session.add(price_history)
+    await refresh_item_latest_prices(session, [item.id])
+    await update_user_counters(session, current_user.id, items=1)
+    await bump_data_version(session, current_user.id)
 
     await session.commit()
     await session.refresh(item)
@@ -116,9 +501,218 @@ async def create_item(
         collection_id=item.collection_id,
         purchase_price=price_history.price,
         purchase_date=price_history.date,
+        purchase_currency=price_history.currency,
     )
 
 
+@router.post("/bulk", response_model=ItemBulkCreateResult, status_code=status.HTTP_201_CREATED)
+async def create_items_bulk(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    payloads: list[dict[str, Any]] = Body(
+        ...,
+        min_length=1,
+        max_length=ITEMS_BULK_MAX_SIZE,
+        description="ItemCreate payloads",
+    ),
+    partial: bool = Query(False, description="Create the valid payloads even if some are rejected"),
+) -> ItemBulkCreateResult:
+    """
+    Create many items with their purchase prices in one transaction.
+
+    Items, purchase price entries and latest prices are each written with a multi-row
+    INSERT ... RETURNING, so the number of round-trips does not grow with the number of
+    items. Every payload is validated first; without `partial` a single invalid payload
+    rejects the whole request with 422 and the errors of every invalid payload. The
+    valid payloads are rejected with 403 when they would exceed the user's tier limit.
+    """
+    valid: list[ItemCreate] = []
+    errors: list[ItemBulkRowError] = []
+    for index, payload in enumerate(payloads):
+        try:
+            valid.append(ItemCreate.model_validate(payload))
+        except ValidationError as error:
+            errors.append(ItemBulkRowError(index=index, errors=error.errors(include_url=False, include_context=False)))
+
+    if errors and not partial:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    if not valid:
+        return ItemBulkCreateResult(errors=errors)
+
+    await check_item_limit(session, current_user, len(valid))
+    created: list[ItemReadWithPurchasePrice] = await insert_items(session, current_user, valid)
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+
+    return ItemBulkCreateResult(created=created, errors=errors)
+
+
+@router.patch("/bulk", response_model=ItemBulkUpdateResult)
+async def update_items_bulk(
+    bulk_data: ItemBulkUpdate,
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+) -> ItemBulkUpdateResult:
+    """
+    Apply the same patch to many items with a single UPDATE.
+
+    IDs of items that do not exist or belong to another user are skipped and not counted.
+    """
+    update_data: dict[str, Any] = bulk_data.patch.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+
+    collection_id: str | None = update_data.get("collection_id")
+    if collection_id is not None:
+        collection_owner: UserIdType | None = await session.scalar(
+            select(Collection.user_id).where(Collection.id == collection_id)
+        )
+        if collection_owner != current_user.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
+
+    item_ids: list[str] = [str(item_id) for item_id in bulk_data.ids]
+    # The collections the items leave and, if they are moved, the one they join
+    collection_ids: set[str | None] = set(
+        await session.scalars(
+            select(Item.collection_id).distinct().where(Item.user_id == current_user.id, Item.id.in_(item_ids))
+        )
+    )
+    result: Result[Any] = await session.execute(
+        update(Item)
+        .where(Item.user_id == current_user.id, Item.id.in_(item_ids))
+        .values(update_data)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        if "collection_id" in update_data:
+            collection_ids.add(collection_id)
+        await touch_collections(session, collection_ids)
+        await bump_data_version(session, current_user.id)
+    await session.commit()
+    await publish_shared_collections(session, collection_ids)
+    for changed_collection_id in collection_ids - {None}:
+        invalidate_shared_collection(changed_collection_id)
+    return ItemBulkUpdateResult(updated=result.rowcount)
+
+
+@router.delete("/bulk", response_model=ItemBulkDeleteResult)
+async def delete_items_bulk(
+    bulk_data: ItemBulkDelete,
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+) -> ItemBulkDeleteResult:
+    """
+    Delete many items with their price history using set-based DELETEs.
+
+    IDs of items that do not exist or belong to another user are skipped and not counted.
+    """
+    deleted, collection_ids = await delete_user_items(
+        session, current_user.id, [str(item_id) for item_id in bulk_data.ids]
+    )
+
+    if deleted:
+        await bump_data_version(session, current_user.id)
+    await session.commit()
+    await publish_shared_collections(session, collection_ids)
+    for collection_id in collection_ids - {None}:
+        invalidate_shared_collection(collection_id)
+    return ItemBulkDeleteResult(deleted=deleted)
+
+
+@router.post(
+    "/import",
+    response_model=ItemImportResult,
+    openapi_extra={"requestBody": {"required": True, "content": {"text/csv": {"schema": {"type": "string"}}}}},
+)
+async def import_items(
+    request: Request,
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    delimiter: str = Query(",", min_length=1, max_length=1, description="Field delimiter of the CSV file"),
+) -> ItemImportResult:
+    """
+    Import items from a UTF-8 CSV file sent as the request body.
+
+    The header row names the columns after ItemCreate fields; unknown columns are ignored and
+    empty cells are treated as missing. The body is parsed while it is received, and valid rows
+    are written and committed in batches, so files of any size are imported in constant memory.
+    Rows already imported earlier are skipped as duplicates, which makes re-importing the same
+    file safe. Once a batch would exceed the user's tier limit, the import stops with 403.
+    Rows longer than 64 KiB, as after an unbalanced quote, are rejected without being buffered.
+    """
+    inserted: int = 0
+    rejected: int = 0
+    validated: int = 0
+    errors: list[ItemImportRowError] = []
+    batch: list[ItemCreate] = []
+    records = iter_csv_records(request.stream(), delimiter)
+
+    try:
+        header: tuple[int, list[str] | None] | None = await anext(records, None)
+        if header is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file is empty")
+        if header[1] is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV header is too long")
+
+        columns: list[str] = [column.strip().lower() for column in header[1]]
+        missing: list[str] = [
+            field for field, info in ItemCreate.model_fields.items() if info.is_required() and field not in columns
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing CSV columns: {', '.join(missing)}",
+            )
+
+        async for line, values in records:
+            if values is None:
+                rejected += 1
+                if len(errors) < ITEMS_IMPORT_MAX_ERRORS:
+                    errors.append(ItemImportRowError(line=line, errors=[csv_record_too_long_error()]))
+                continue
+
+            payload: dict[str, str] = {
+                column: value
+                for column, value in zip(columns, values, strict=False)
+                if column in ItemCreate.model_fields and value.strip()
+            }
+            try:
+                batch.append(ItemCreate.model_validate(payload))
+            except ValidationError as error:
+                rejected += 1
+                if len(errors) < ITEMS_IMPORT_MAX_ERRORS:
+                    errors.append(
+                        ItemImportRowError(line=line, errors=error.errors(include_url=False, include_context=False))
+                    )
+                continue
+
+            if len(batch) == ITEMS_IMPORT_BATCH_SIZE:
+                validated += len(batch)
+                inserted += await import_item_batch(session, current_user, batch)
+                batch = []
+
+        if batch:
+            validated += len(batch)
+            inserted += await import_item_batch(session, current_user, batch)
+    except UnicodeDecodeError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV file must be UTF-8 encoded; {inserted} items before the invalid data were imported",
+        ) from error
+    except HTTPException as error:
+        if error.status_code != status.HTTP_403_FORBIDDEN:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"{error.detail}; {inserted} items before the limit were imported",
+        ) from error
+
+    return ItemImportResult(inserted=inserted, rejected=rejected, duplicates=validated - inserted, errors=errors)
+
+
 @router.patch("/{item_id}", response_model=ItemRead)
 async def update_item(
     item_id: UUID,
@@ -134,11 +728,18 @@ async def update_item(
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
+    collection_ids: set[str | None] = {item.collection_id}
     update_data: dict[str, Any] = item_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(item, field, value)
+    collection_ids.add(item.collection_id)
 
+    await touch_collections(session, collection_ids)
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, collection_ids)
+    for collection_id in collection_ids - {None}:
+        invalidate_shared_collection(collection_id)
     await session.refresh(item)
     return item
 
@@ -150,12 +751,15 @@ async def delete_item(
     current_user: User = Depends(current_active_user),
 ) -> None:
     """Delete an item and all its price history."""
-    result = await session.execute(delete(Item).where(Item.id == str(item_id), Item.user_id == current_user.id))
-
-    if result.rowcount == 0:
+    deleted, collection_ids = await delete_user_items(session, current_user.id, [str(item_id)])
+    if deleted == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    await publish_shared_collections(session, collection_ids)
+    for collection_id in collection_ids - {None}:
+        invalidate_shared_collection(collection_id)
 
 
 # Price History Endpoints
@@ -190,21 +794,157 @@ async def get_price_history_entry(item_id: str, history_id: int, session: AsyncS
     return price_history
 
 
-@price_history_router.get("/", response_model=list[ItemPriceHistoryRead])
-async def get_item_price_history(
+def price_bucket_start(dialect_name: str, bucket: PriceBucket, column: ColumnElement[Any]) -> ColumnElement[Any]:
+    """First day of the bucket of a date column. Weeks start on Monday, as with Postgres' date_trunc."""
+    if bucket == PriceBucket.DAY:
+        return column
+    if dialect_name == "sqlite":
+        modifiers: tuple[str, ...] = {
+            PriceBucket.WEEK: ("weekday 0", "-6 days"),
+            PriceBucket.MONTH: ("start of month",),
+            PriceBucket.YEAR: ("start of year",),
+        }[bucket]
+        return type_coerce(func.date(column, *modifiers), Date)
+    return cast(func.date_trunc(bucket.value, column), Date)
+
+
+def price_bucket_count(bucket: PriceBucket, first: date, last: date) -> int:
+    """Number of buckets spanned by the dates from `first` to `last`."""
+    match bucket:
+        case PriceBucket.DAY:
+            return (last - first).days + 1
+        case PriceBucket.WEEK:
+            return (last - (first - timedelta(days=first.weekday()))).days // 7 + 1
+        case PriceBucket.MONTH:
+            return (last.year - first.year) * 12 + last.month - first.month + 1
+        case PriceBucket.YEAR:
+            return last.year - first.year + 1
+
+
+@price_history_router.get("/series", response_model=PriceSeries)
+async def get_item_price_series(
     session: SessionDependency,
+    current_user: User = Depends(current_active_user),
     item: Item = Depends(verify_item_ownership),
-) -> Sequence[ItemPriceHistory]:
+    bucket: PriceBucket | None = Query(None, description="Period of each point, picked from max_points when omitted"),
+    max_points: int | None = Query(
+        None,
+        ge=1,
+        le=PRICE_SERIES_MAX_POINTS,
+        description="Use the shortest period that gives at most this many points, unless bucket is given",
+    ),
+    price_type: PriceType | None = Query(None, alias="type", description="Only entries of this type"),
+    _: str = Depends(data_version_etag),
+) -> PriceSeries:
+    """
+    Get the item's price history downsampled to open, high, low and close prices per period.
+
+    Buckets are computed in the database, so the response holds one point per period however
+    many entries the history has. Without bucket and max_points, points are daily. Prices are
+    converted to the user's display currency at the rates of their dates; prices in a currency
+    without FX rates are left unconverted, in points of their own for their currency.
+    """
+    conditions: list[ColumnElement[bool]] = [ItemPriceHistory.item_id == item.id]
+    if price_type is not None:
+        conditions.append(ItemPriceHistory.type == price_type)
+
+    if bucket is None:
+        bucket = PriceBucket.DAY
+        if max_points is not None:
+            first, last = (
+                await session.execute(
+                    select(func.min(ItemPriceHistory.date), func.max(ItemPriceHistory.date)).where(*conditions)
+                )
+            ).one()
+            if first is not None:
+                bucket = next(
+                    (period for period in PriceBucket if price_bucket_count(period, first, last) <= max_points),
+                    PriceBucket.YEAR,
+                )
+
+    bucket_start = price_bucket_start(session.get_bind().dialect.name, bucket, ItemPriceHistory.date)
+    price, currency = price_in(
+        ItemPriceHistory.price, ItemPriceHistory.currency, ItemPriceHistory.date, current_user.currency
+    )
+    prices = (
+        select(
+            bucket_start.label("bucket_start"),
+            price.label("price"),
+            currency.label("currency"),
+            ItemPriceHistory.date,
+            ItemPriceHistory.id,
+        )
+        .where(*conditions)
+        .subquery("prices")
+    )
+    # Prices without a rate to convert them at keep their own currency and get points of their own
+    partition = (prices.c.bucket_start, prices.c.currency)
+    ranked = select(
+        prices.c.bucket_start,
+        prices.c.currency,
+        prices.c.price,
+        func.row_number().over(partition_by=partition, order_by=(prices.c.date, prices.c.id)).label("from_first"),
+        func.row_number()
+        .over(partition_by=partition, order_by=(prices.c.date.desc(), prices.c.id.desc()))
+        .label("from_last"),
+    ).subquery("ranked_prices")
     result: Result[Any] = await session.execute(
-        select(ItemPriceHistory).where(ItemPriceHistory.item_id == item.id).order_by(ItemPriceHistory.date.desc())
+        select(
+            ranked.c.bucket_start,
+            ranked.c.currency,
+            func.max(case((ranked.c.from_first == 1, ranked.c.price))),
+            func.max(ranked.c.price),
+            func.min(ranked.c.price),
+            func.max(case((ranked.c.from_last == 1, ranked.c.price))),
+            func.count(),
+        )
+        .group_by(ranked.c.bucket_start, ranked.c.currency)
+        .order_by(ranked.c.bucket_start, ranked.c.currency)
+    )
+
+    return PriceSeries(
+        bucket=bucket,
+        currency=current_user.currency,
+        points=[
+            PricePoint(date=start, currency=in_currency, open=open_, high=high, low=low, close=close, count=count)
+            for start, in_currency, open_, high, low, close, count in result
+        ],
+    )
+
+
+@price_history_router.get(
+    "/",
+    response_model=list[ItemPriceHistoryRead],
+    responses={status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def get_item_price_history(
+    session: SessionDependency,
+    item: Item = Depends(verify_item_ownership),
+    etag: str = Depends(data_version_etag),
+    stream: bool = Depends(stream_requested),
+) -> Response:
+    query = select(ItemPriceHistory).where(ItemPriceHistory.item_id == item.id).order_by(ItemPriceHistory.date.desc())
+
+    if stream:
+        return StreamingResponse(
+            stream_ndjson(session, query, item_price_history_read_serializer, scalars=True),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={ETAG_HEADER: etag},
+        )
+
+    result: Result[Any] = await session.execute(query)
+    return Response(
+        content=item_price_history_read_serializer.dumps_many(result.scalars()),
+        media_type="application/json",
+        headers={ETAG_HEADER: etag},
     )
-    return result.scalars().all()
 
 
 @price_history_router.post("/", response_model=ItemPriceHistoryRead, status_code=status.HTTP_201_CREATED)
 async def add_item_price_history(
     price_data: ItemPriceHistoryCreate,
     session: SessionDependency,
+    current_user: User = Depends(current_active_user),
     item: Item = Depends(verify_item_ownership),
 ) -> ItemPriceHistory:
     price_history: ItemPriceHistory = ItemPriceHistory(
@@ -212,9 +952,12 @@ async def add_item_price_history(
         price=price_data.price,
         type=PriceType.CURRENT,
         date=price_data.date,
+        currency=price_data.currency or current_user.currency,
     )
 
     session.add(price_history)
+    await refresh_item_latest_prices(session, [item.id])
+    await bump_data_version(session, item.user_id)
     await session.commit()
     await session.refresh(price_history)
     return price_history
@@ -233,6 +976,8 @@ async def update_item_price_history(
     for field, value in update_data.items():
         setattr(price_history, field, value)
 
+    await refresh_item_latest_prices(session, [item.id])
+    await bump_data_version(session, item.user_id)
     await session.commit()
     await session.refresh(price_history)
     return price_history
@@ -256,6 +1001,8 @@ async def delete_item_price_history(
         )
 
     await session.delete(price_history)
+    await refresh_item_latest_prices(session, [item.id])
+    await bump_data_version(session, item.user_id)
     await session.commit()
 
 
@@ -0,0 +1,197 @@
+import math
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import BigInteger, Select, cast, func, select
+
+from analytics.fx_rates import FxRates, fx_rate_cache
+from analytics.melt import MeltValuation, melt_valuation
+from analytics.spot_prices import spot_price_cache
+from api.dependency.data_version import data_version_etag
+from api.dependency.database import SessionDependency
+from api.routes.fastapi_users import current_active_user
+from models import Collection, Item, User
+from models.item_latest_price import latest_valuation_in
+from models.spot_price import LatestSpotPrice
+from schemas.portfolio import (
+    ItemMelt,
+    MaterialMelt,
+    PortfolioCollectionValuation,
+    PortfolioCurrencyValuation,
+    PortfolioMaterialValuation,
+    PortfolioMelt,
+    PortfolioSummary,
+    PortfolioValuation,
+)
+from utils.enums import Currency, Material
+from utils.types import UserIdType
+
+router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
+
+
+def portfolio_valuation_query(user_id: UserIdType, currency: Currency) -> Select[Any]:
+    """
+    Value the user's items grouped by (collection, material, currency), the finest grain of
+    the summary.
+
+    Prices come from the `item_latest_price` projection, so the query reads one row per item
+    whatever the length of its price history. Every row holds additive sums, so coarser
+    breakdowns are rolled up from these rows without touching the database again. Prices are
+    converted to `currency` at the rates of their dates before they are summed; items that
+    cannot be, see `latest_valuation_in`, are summed in their own currency. The currency is
+    null for items without any price.
+    """
+    valuation = latest_valuation_in(currency)
+    purchase_cost = func.coalesce(valuation.c.purchase_price, 0)
+    market_value = func.coalesce(valuation.c.market_price, purchase_cost)
+    return (
+        select(
+            Item.collection_id,
+            Collection.name.label("collection_name"),
+            Item.material,
+            valuation.c.currency,
+            func.count().label("item_count"),
+            # Postgres sums bigints into numeric; the totals still fit a bigint
+            cast(func.sum(purchase_cost), BigInteger).label("purchase_cost"),
+            cast(func.sum(market_value), BigInteger).label("market_value"),
+        )
+        .outerjoin(valuation, valuation.c.item_id == Item.id)
+        .outerjoin(Collection, Collection.id == Item.collection_id)
+        .where(Item.user_id == user_id)
+        .group_by(Item.collection_id, Collection.name, Item.material, valuation.c.currency)
+    )
+
+
+def add_valuation(total: PortfolioValuation, row: Any) -> None:
+    total.item_count += row.item_count
+    total.purchase_cost += row.purchase_cost
+    total.market_value += row.market_value
+    total.unrealised_gain = total.market_value - total.purchase_cost
+
+
+def by_market_value(valuation: PortfolioValuation) -> tuple[int, int]:
+    return -valuation.market_value, -valuation.item_count
+
+
+@router.get("/summary", response_model=PortfolioSummary)
+async def get_portfolio_summary(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    _: str = Depends(data_version_etag),
+) -> PortfolioSummary:
+    """
+    Get purchase cost, market value, unrealised gain and item count of the user's items.
+
+    Totals are broken down per collection and per material, both ordered by market value, and
+    are in the user's display currency. Items whose prices are in a currency without FX rates
+    cannot be converted; they are left out of the totals and totalled per currency instead.
+    """
+    result = await session.execute(portfolio_valuation_query(current_user.id, current_user.currency))
+
+    summary = PortfolioSummary(currency=current_user.currency)
+    collections: dict[str | None, PortfolioCollectionValuation] = {}
+    materials: dict[str, PortfolioMaterialValuation] = {}
+    unconverted: dict[Currency, PortfolioCurrencyValuation] = {}
+    for row in result:
+        if row.currency not in (None, current_user.currency):
+            if row.currency not in unconverted:
+                unconverted[row.currency] = PortfolioCurrencyValuation(currency=row.currency)
+            add_valuation(unconverted[row.currency], row)
+            continue
+
+        if row.collection_id not in collections:
+            collections[row.collection_id] = PortfolioCollectionValuation(
+                collection_id=row.collection_id, collection_name=row.collection_name
+            )
+        if row.material not in materials:
+            materials[row.material] = PortfolioMaterialValuation(material=row.material)
+
+        add_valuation(summary, row)
+        add_valuation(collections[row.collection_id], row)
+        add_valuation(materials[row.material], row)
+
+    summary.collections = sorted(collections.values(), key=by_market_value)
+    summary.materials = sorted(materials.values(), key=by_market_value)
+    summary.unconverted = sorted(unconverted.values(), key=lambda valuation: valuation.currency)
+    return summary
+
+
+@router.get("/melt", response_model=PortfolioMelt)
+async def get_portfolio_melt(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+) -> PortfolioMelt:
+    """
+    Get the melt (bullion) value of each of the user's items at the latest spot prices, with
+    totals per material ordered by melt value.
+
+    Spot prices come from a per-process cache and the items are valued together with NumPy
+    array operations, so the route runs one query whatever the number of items. Items are
+    ordered by name.
+
+    Spot prices are converted to the user's display currency at the rates of their dates. A
+    spot price in a currency without FX rates is left unconverted: the items of its material
+    are valued in that currency and left out of the totals.
+    """
+    spot_prices: dict[Material, LatestSpotPrice] = await spot_price_cache.get(session)
+    fx_rates: FxRates = await fx_rate_cache.get(session)
+    quotes: list[LatestSpotPrice] = list(spot_prices.values())
+    converted: list[float] = fx_rates.convert(
+        [quote.price for quote in quotes],
+        [quote.currency for quote in quotes],
+        [quote.date for quote in quotes],
+        current_user.currency,
+    ).tolist()
+    spot_in_currency: dict[Material, tuple[int, Currency]] = {
+        material: (quote.price, quote.currency) if math.isnan(price) else (round(price), current_user.currency)
+        for material, quote, price in zip(spot_prices, quotes, converted, strict=True)
+    }
+
+    rows = (
+        await session.execute(
+            select(Item.id, Item.name, Item.material, Item.weight)
+            .where(Item.user_id == current_user.id)
+            .order_by(Item.name, Item.id)
+        )
+    ).all()
+    item_ids, names, materials, weights = zip(*rows, strict=True) if rows else ((), (), (), ())
+    valuation: MeltValuation = melt_valuation(
+        materials, weights, {material: price for material, (price, _) in spot_in_currency.items()}
+    )
+
+    item_values: list[int | None] = [
+        None if math.isnan(value) else round(value) for value in valuation.item_values.tolist()
+    ]
+    item_currencies: list[Currency | None] = [
+        spot_in_currency[material][1] if material in spot_in_currency else None for material in materials
+    ]
+    material_melts: list[MaterialMelt] = [
+        MaterialMelt(
+            material=material,
+            item_count=item_count,
+            weight=weight,
+            spot_price=spot_in_currency[material][0] if material in spot_in_currency else None,
+            spot_date=spot_prices[material].date if material in spot_prices else None,
+            currency=spot_in_currency[material][1] if material in spot_in_currency else None,
+            melt_value=round(melt_value),
+        )
+        for material, item_count, weight, melt_value in zip(*(column.tolist() for column in valuation[1:]), strict=True)
+    ]
+    in_currency: list[int] = [
+        value
+        for value, currency in zip(item_values, item_currencies, strict=True)
+        if value is not None and currency == current_user.currency
+    ]
+
+    return PortfolioMelt(
+        currency=current_user.currency,
+        melt_value=sum(in_currency),
+        valued_count=len(in_currency),
+        materials=sorted(material_melts, key=lambda melt: (-melt.melt_value, -melt.item_count)),
+        items=[
+            ItemMelt(item_id=item_id, name=name, material=material, weight=weight, melt_value=value, currency=currency)
+            for item_id, name, material, weight, value, currency in zip(
+                item_ids, names, materials, weights, item_values, item_currencies, strict=True
+            )
+        ],
+    )
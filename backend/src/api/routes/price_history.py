@@ -0,0 +1,73 @@
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Result
+
+from api.dependency.data_version import bump_data_version
+from api.dependency.database import SessionDependency
+from api.routes.fastapi_users import current_active_user
+from models import Item, ItemPriceHistory, User
+from models.item_latest_price import refresh_item_latest_prices
+from schemas.item_price_history import (
+    PRICE_HISTORY_BATCH_MAX_SIZE,
+    ItemPriceHistoryBatchEntry,
+    ItemPriceHistoryRead,
+)
+from utils.enums import PriceType
+
+router = APIRouter(prefix="/price-history", tags=["Price History"])
+
+
+@router.post("/batch", response_model=list[ItemPriceHistoryRead], status_code=status.HTTP_201_CREATED)
+async def add_price_history_batch(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    entries: list[ItemPriceHistoryBatchEntry] = Body(
+        ...,
+        min_length=1,
+        max_length=PRICE_HISTORY_BATCH_MAX_SIZE,
+        description="Current market prices of the user's items",
+    ),
+) -> list[ItemPriceHistoryRead]:
+    """
+    Add current market prices to many items in one transaction, e.g. from a dealer's price list.
+
+    Ownership of every item is verified with one query and all entries are written with one
+    multi-row INSERT ... RETURNING. If any item does not exist or belongs to another user,
+    nothing is added.
+    """
+    item_ids: set[str] = {str(entry.item_id) for entry in entries}
+    owned_item_ids: set[str] = set(
+        await session.scalars(select(Item.id).where(Item.user_id == current_user.id, Item.id.in_(item_ids)))
+    )
+    if missing := item_ids - owned_item_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Items not found: {', '.join(sorted(missing))}",
+        )
+
+    # A date left out falls back to the column's server default, today
+    rows: list[dict[str, Any]] = [
+        {
+            "item_id": str(entry.item_id),
+            "price": entry.price,
+            "type": PriceType.CURRENT,
+            "currency": entry.currency or current_user.currency,
+        }
+        | ({"date": entry.date} if entry.date else {})
+        for entry in entries
+    ]
+    result: Result[Any] = await session.execute(
+        insert(ItemPriceHistory).returning(
+            *(getattr(ItemPriceHistory, field) for field in ItemPriceHistoryRead.model_fields),
+            sort_by_parameter_order=True,
+        ),
+        rows,
+    )
+    created: list[ItemPriceHistoryRead] = [ItemPriceHistoryRead(**row._asdict()) for row in result]
+
+    await refresh_item_latest_prices(session, list(item_ids))
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+    return created
@@ -0,0 +1,196 @@
+from datetime import date
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import Select, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependency.database import SessionDependency
+from api.dependency.tier import REPORT_TIERS, require_tier
+from jobs import enqueue_job
+from jobs.runner import ACTIVE_JOB_STATUSES
+from jobs.tasks import RENDER_REPORT
+from models import Collection, FeedVersion, Item, ItemPriceHistory, Job, User
+from models.fx_rate import FX_RATES_FEED
+from reports.jobs import report_renderer
+from schemas.report import ReportCreate, ReportJobRead
+from utils.enums import JobStatus, PriceType
+from utils.streaming import CSV_MEDIA_TYPE, stream_csv
+from utils.types import UserIdType
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+PDF_MEDIA_TYPE = "application/pdf"
+JobId = Path(..., pattern="^[0-9a-f]{32}$", description="Report job ID")
+
+# Header and selected column of every field of the CSV export, in column order
+EXPORT_COLUMNS: dict[str, Any] = {
+    "item_id": Item.id,
+    "item_name": Item.name,
+    "year": Item.year,
+    "material": Item.material,
+    "weight": Item.weight,
+    "collection": Collection.name,
+    "price_type": case((ItemPriceHistory.type == PriceType.PURCHASE, "purchase"), else_="current"),
+    "price": ItemPriceHistory.price,
+    "currency": ItemPriceHistory.currency,
+    "date": ItemPriceHistory.date,
+}
+
+
+async def verify_collection_owner(session: AsyncSession, user_id: UserIdType, collection_id: str | None) -> None:
+    """Raise 404 unless the collection filter is omitted or names one of the user's collections."""
+    if collection_id is None:
+        return
+
+    owner: UserIdType | None = await session.scalar(select(Collection.user_id).where(Collection.id == collection_id))
+    if owner != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
+
+
+def export_query(
+    user_id: UserIdType,
+    collection_id: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Select[Any]:
+    """Select one row per price history entry of the user's items, grouped by item."""
+    query = (
+        select(*EXPORT_COLUMNS.values())
+        .join(ItemPriceHistory, ItemPriceHistory.item_id == Item.id)
+        .outerjoin(Collection, Collection.id == Item.collection_id)
+        .where(Item.user_id == user_id)
+        .order_by(Item.name, Item.id, ItemPriceHistory.date, ItemPriceHistory.id)
+    )
+    if collection_id is not None:
+        query = query.where(Item.collection_id == collection_id)
+    if date_from is not None:
+        query = query.where(ItemPriceHistory.date >= date_from)
+    if date_to is not None:
+        query = query.where(ItemPriceHistory.date <= date_to)
+
+    return query
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {CSV_MEDIA_TYPE: {}}}},
+)
+async def export_report(
+    session: SessionDependency,
+    current_user: User = Depends(require_tier(*REPORT_TIERS)),
+    collection_id: str | None = Query(None, description="Only items in this collection"),
+    date_from: date | None = Query(None, description="Earliest price date (inclusive)"),
+    date_to: date | None = Query(None, description="Latest price date (inclusive)"),
+) -> StreamingResponse:
+    """
+    Export the price history of the user's items as CSV, one row per price entry.
+
+    Prices are in pennies/cents. Rows are read from a server-side cursor and written to the
+    response as they arrive, so the export runs in constant memory whatever its size.
+    Available on the Advanced and Pro tiers.
+    """
+    await verify_collection_owner(session, current_user.id, collection_id)
+
+    filename: str = f"numismatist-export-{date.today().isoformat()}.csv"
+    return StreamingResponse(
+        stream_csv(session, export_query(current_user.id, collection_id, date_from, date_to), list(EXPORT_COLUMNS)),
+        media_type=CSV_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def report_job_read(request: Request, job_id: str, job_status: JobStatus, error: str | None = None) -> ReportJobRead:
+    download_url: str | None = None
+    if job_status == JobStatus.DONE:
+        download_url = request.url_for("download_report", job_id=job_id).path
+    return ReportJobRead(id=job_id, status=job_status, error=error, download_url=download_url)
+
+
+@router.post("/", response_model=ReportJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def create_report(
+    report_data: ReportCreate,
+    request: Request,
+    session: SessionDependency,
+    current_user: User = Depends(require_tier(*REPORT_TIERS)),
+) -> ReportJobRead:
+    """
+    Queue a PDF portfolio report, then poll its job until it is done.
+
+    Identical requests share one job while the user's data and the FX rates are unchanged: a
+    report that is queued or rendering is not queued again, and a rendered report is served
+    from the disk cache. Reports are rendered by the job runner, so any API process can
+    answer for a job, and they count towards the user's limit of concurrent jobs. Rendering
+    is CPU-bound and runs in a pool of worker processes instead of the event loop.
+
+    Prices are in the user's display currency; items priced in a currency without FX rates are
+    listed unconverted and left out of the totals. Available on the Advanced and Pro tiers.
+    """
+    await verify_collection_owner(session, current_user.id, report_data.collection_id)
+
+    fx_version = select(FeedVersion.version).where(FeedVersion.name == FX_RATES_FEED).scalar_subquery()
+    data_version, rates_version = (
+        await session.execute(select(User.data_version, fx_version).where(User.id == current_user.id))
+    ).one()
+    # Prices are converted at the loaded rates, so a rate load makes a new report as a data change does
+    parameters: dict[str, Any] = report_data.model_dump(mode="json") | {
+        "currency": current_user.currency.value,
+        "fx_rates_version": rates_version or 0,
+    }
+    job_id: str = report_renderer.job_id(current_user.id, parameters, data_version or 0)
+
+    if report_renderer.path(current_user.id, job_id).exists():
+        return report_job_read(request, job_id, JobStatus.DONE)
+
+    job: Job = await enqueue_job(
+        session,
+        RENDER_REPORT,
+        parameters | {"user_id": current_user.id, "job_id": job_id},
+        user_id=current_user.id,
+        key=report_renderer.job_key(job_id),
+    )
+    job_status: JobStatus = job.status
+    await session.commit()
+    return report_job_read(request, job_id, job_status)
+
+
+@router.get("/{job_id}", response_model=ReportJobRead)
+async def get_report(
+    request: Request,
+    session: SessionDependency,
+    job_id: str = JobId,
+    current_user: User = Depends(require_tier(*REPORT_TIERS)),
+) -> ReportJobRead:
+    """Get the status of a report job, with its download URL once it is rendered."""
+    if report_renderer.path(current_user.id, job_id).exists():
+        return report_job_read(request, job_id, JobStatus.DONE)
+
+    job: Job | None = await report_renderer.get(session, current_user.id, job_id)
+    # A done job without its report was pruned from the cache
+    if job is None or job.status == JobStatus.DONE:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+
+    return report_job_read(request, job_id, job.status, job.last_error if job.status == JobStatus.FAILED else None)
+
+
+@router.get(
+    "/{job_id}/download",
+    response_class=FileResponse,
+    responses={status.HTTP_200_OK: {"content": {PDF_MEDIA_TYPE: {}}}},
+)
+async def download_report(
+    session: SessionDependency,
+    job_id: str = JobId,
+    current_user: User = Depends(require_tier(*REPORT_TIERS)),
+) -> FileResponse:
+    """Download a rendered report."""
+    path = report_renderer.path(current_user.id, job_id)
+    if not path.exists():
+        job: Job | None = await report_renderer.get(session, current_user.id, job_id)
+        if job is not None and job.status in ACTIVE_JOB_STATUSES:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Report is not rendered yet")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+
+    return FileResponse(path, media_type=PDF_MEDIA_TYPE, filename=f"numismatist-report-{job_id}.pdf")
@@ -0,0 +1,107 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Select, column, func, literal, literal_column, or_, select, table
+
+from api.dependency.data_version import data_version_etag
+from api.dependency.database import SessionDependency
+from api.routes.fastapi_users import current_active_user
+from models import Collection, Dealer, Item, User
+from models.search import SEARCH_TS_CONFIG, fts_table_name, item_search_vector
+from schemas.search import SearchResults
+from utils.types import UserIdType
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+SEARCH_RESULTS_LIMIT = 20
+SEARCH_RESULTS_MAX_LIMIT = 100
+
+SearchableModel = type[Item] | type[Collection] | type[Dealer]
+
+
+def fts_match_expression(q: str) -> str:
+    """Turn free text into an FTS5 query that matches every word as a prefix."""
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in q.split())
+
+
+def sqlite_search_query(model: SearchableModel, user_id: UserIdType, q: str, limit: int) -> Select[Any]:
+    """Search a model through its FTS5 table, best matches first."""
+    fts = table(fts_table_name(model.__tablename__), column("rowid"), column("rank"))
+    return (
+        select(model)
+        .join(fts, fts.c.rowid == literal_column(f"{model.__tablename__}.rowid"))
+        .where(model.user_id == user_id, literal_column(fts.name).op("MATCH")(fts_match_expression(q)))
+        .order_by(fts.c.rank)
+        .limit(limit)
+    )
+
+
+def postgres_name_search_query(model: SearchableModel, user_id: UserIdType, q: str, limit: int) -> Select[Any]:
+    """Search a model by substring or fuzzy name match, served by its pg_trgm GIN index."""
+    return (
+        select(model)
+        .where(
+            model.user_id == user_id,
+            or_(model.name.icontains(q, autoescape=True), literal(q).op("<%")(model.name)),
+        )
+        .order_by(func.word_similarity(q, model.name).desc(), model.name)
+        .limit(limit)
+    )
+
+
+def postgres_item_search_query(user_id: UserIdType, q: str, limit: int) -> Select[Any]:
+    """Search items by full text over name and description, falling back to a fuzzy name match."""
+    ts_query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig"), q)
+    rank = func.greatest(func.ts_rank(item_search_vector, ts_query), func.word_similarity(q, Item.name))
+    return (
+        select(Item)
+        .where(
+            Item.user_id == user_id,
+            or_(
+                item_search_vector.op("@@")(ts_query),
+                Item.name.icontains(q, autoescape=True),
+                literal(q).op("<%")(Item.name),
+            ),
+        )
+        .order_by(rank.desc(), Item.name)
+        .limit(limit)
+    )
+
+
+@router.get("/", response_model=SearchResults)
+async def search(
+    session: SessionDependency,
+    current_user: User = Depends(current_active_user),
+    q: str = Query(..., min_length=1, max_length=255, description="Free text to search for"),
+    limit: int = Query(
+        SEARCH_RESULTS_LIMIT, ge=1, le=SEARCH_RESULTS_MAX_LIMIT, description="Maximum results per entity type"
+    ),
+    _: str = Depends(data_version_etag),
+) -> SearchResults:
+    """
+    Search the current user's items, collections and dealers in one call.
+
+    Items are matched on name and description, collections and dealers on name. Postgres uses
+    the generated tsvector column plus pg_trgm word similarity for typo-tolerant matches;
+    SQLite uses FTS5 prefix matching.
+    """
+    q = q.strip()
+    if not q:
+        return SearchResults()
+
+    if session.get_bind().dialect.name == "sqlite":
+        item_query = sqlite_search_query(Item, current_user.id, q, limit)
+        collection_query = sqlite_search_query(Collection, current_user.id, q, limit)
+        dealer_query = sqlite_search_query(Dealer, current_user.id, q, limit)
+    else:
+        item_query = postgres_item_search_query(current_user.id, q, limit)
+        collection_query = postgres_name_search_query(Collection, current_user.id, q, limit)
+        dealer_query = postgres_name_search_query(Dealer, current_user.id, q, limit)
+
+    items = (await session.execute(item_query)).scalars().all()
+    collections = (await session.execute(collection_query)).scalars().all()
+    dealers = (await session.execute(dealer_query)).scalars().all()
+
+    return SearchResults.model_validate(
+        {"items": items, "collections": collections, "dealers": dealers}, from_attributes=True
+    )
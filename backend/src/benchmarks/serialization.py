@@ -0,0 +1,80 @@
+"""
+Benchmark of the item listing response path: pydantic models versus RowSerializer.
+
+Run from backend/src with:
+
+    python -m benchmarks.serialization [rows] [repeat]
+
+The "pydantic" path is what GET /api/items/ used to do per request: build an
+ItemReadWithPurchasePrice for every row, validate the list again against the response
+model, dump it in JSON mode and encode it with the standard library. The "fast" path
+encodes the rows straight to JSON bytes with RowSerializer.
+"""
+
+import json
+import sys
+import timeit
+from collections import namedtuple
+from datetime import date, timedelta
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from schemas.item import ItemReadWithPurchasePrice
+from schemas.serialization import item_read_with_purchase_price_serializer
+from utils.enums import Currency, Material
+
+# Result rows of the listing query are accessed by attribute, like this named tuple
+ItemRow = namedtuple("ItemRow", list(ItemReadWithPurchasePrice.model_fields))
+
+
+def make_rows(count: int) -> list[ItemRow]:
+    materials: list[Material] = list(Material)
+    return [
+        ItemRow(
+            name=f"Coin {index}",
+            year=str(1800 + index % 200),
+            description="Obverse: laureate head. Reverse: eagle with shield." if index % 2 else None,
+            images=None,
+            material=materials[index % len(materials)],
+            weight=26.73,
+            id=str(uuid4()),
+            user_id=1,
+            collection_id=None,
+            purchase_price=1000 + index,
+            purchase_date=date(2020, 1, 1) + timedelta(days=index % 1500),
+            purchase_currency=Currency.USD,
+        )
+        for index in range(count)
+    ]
+
+
+def pydantic_path(rows: list[ItemRow], adapter: TypeAdapter) -> bytes:
+    models = [ItemReadWithPurchasePrice(**row._asdict()) for row in rows]
+    content = adapter.dump_python(adapter.validate_python(models, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast_path(rows: list[ItemRow]) -> bytes:
+    return item_read_with_purchase_price_serializer.dumps_many(rows)
+
+
+def main() -> None:
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeat: int = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows: list[ItemRow] = make_rows(count)
+    adapter = TypeAdapter(list[ItemReadWithPurchasePrice])
+
+    assert json.loads(pydantic_path(rows, adapter)) == json.loads(fast_path(rows))
+
+    slow: float = min(timeit.repeat(lambda: pydantic_path(rows, adapter), number=1, repeat=repeat))
+    fast: float = min(timeit.repeat(lambda: fast_path(rows), number=1, repeat=repeat))
+
+    print(f"rows: {count}, best of {repeat}")
+    print(f"pydantic: {slow * 1000:8.1f} ms")
+    print(f"fast:     {fast * 1000:8.1f} ms")
+    print(f"speed-up: {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
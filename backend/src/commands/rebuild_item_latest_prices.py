@@ -0,0 +1,41 @@
+"""
+Rebuild the `item_latest_price` projection from the full price history.
+
+Run from backend/src (or `make rebuild-latest-prices`) with:
+
+    python -m commands.rebuild_item_latest_prices
+
+Use it to backfill the projection, or to resynchronise it after price history was changed
+outside the API. The rebuild runs in a single transaction, so readers never see it half done.
+"""
+
+import asyncio
+from logging import Logger
+
+from sqlalchemy import func, select
+
+from database import database
+from models import ItemLatestPrice
+from models.item_latest_price import refresh_item_latest_prices
+from utils.logger import get_logger
+
+logger: Logger = get_logger(__name__)
+
+
+async def rebuild() -> int:
+    async with database.get_session() as session:
+        await refresh_item_latest_prices(session)
+        count: int = await session.scalar(select(func.count()).select_from(ItemLatestPrice)) or 0
+        await session.commit()
+
+    await database.close()
+    return count
+
+
+def main() -> None:
+    count: int = asyncio.run(rebuild())
+    logger.info("Rebuilt latest prices of %d items", count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+__all__ = (
+    "JobRunner",
+    "enqueue_job",
+    "job_handler",
+    "job_runner",
+)
+
+from settings import settings
+
+from .runner import JobRunner, enqueue_job, job_handler
+from .tasks import (
+    CLEANUP_ACCESS_TOKENS,
+    CLEANUP_JOBS,
+    ENSURE_PRICE_HISTORY_PARTITIONS,
+    LOAD_FX_RATES,
+    LOAD_SPOT_PRICES,
+    RECONCILE_SHARED_COLLECTION_SNAPSHOTS,
+    RECONCILE_USER_COUNTERS,
+)
+
+job_runner = JobRunner()
+job_runner.schedule(CLEANUP_ACCESS_TOKENS, settings.jobs.cleanup_interval_seconds)
+job_runner.schedule(CLEANUP_JOBS, settings.jobs.cleanup_interval_seconds)
+job_runner.schedule(RECONCILE_USER_COUNTERS, settings.jobs.reconcile_interval_seconds)
+job_runner.schedule(ENSURE_PRICE_HISTORY_PARTITIONS, settings.jobs.partition_interval_seconds)
+job_runner.schedule(LOAD_SPOT_PRICES, settings.spot_prices.load_interval_seconds)
+job_runner.schedule(LOAD_FX_RATES, settings.fx_rates.load_interval_seconds)
+job_runner.schedule(RECONCILE_SHARED_COLLECTION_SNAPSHOTS, settings.shared_collections.snapshot_interval_seconds)
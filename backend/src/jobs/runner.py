@@ -0,0 +1,317 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import UTC, datetime, timedelta
+from logging import Logger
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from database import database
+from models import Job, User
+from models.job import ACTIVE_JOB_KEY_WHERE
+from models.job_schedule import claim_scheduled_run
+from settings import JobSettings, settings
+from utils.enums import JobStatus
+from utils.logger import get_logger
+from utils.types import UserIdType
+
+logger: Logger = get_logger(__name__)
+
+JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+# Handlers of every job kind, registered with `job_handler`
+job_handlers: dict[str, JobHandler] = {}
+
+ACTIVE_JOB_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the handler of a job kind.
+
+    A handler receives its own session and the job's payload, and commits its work itself.
+    Jobs may run more than once (after a failure, or when a worker dies), so handlers must
+    be idempotent.
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = handler
+        return handler
+
+    return register
+
+
+async def enqueue_job(
+    session: AsyncSession,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    user_id: UserIdType | None = None,
+    key: str | None = None,
+    delay_seconds: float = 0,
+) -> Job:
+    """
+    Add a job to the queue in the session's transaction; it is claimed once that commits.
+
+    Jobs of a user count towards the user's concurrency limit. When a pending or running
+    job with the same `key` exists, it is returned instead of queuing another one. The
+    unique index on the keys of active jobs makes this hold for concurrent enqueues too: the
+    insert waits for a transaction queuing the same key, and does nothing if it commits.
+    """
+    values: dict[str, Any] = {
+        "kind": kind,
+        "payload": payload or {},
+        "user_id": user_id,
+        "key": key,
+        "status": JobStatus.PENDING,
+        "attempts": 0,
+        "max_attempts": settings.jobs.max_attempts,
+        "run_at": datetime.now(UTC) + timedelta(seconds=delay_seconds),
+    }
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    insert_job = (
+        dialect.insert(Job)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[Job.key], index_where=ACTIVE_JOB_KEY_WHERE)
+        .returning(Job)
+    )
+    while True:
+        job: Job | None = await session.scalar(insert_job)
+        if job is not None:
+            return job
+
+        existing: Job | None = await session.scalar(
+            select(Job).where(Job.key == key, Job.status.in_(ACTIVE_JOB_STATUSES)).limit(1)
+        )
+        # Otherwise the job that held the key finished in between; queue this one after all
+        if existing is not None:
+            return existing
+
+
+class JobRunner:
+    """
+    Pool of asyncio workers running the jobs of the `jobs` table, inside the API process.
+
+    Workers claim due jobs with `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of workers
+    and API processes share the queue without a broker. A claimed job is leased: when its
+    worker dies the lease expires and the job is claimed again. Failed jobs are retried with
+    exponential backoff until they run out of attempts. At most `per_user_limit` jobs of a
+    user run at once.
+
+    While a job runs, its worker renews the lease every third of `lease_seconds`, so a job
+    may run longer than its lease; the lease only expires once its worker stops renewing it.
+    """
+
+    def __init__(self, session_factory: SessionFactory = database.get_session, config: JobSettings | None = None):
+        self._session_factory: SessionFactory = session_factory
+        self._config: JobSettings = config or settings.jobs
+        self._schedules: dict[str, float] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stopping: asyncio.Event | None = None
+
+    def schedule(self, kind: str, interval_seconds: float) -> None:
+        """
+        Queue a job of this kind every `interval_seconds` while the runner is started.
+
+        Runs are claimed in the `job_schedules` table, so the job is queued once per interval
+        across all API processes and restarts.
+        """
+        self._schedules[kind] = interval_seconds
+
+    def start(self) -> None:
+        if self._tasks or self._config.workers == 0:
+            return
+
+        self._stopping = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{n}") for n in range(self._config.workers)]
+        self._tasks += [
+            asyncio.create_task(self._repeat(kind, interval), name=f"job-schedule-{kind}")
+            for kind, interval in self._schedules.items()
+        ]
+        logger.info("Started %d job workers", self._config.workers)
+
+    async def stop(self) -> None:
+        """Let running jobs finish within the shutdown timeout, then cancel them; their leases expire."""
+        if not self._tasks or self._stopping is None:
+            return
+
+        self._stopping.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=self._config.shutdown_timeout_seconds)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def run_next(self) -> bool:
+        """Claim and run the next due job. Returns whether there was one."""
+        job: Job | None = await self._claim()
+        if job is None:
+            return False
+
+        await self._run(job)
+        return True
+
+    async def _work(self) -> None:
+        assert self._stopping is not None
+        while not self._stopping.is_set():
+            try:
+                ran: bool = await self.run_next()
+            except Exception:
+                logger.exception("Failed to claim a job")
+                ran = False
+
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self._config.poll_interval_seconds)
+                except TimeoutError:
+                    pass
+
+    async def run_schedule(self, kind: str, interval_seconds: float) -> float:
+        """
+        Queue a job of a scheduled kind if its run is due and no other process claimed it.
+
+        Returns:
+            Seconds until the schedule should be checked again
+        """
+        async with self._session_factory() as session:
+            next_run_at: datetime | None = await claim_scheduled_run(session, kind, interval_seconds)
+            if next_run_at is None:
+                await enqueue_job(session, kind, key=kind)
+            await session.commit()
+
+        if next_run_at is None:
+            return interval_seconds
+        # Another process claimed the run; check again once the next one is due
+        wait_seconds: float = (next_run_at - datetime.now(UTC)).total_seconds()
+        return min(max(wait_seconds, self._config.poll_interval_seconds), interval_seconds)
+
+    async def _repeat(self, kind: str, interval_seconds: float) -> None:
+        assert self._stopping is not None
+        while not self._stopping.is_set():
+            delay_seconds: float = interval_seconds
+            try:
+                delay_seconds = await self.run_schedule(kind, interval_seconds)
+            except Exception:
+                logger.exception("Failed to schedule a %s job", kind)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay_seconds)
+            except TimeoutError:
+                pass
+
+    async def _claim(self) -> Job | None:
+        now: datetime = datetime.now(UTC)
+        limit: int = self._config.per_user_limit
+
+        running = aliased(Job)
+        is_running = and_(running.status == JobStatus.RUNNING, running.locked_until > now)
+        busy_users = (
+            select(running.user_id)
+            .where(is_running, running.user_id.is_not(None))
+            .group_by(running.user_id)
+            .having(func.count() >= limit)
+        )
+        due = or_(
+            and_(Job.status == JobStatus.PENDING, Job.run_at <= now),
+            # Lease of a dead worker expired
+            and_(Job.status == JobStatus.RUNNING, Job.locked_until <= now),
+        )
+
+        async with self._session_factory() as session:
+            job: Job | None = await session.scalar(
+                select(Job)
+                .where(due, or_(Job.user_id.is_(None), Job.user_id.not_in(busy_users)))
+                .order_by(Job.run_at, Job.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if job is None:
+                return None
+
+            if job.user_id is not None:
+                # Serialise claims of a user's jobs, so concurrent workers cannot overshoot the limit
+                await session.execute(select(User.id).where(User.id == job.user_id).with_for_update())
+                running_count: int = (
+                    await session.scalar(
+                        select(func.count())
+                        .select_from(running)
+                        .where(is_running, running.user_id == job.user_id, running.id != job.id)
+                    )
+                    or 0
+                )
+                if running_count >= limit:
+                    await session.rollback()
+                    return None
+
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_until = now + timedelta(seconds=self._config.lease_seconds)
+            await session.commit()
+            return job
+
+    async def _run(self, job: Job) -> None:
+        # Updates are conditional on the attempt, in case the lease expired and the job was claimed again
+        is_this_attempt = and_(Job.id == job.id, Job.status == JobStatus.RUNNING, Job.attempts == job.attempts)
+        heartbeat: asyncio.Task[None] = asyncio.create_task(
+            self._heartbeat(job, is_this_attempt), name=f"job-heartbeat-{job.id}"
+        )
+        try:
+            await self._attempt(job, is_this_attempt)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _attempt(self, job: Job, is_this_attempt: ColumnElement[bool]) -> None:
+        try:
+            handler: JobHandler | None = job_handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler for jobs of kind {job.kind!r}")
+
+            async with self._session_factory() as session:
+                await handler(session, job.payload)
+                await session.execute(
+                    update(Job)
+                    .where(is_this_attempt)
+                    .values(status=JobStatus.DONE, locked_until=None, finished_at=datetime.now(UTC), last_error=None)
+                )
+                await session.commit()
+        except Exception as error:
+            logger.exception("Job %d (%s) failed on attempt %d", job.id, job.kind, job.attempts)
+            now: datetime = datetime.now(UTC)
+            values: dict[str, Any] = {"locked_until": None, "last_error": f"{type(error).__name__}: {error}"}
+            if job.attempts < job.max_attempts:
+                values |= {"status": JobStatus.PENDING, "run_at": now + timedelta(seconds=self.backoff(job.attempts))}
+            else:
+                values |= {"status": JobStatus.FAILED, "finished_at": now}
+
+            async with self._session_factory() as session:
+                await session.execute(update(Job).where(is_this_attempt).values(**values))
+                await session.commit()
+
+    async def _heartbeat(self, job: Job, is_this_attempt: ColumnElement[bool]) -> None:
+        """Renew the lease of a running job every third of the lease, until cancelled or the lease is lost."""
+        lease: timedelta = timedelta(seconds=self._config.lease_seconds)
+        while True:
+            await asyncio.sleep(lease.total_seconds() / 3)
+            try:
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        update(Job).where(is_this_attempt).values(locked_until=datetime.now(UTC) + lease)
+                    )
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to renew the lease of job %d", job.id)
+                continue
+
+            if not result.rowcount:
+                logger.warning("Job %d (%s) lost its lease on attempt %d", job.id, job.kind, job.attempts)
+                return
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retrying a job that failed on its `attempts`-th attempt."""
+        return min(self._config.retry_backoff_seconds * 2 ** (attempts - 1), self._config.max_retry_backoff_seconds)
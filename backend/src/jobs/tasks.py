@@ -0,0 +1,121 @@
+"""Built-in job kinds."""
+
+from datetime import UTC, datetime, timedelta
+from logging import Logger
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.fx_rates import load_fx_rate_files
+from analytics.spot_prices import load_quote_files
+from models import AccessToken, Job, User
+from models.item_latest_price import refresh_item_latest_prices
+from models.item_price_history import ensure_item_price_history_partitions
+from models.user_counters import reconcile_user_counters
+from reports.jobs import render_portfolio_report
+from settings import settings
+from sharing.snapshots import reconcile_shared_collection_snapshots
+from utils.enums import JobStatus
+from utils.logger import get_logger
+from utils.types import UserIdType
+
+from .runner import job_handler
+
+logger: Logger = get_logger(__name__)
+
+CLEANUP_ACCESS_TOKENS = "cleanup_access_tokens"
+CLEANUP_JOBS = "cleanup_jobs"
+ENSURE_PRICE_HISTORY_PARTITIONS = "ensure_price_history_partitions"
+LOAD_FX_RATES = "load_fx_rates"
+LOAD_SPOT_PRICES = "load_spot_prices"
+RECONCILE_SHARED_COLLECTION_SNAPSHOTS = "reconcile_shared_collection_snapshots"
+RECONCILE_USER_COUNTERS = "reconcile_user_counters"
+REFRESH_ITEM_LATEST_PRICES = "refresh_item_latest_prices"
+RENDER_REPORT = "render_report"
+
+
+@job_handler(CLEANUP_ACCESS_TOKENS)
+async def cleanup_access_tokens(session: AsyncSession, _: dict[str, Any]) -> None:
+    """Delete access tokens past their lifetime."""
+    expired_before: datetime = datetime.now(UTC) - timedelta(seconds=settings.access_token.lifetime_seconds)
+    await session.execute(delete(AccessToken).where(AccessToken.created_at < expired_before))
+    await session.commit()
+
+
+@job_handler(CLEANUP_JOBS)
+async def cleanup_jobs(session: AsyncSession, _: dict[str, Any]) -> None:
+    """Delete finished jobs past their retention."""
+    finished_before: datetime = datetime.now(UTC) - timedelta(seconds=settings.jobs.finished_retention_seconds)
+    await session.execute(
+        delete(Job).where(Job.status.in_((JobStatus.DONE, JobStatus.FAILED)), Job.finished_at < finished_before)
+    )
+    await session.commit()
+
+
+@job_handler(REFRESH_ITEM_LATEST_PRICES)
+async def refresh_latest_prices(session: AsyncSession, payload: dict[str, Any]) -> None:
+    """Recompute the latest price projection of the payload's `item_ids`, or of all items."""
+    await refresh_item_latest_prices(session, payload.get("item_ids"))
+    await session.commit()
+
+
+@job_handler(RENDER_REPORT)
+async def render_report(session: AsyncSession, payload: dict[str, Any]) -> None:
+    """Render a PDF portfolio report into the disk cache, see `reports.jobs.render_portfolio_report`."""
+    await render_portfolio_report(session, payload)
+
+
+@job_handler(LOAD_FX_RATES)
+async def load_fx_rates(session: AsyncSession, _: dict[str, Any]) -> None:
+    """Load the FX rate files dropped since the last run."""
+    await load_fx_rate_files(session)
+
+
+@job_handler(LOAD_SPOT_PRICES)
+async def load_spot_prices(session: AsyncSession, _: dict[str, Any]) -> None:
+    """Load the spot price quote files dropped since the last run."""
+    await load_quote_files(session)
+
+
+@job_handler(RECONCILE_USER_COUNTERS)
+async def reconcile_counters(session: AsyncSession, _: dict[str, Any]) -> None:
+    """
+    Recount the counters of every user and correct those that drifted.
+
+    Each user is recounted in a transaction of their own, so their counters are only locked
+    for the time of one recount.
+    """
+    user_ids: list[UserIdType] = list(await session.scalars(select(User.id).order_by(User.id)))
+    await session.commit()
+
+    corrected: int = 0
+    for user_id in user_ids:
+        corrected += await reconcile_user_counters(session, user_id)
+        await session.commit()
+
+    if corrected:
+        logger.warning("Corrected the counters of %d of %d users", corrected, len(user_ids))
+
+
+@job_handler(RECONCILE_SHARED_COLLECTION_SNAPSHOTS)
+async def reconcile_snapshots(session: AsyncSession, _: dict[str, Any]) -> None:
+    """Write missing snapshots of shared collections, unlink revoked ones and prune old objects."""
+    published, unlinked, pruned = await reconcile_shared_collection_snapshots(session)
+
+    if published or unlinked or pruned:
+        logger.info(
+            "Published %d shared collection snapshots, unlinked %d and pruned %d objects", published, unlinked, pruned
+        )
+
+
+@job_handler(ENSURE_PRICE_HISTORY_PARTITIONS)
+async def ensure_price_history_partitions(session: AsyncSession, _: dict[str, Any]) -> None:
+    """Create the upcoming yearly partitions of the price history ahead of time."""
+    created: list[str] = await ensure_item_price_history_partitions(
+        session, settings.jobs.price_history_partitions_ahead
+    )
+    await session.commit()
+
+    if created:
+        logger.info("Created price history partitions %s", ", ".join(created))
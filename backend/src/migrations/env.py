@@ -7,6 +7,8 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from models import Base
+from models.item_price_history import PRICE_HISTORY_PARTITION_PREFIX
+from models.search import ITEM_SEARCH_VECTOR_COLUMN
 from settings import settings
 
 # this is the Alembic Config object, which provides
@@ -25,6 +27,26 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", settings.database.dsn)
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Keep autogenerate from dropping structures that are managed outside the models: the search
+    structures, created by migrations only, and the partitions of the price history, with their
+    indexes, created at runtime.
+    """
+    if type_ == "column" and name == ITEM_SEARCH_VECTOR_COLUMN:
+        return False
+    if type_ == "index" and name == "ix_items_search_vector":
+        return False
+    if type_ == "table" and name.startswith(PRICE_HISTORY_PARTITION_PREFIX):
+        return False
+    if type_ in ("index", "unique_constraint", "foreign_key_constraint") and object.table.name.startswith(
+        PRICE_HISTORY_PARTITION_PREFIX
+    ):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -49,6 +71,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -56,7 +79,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,33 @@
+"""add_items_keyset_pagination_index
+
+Revision ID: 5b1e7c3a9d2f
+Revises: 1e2bfadde31d
+Create Date: 2026-10-16 09:00:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e7c3a9d2f"
+down_revision: Union[str, None] = "1e2bfadde31d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_items_user_id_name_id",
+        "items",
+        ["user_id", "name", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_items_user_id_name_id", table_name="items")
@@ -0,0 +1,63 @@
+"""add_item_listing_filter_indexes
+
+Revision ID: 8c4f2d6e1a7b
+Revises: 5b1e7c3a9d2f
+Create Date: 2026-10-16 09:30:41.027319
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4f2d6e1a7b"
+down_revision: Union[str, None] = "5b1e7c3a9d2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_items_collection_id"), "items", ["collection_id"], unique=False
+    )
+    op.create_index(
+        "ix_items_user_id_material", "items", ["user_id", "material"], unique=False
+    )
+    op.create_index("ix_items_user_id_year", "items", ["user_id", "year"], unique=False)
+    op.create_index(
+        "ix_items_user_id_collection_id",
+        "items",
+        ["user_id", "collection_id"],
+        unique=False,
+    )
+    # (item_id, type) supersedes the single-column item_id index
+    op.create_index(
+        "ix_item_price_history_item_id_type",
+        "item_price_history",
+        ["item_id", "type"],
+        unique=False,
+        postgresql_include=["price", "date"],
+    )
+    op.drop_index(
+        op.f("ix_item_price_history_item_id"), table_name="item_price_history"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_item_price_history_item_id"),
+        "item_price_history",
+        ["item_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_item_price_history_item_id_type", table_name="item_price_history"
+    )
+    op.drop_index("ix_items_user_id_collection_id", table_name="items")
+    op.drop_index("ix_items_user_id_year", table_name="items")
+    op.drop_index("ix_items_user_id_material", table_name="items")
+    op.drop_index(op.f("ix_items_collection_id"), table_name="items")
@@ -0,0 +1,66 @@
+"""add_full_text_search
+
+Revision ID: 2d9a6f4b8e13
+Revises: 8c4f2d6e1a7b
+Create Date: 2026-10-16 10:00:27.603914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d9a6f4b8e13"
+down_revision: Union[str, None] = "8c4f2d6e1a7b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Kept up to date by Postgres on every insert/update of name or description
+    op.add_column(
+        "items",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple'::regconfig, "
+                "coalesce(name, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_items_search_vector",
+        "items",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    for table_name in ("items", "collections", "dealers"):
+        op.create_index(
+            f"ix_{table_name}_name_trgm",
+            table_name,
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ("dealers", "collections", "items"):
+        op.drop_index(f"ix_{table_name}_name_trgm", table_name=table_name)
+
+    op.drop_index("ix_items_search_vector", table_name="items")
+    op.drop_column("items", "search_vector")
@@ -0,0 +1,32 @@
+"""add_user_data_version
+
+Revision ID: 6f1a3c8e2b47
+Revises: 2d9a6f4b8e13
+Create Date: 2026-10-16 10:30:12.418207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f1a3c8e2b47"
+down_revision: Union[str, None] = "2d9a6f4b8e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "data_version")
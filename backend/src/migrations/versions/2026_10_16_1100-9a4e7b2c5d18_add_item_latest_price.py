@@ -0,0 +1,75 @@
+"""add_item_latest_price
+
+Revision ID: 9a4e7b2c5d18
+Revises: 6f1a3c8e2b47
+Create Date: 2026-10-16 11:00:41.275903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4e7b2c5d18"
+down_revision: Union[str, None] = "6f1a3c8e2b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "item_latest_price",
+        sa.Column("item_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column(
+            "purchase_price",
+            sa.BigInteger(),
+            nullable=True,
+            comment="Price in pennies/cents",
+        ),
+        sa.Column("purchase_date", sa.Date(), nullable=True),
+        sa.Column(
+            "market_price",
+            sa.BigInteger(),
+            nullable=True,
+            comment="Latest current market price in pennies/cents, null if never revalued",
+        ),
+        sa.Column("market_price_date", sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["item_id"],
+            ["items.id"],
+            name=op.f("fk_item_latest_price_item_id_items"),
+            ondelete="cascade",
+        ),
+        sa.PrimaryKeyConstraint("item_id", name=op.f("pk_item_latest_price")),
+    )
+
+    # Backfill, same as `python -m commands.rebuild_item_latest_prices`
+    op.execute(
+        """
+        INSERT INTO item_latest_price
+            (item_id, purchase_price, purchase_date, market_price, market_price_date)
+        SELECT
+            items.id, purchase.price, purchase.date, market.price, market.date
+        FROM items
+        LEFT JOIN LATERAL (
+            SELECT price, date FROM item_price_history
+            WHERE item_id = items.id AND type = 'PURCHASE'
+            ORDER BY date DESC, id DESC LIMIT 1
+        ) AS purchase ON true
+        LEFT JOIN LATERAL (
+            SELECT price, date FROM item_price_history
+            WHERE item_id = items.id AND type = 'CURRENT'
+            ORDER BY date DESC, id DESC LIMIT 1
+        ) AS market ON true
+        WHERE purchase.price IS NOT NULL OR market.price IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("item_latest_price")
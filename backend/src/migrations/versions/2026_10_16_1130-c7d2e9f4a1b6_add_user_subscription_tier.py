@@ -0,0 +1,36 @@
+"""add_user_subscription_tier
+
+Revision ID: c7d2e9f4a1b6
+Revises: 9a4e7b2c5d18
+Create Date: 2026-10-16 11:30:05.836214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e9f4a1b6"
+down_revision: Union[str, None] = "9a4e7b2c5d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+subscription_tier = sa.Enum("FREE", "ADVANCED", "PRO", name="subscriptiontier")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    subscription_tier.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "users",
+        sa.Column("tier", subscription_tier, server_default="FREE", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "tier")
+    subscription_tier.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,63 @@
+"""add_jobs
+
+Revision ID: 3b8e5f1d7c24
+Revises: c7d2e9f4a1b6
+Create Date: 2026-10-16 12:00:12.402187
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8e5f1d7c24"
+down_revision: Union[str, None] = "c7d2e9f4a1b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+job_status = sa.Enum("PENDING", "RUNNING", "DONE", "FAILED", name="jobstatus")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "jobs",
+        sa.Column("kind", sa.String(length=64), nullable=False, comment="Name of the registered job handler"),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "key", sa.String(length=255), nullable=True, comment="Deduplicates pending and running jobs"
+        ),
+        sa.Column("status", job_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "run_at", sa.DateTime(timezone=True), nullable=False, comment="Not claimed before this time"
+        ),
+        sa.Column(
+            "locked_until", sa.DateTime(timezone=True), nullable=True, comment="Lease of the running job"
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name=op.f("fk_jobs_user_id_users"), ondelete="cascade"
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_jobs")),
+    )
+    op.create_index(op.f("ix_jobs_key"), "jobs", ["key"], unique=False)
+    op.create_index("ix_jobs_status_run_at", "jobs", ["status", "run_at"], unique=False)
+    op.create_index("ix_jobs_user_id_status", "jobs", ["user_id", "status"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_user_id_status", table_name="jobs")
+    op.drop_index("ix_jobs_status_run_at", table_name="jobs")
+    op.drop_index(op.f("ix_jobs_key"), table_name="jobs")
+    op.drop_table("jobs")
+    job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""add_user_counters
+
+Revision ID: e4c1a7b9d356
+Revises: 3b8e5f1d7c24
+Create Date: 2026-10-16 12:30:41.117904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4c1a7b9d356"
+down_revision: Union[str, None] = "3b8e5f1d7c24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("items", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("collections", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("dealers", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name=op.f("fk_user_counters_user_id_users"), ondelete="cascade"
+        ),
+        sa.PrimaryKeyConstraint("user_id", name=op.f("pk_user_counters")),
+    )
+    op.execute(
+        """
+        INSERT INTO user_counters (user_id, items, collections, dealers)
+        SELECT
+            users.id,
+            (SELECT count(*) FROM items WHERE items.user_id = users.id),
+            (SELECT count(*) FROM collections WHERE collections.user_id = users.id),
+            (SELECT count(*) FROM dealers WHERE dealers.user_id = users.id)
+        FROM users
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_counters")
@@ -0,0 +1,120 @@
+"""partition_item_price_history
+
+Revision ID: 9d4f2b6a8e13
+Revises: e4c1a7b9d356
+Create Date: 2026-10-16 13:00:27.518364
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f2b6a8e13"
+down_revision: Union[str, None] = "e4c1a7b9d356"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "price, date, type, item_id, id"
+
+
+def drop_constraints_and_indexes(table_name: str) -> None:
+    op.drop_index(op.f("ix_item_price_history_type"), table_name=table_name)
+    op.drop_index("ix_item_price_history_item_id_type", table_name=table_name)
+    op.drop_constraint(op.f("fk_item_price_history_item_id_items"), table_name, type_="foreignkey")
+    op.drop_constraint(op.f("pk_item_price_history"), table_name, type_="primary")
+
+
+def create_indexes() -> None:
+    op.create_index(
+        "ix_item_price_history_item_id_type",
+        "item_price_history",
+        ["item_id", "type"],
+        unique=False,
+        postgresql_include=["price", "date"],
+    )
+    op.create_index(op.f("ix_item_price_history_type"), "item_price_history", ["type"], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("item_price_history", "item_price_history_unpartitioned")
+    drop_constraints_and_indexes("item_price_history_unpartitioned")
+    op.execute("ALTER SEQUENCE item_price_history_id_seq OWNED BY NONE")
+
+    # The partition key must be part of the primary key; ids stay unique through the sequence
+    op.execute(
+        """
+        CREATE TABLE item_price_history (
+            price BIGINT NOT NULL,
+            date DATE DEFAULT CURRENT_DATE NOT NULL,
+            type pricetype NOT NULL,
+            item_id UUID NOT NULL,
+            id INTEGER DEFAULT nextval('item_price_history_id_seq') NOT NULL,
+            CONSTRAINT pk_item_price_history PRIMARY KEY (id, date),
+            CONSTRAINT fk_item_price_history_item_id_items FOREIGN KEY (item_id) REFERENCES items (id)
+        ) PARTITION BY RANGE (date)
+        """
+    )
+    op.execute("COMMENT ON COLUMN item_price_history.price IS 'Price in pennies/cents'")
+    op.execute("CREATE TABLE item_price_history_default PARTITION OF item_price_history DEFAULT")
+
+    # One partition per year with prices, and for this year and the next
+    this_year: int = date.today().year
+    years: set[int] = {this_year, this_year + 1}
+    years.update(
+        op.get_bind()
+        .execute(sa.text("SELECT DISTINCT extract(year FROM date)::int FROM item_price_history_unpartitioned"))
+        .scalars()
+    )
+    for year in sorted(years):
+        op.execute(
+            f"CREATE TABLE item_price_history_y{year:04d} PARTITION OF item_price_history"
+            f" FOR VALUES FROM ('{date(year, 1, 1)}') TO ('{date(year + 1, 1, 1)}')"
+        )
+
+    op.execute(
+        f"INSERT INTO item_price_history ({COLUMNS}) SELECT {COLUMNS} FROM item_price_history_unpartitioned"
+    )
+    op.drop_table("item_price_history_unpartitioned")
+    op.execute("ALTER SEQUENCE item_price_history_id_seq OWNED BY item_price_history.id")
+
+    create_indexes()
+    op.create_index(
+        "ix_item_price_history_date_brin", "item_price_history", ["date"], unique=False, postgresql_using="brin"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_item_price_history_date_brin", table_name="item_price_history")
+    op.rename_table("item_price_history", "item_price_history_partitioned")
+    drop_constraints_and_indexes("item_price_history_partitioned")
+    op.execute("ALTER SEQUENCE item_price_history_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE item_price_history (
+            price BIGINT NOT NULL,
+            date DATE DEFAULT CURRENT_DATE NOT NULL,
+            type pricetype NOT NULL,
+            item_id UUID NOT NULL,
+            id INTEGER DEFAULT nextval('item_price_history_id_seq') NOT NULL,
+            CONSTRAINT pk_item_price_history PRIMARY KEY (id),
+            CONSTRAINT fk_item_price_history_item_id_items FOREIGN KEY (item_id) REFERENCES items (id)
+        )
+        """
+    )
+    op.execute("COMMENT ON COLUMN item_price_history.price IS 'Price in pennies/cents'")
+    op.execute(
+        f"INSERT INTO item_price_history ({COLUMNS}) SELECT {COLUMNS} FROM item_price_history_partitioned"
+    )
+    # Drops the partitions with it
+    op.drop_table("item_price_history_partitioned")
+    op.execute("ALTER SEQUENCE item_price_history_id_seq OWNED BY item_price_history.id")
+
+    create_indexes()
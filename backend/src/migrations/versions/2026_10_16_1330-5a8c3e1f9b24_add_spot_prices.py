@@ -0,0 +1,42 @@
+"""add_spot_prices
+
+Revision ID: 5a8c3e1f9b24
+Revises: 9d4f2b6a8e13
+Create Date: 2026-10-16 13:30:41.286053
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a8c3e1f9b24"
+down_revision: Union[str, None] = "9d4f2b6a8e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "spot_prices",
+        sa.Column(
+            "material",
+            postgresql.ENUM(name="material", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column(
+            "price", sa.BigInteger(), nullable=False, comment="Price per troy ounce in pennies/cents"
+        ),
+        sa.PrimaryKeyConstraint("material", "date", name=op.f("pk_spot_prices")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("spot_prices")
@@ -0,0 +1,73 @@
+"""add_currencies_and_fx_rates
+
+Revision ID: b6e2d8a4c917
+Revises: 5a8c3e1f9b24
+Create Date: 2026-10-16 14:00:09.731542
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e2d8a4c917"
+down_revision: Union[str, None] = "5a8c3e1f9b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+currency = sa.Enum("EUR", "USD", "GBP", name="currency")
+# The type is created once above; columns must not create it again with their table
+currency_column = postgresql.ENUM(name="currency", create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    currency.create(op.get_bind(), checkfirst=True)
+
+    # Prices recorded so far are taken to be in US dollars
+    op.add_column(
+        "item_price_history",
+        sa.Column("currency", currency_column, server_default="USD", nullable=False),
+    )
+    op.add_column(
+        "users",
+        sa.Column("currency", currency_column, server_default="USD", nullable=False),
+    )
+    op.add_column("item_latest_price", sa.Column("purchase_currency", currency_column, nullable=True))
+    op.add_column("item_latest_price", sa.Column("market_currency", currency_column, nullable=True))
+    op.execute(
+        """
+        UPDATE item_latest_price SET
+            purchase_currency = CASE WHEN purchase_price IS NOT NULL THEN 'USD'::currency END,
+            market_currency = CASE WHEN market_price IS NOT NULL THEN 'USD'::currency END
+        """
+    )
+
+    op.create_table(
+        "fx_rates",
+        sa.Column("currency", currency_column, nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("rate", sa.Float(), nullable=False, comment="Units of the currency per euro"),
+        sa.PrimaryKeyConstraint("currency", "date", name=op.f("pk_fx_rates")),
+    )
+    op.create_table(
+        "feed_versions",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("name", name=op.f("pk_feed_versions")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("feed_versions")
+    op.drop_table("fx_rates")
+    op.drop_column("item_latest_price", "market_currency")
+    op.drop_column("item_latest_price", "purchase_currency")
+    op.drop_column("users", "currency")
+    op.drop_column("item_price_history", "currency")
+    currency.drop(op.get_bind(), checkfirst=True)
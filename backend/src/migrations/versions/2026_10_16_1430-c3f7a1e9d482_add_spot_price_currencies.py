@@ -0,0 +1,39 @@
+"""add_spot_price_currencies
+
+Revision ID: c3f7a1e9d482
+Revises: b6e2d8a4c917
+Create Date: 2026-10-16 14:30:41.208317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f7a1e9d482"
+down_revision: Union[str, None] = "b6e2d8a4c917"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Quotes loaded so far are taken to be in US dollars, like the prices recorded before currencies
+    op.add_column(
+        "spot_prices",
+        sa.Column(
+            "currency",
+            postgresql.ENUM(name="currency", create_type=False),
+            server_default="USD",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("spot_prices", "currency")
@@ -0,0 +1,50 @@
+"""unique_active_job_keys
+
+Revision ID: d8b2f6c4a913
+Revises: c3f7a1e9d482
+Create Date: 2026-10-16 15:00:27.615904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8b2f6c4a913"
+down_revision: Union[str, None] = "c3f7a1e9d482"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates queued by concurrent enqueues keep running, without the key of the oldest one
+    op.execute(
+        """
+        UPDATE jobs SET key = NULL
+        WHERE status IN ('PENDING', 'RUNNING') AND id NOT IN (
+            SELECT min(id) FROM jobs WHERE status IN ('PENDING', 'RUNNING') AND key IS NOT NULL GROUP BY key
+        )
+        """
+    )
+    op.drop_index(op.f("ix_jobs_key"), table_name="jobs")
+    op.create_index(
+        "ix_jobs_key_active",
+        "jobs",
+        ["key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_jobs_key_active",
+        table_name="jobs",
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+    op.create_index(op.f("ix_jobs_key"), "jobs", ["key"], unique=False)
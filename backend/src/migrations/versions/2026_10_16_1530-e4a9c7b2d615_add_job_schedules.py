@@ -0,0 +1,34 @@
+"""add_job_schedules
+
+Revision ID: e4a9c7b2d615
+Revises: d8b2f6c4a913
+Create Date: 2026-10-16 15:30:42.108263
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a9c7b2d615"
+down_revision: Union[str, None] = "d8b2f6c4a913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "job_schedules",
+        sa.Column("kind", sa.String(length=64), nullable=False),
+        sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("kind", name=op.f("pk_job_schedules")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_schedules")
@@ -6,12 +6,27 @@ __all__ = (
     "Collection",
     "Dealer",
     "ItemPriceHistory",
+    "ItemLatestPrice",
+    "Job",
+    "JobSchedule",
+    "UserCounters",
+    "SpotPrice",
+    "FeedVersion",
+    "FxRate",
 )
 
+from . import search  # noqa: F401  (registers full-text search DDL on the metadata)
 from .access_token import AccessToken
 from .base import Base
 from .collection import Collection
 from .dealer import Dealer
+from .feed_version import FeedVersion
+from .fx_rate import FxRate
 from .item import Item
+from .item_latest_price import ItemLatestPrice
 from .item_price_history import ItemPriceHistory
+from .job import Job
+from .job_schedule import JobSchedule
+from .spot_price import SpotPrice
 from .user import User
+from .user_counters import UserCounters
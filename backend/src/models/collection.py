@@ -1,7 +1,9 @@
+from collections.abc import Iterable
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Select, String, Text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -19,6 +21,15 @@ class Collection(Base, UuidPkMixin):
     """User collection of numismatic items."""
 
     __tablename__ = "collections"
+    __table_args__ = (
+        # Fuzzy name search, see models/search.py
+        Index(
+            "ix_collections_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
@@ -35,3 +46,24 @@ class Collection(Base, UuidPkMixin):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="collections")
     items: Mapped[list["Item"]] = relationship("Item", back_populates="collection", lazy="select")
+
+
+async def touch_collections(session: AsyncSession, collection_ids: Select[Any] | Iterable[str | None]) -> None:
+    """
+    Set `updated_at` of collections to now, without committing.
+
+    Changes to the items of a collection do not update its row, so they must touch it for
+    `updated_at` to tell when the collection as shared last changed. Takes IDs or a query
+    selecting them; None IDs of items outside any collection are ignored.
+    """
+    if not isinstance(collection_ids, Select):
+        collection_ids = [collection_id for collection_id in collection_ids if collection_id is not None]
+        if not collection_ids:
+            return
+
+    await session.execute(
+        update(Collection)
+        .where(Collection.id.in_(collection_ids))
+        .values(updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
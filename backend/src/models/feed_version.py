@@ -0,0 +1,32 @@
+from sqlalchemy import String, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class FeedVersion(Base):
+    """
+    Version of each reference data feed loaded from files, such as spot prices and FX rates.
+
+    Bumped in the transaction of every load, so the per-process caches of a feed in every
+    worker know when to reload it by reading one row.
+    """
+
+    __tablename__ = "feed_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+async def get_feed_version(session: AsyncSession, name: str) -> int:
+    return await session.scalar(select(FeedVersion.version).where(FeedVersion.name == name)) or 0
+
+
+async def bump_feed_version(session: AsyncSession, name: str) -> None:
+    """Mark the feed as changed; must run in the transaction of the change."""
+    result = await session.execute(
+        update(FeedVersion).where(FeedVersion.name == name).values(version=FeedVersion.version + 1)
+    )
+    if not result.rowcount:
+        await session.execute(insert(FeedVersion).values(name=name, version=1))
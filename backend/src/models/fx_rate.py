@@ -0,0 +1,94 @@
+from collections.abc import Sequence
+from datetime import date as dt_date
+from typing import Any
+
+from sqlalchemy import BigInteger, ColumnElement, Date, Float, case, cast, delete, func, insert, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, aliased, mapped_column
+
+from utils.enums import Currency
+
+from .base import Base
+from .feed_version import bump_feed_version
+
+FX_RATES_FEED = "fx_rates"
+
+
+class FxRate(Base):
+    """
+    Daily reference rate of a currency against the euro, loaded from the rate files dropped
+    on the server. The euro itself is always 1 and has no rows.
+    """
+
+    __tablename__ = "fx_rates"
+
+    currency: Mapped[Currency] = mapped_column(primary_key=True)
+    date: Mapped[dt_date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[float] = mapped_column(Float, comment="Units of the currency per euro")
+
+
+async def upsert_fx_rates(session: AsyncSession, rates: Sequence[dict[str, Any]]) -> None:
+    """Store rates given as `currency`, `date` and `rate`, replacing those of the same currency and day."""
+    latest: dict[tuple[Currency, dt_date], dict[str, Any]] = {
+        (rate["currency"], rate["date"]): rate for rate in rates if rate["currency"] != Currency.EUR
+    }
+    if latest:
+        await session.execute(delete(FxRate).where(tuple_(FxRate.currency, FxRate.date).in_(list(latest))))
+        await session.execute(insert(FxRate), list(latest.values()))
+    await bump_feed_version(session, FX_RATES_FEED)
+
+
+def fx_rate(currency: ColumnElement[Currency] | Currency, on: ColumnElement[dt_date]) -> ColumnElement[float]:
+    """
+    Rate of `currency` per euro on the day `on`: the latest one quoted on or before it, else
+    the earliest one quoted. Null if the currency was never quoted.
+
+    Each lookup is a correlated subquery that seeks the (currency, date) primary key, so rates
+    are joined to every row without reading the rate table in full.
+    """
+    if isinstance(currency, Currency):
+        if currency == Currency.EUR:
+            return literal(1.0, Float)
+        currency = literal(currency, FxRate.currency.type)
+
+    rates = aliased(FxRate)
+    on_or_before = (
+        select(rates.rate)
+        .where(rates.currency == currency, rates.date <= on)
+        .order_by(rates.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    earliest = select(rates.rate).where(rates.currency == currency).order_by(rates.date).limit(1).scalar_subquery()
+    return case((currency == Currency.EUR, 1.0), else_=func.coalesce(on_or_before, earliest))
+
+
+def converted_price(
+    price: ColumnElement[int], currency: ColumnElement[Currency], on: ColumnElement[dt_date], target: Currency
+) -> ColumnElement[int]:
+    """
+    SQL expression of a price in pennies/cents converted to `target` at the rates of the day
+    `on`. Prices already in `target` are returned as they are, without looking up any rate.
+    Null if either currency was never quoted; see `price_in` for a fallback.
+    """
+    return case(
+        (currency == target, price),
+        else_=cast(func.round(price * fx_rate(target, on) / fx_rate(currency, on)), BigInteger),
+    )
+
+
+def price_in(
+    price: ColumnElement[int], currency: ColumnElement[Currency], on: ColumnElement[dt_date], target: Currency
+) -> tuple[ColumnElement[int], ColumnElement[Currency]]:
+    """
+    SQL expressions of a price converted to `target` as by `converted_price`, and of the
+    currency it ends up in.
+
+    A price that cannot be converted, its currency or `target` never having been quoted, is
+    left as it is in its own currency rather than turned into null.
+    """
+    converted: ColumnElement[int] = converted_price(price, currency, on, target)
+    return (
+        func.coalesce(converted, price),
+        case((converted.is_(None), currency), else_=literal(target, currency.type)),
+    )
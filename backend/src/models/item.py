@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Float, ForeignKey, String, Text
+from sqlalchemy import Float, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from utils.enums import Material
@@ -17,6 +17,21 @@ if TYPE_CHECKING:
 
 class Item(Base, UuidPkMixin):
     __tablename__ = "items"
+    __table_args__ = (
+        # Keyset pagination of a user's items ordered by (name, id)
+        Index("ix_items_user_id_name_id", "user_id", "name", "id"),
+        # Filtering and sorting of a user's item listing
+        Index("ix_items_user_id_material", "user_id", "material"),
+        Index("ix_items_user_id_year", "user_id", "year"),
+        Index("ix_items_user_id_collection_id", "user_id", "collection_id"),
+        # Fuzzy name search, see models/search.py
+        Index(
+            "ix_items_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     name: Mapped[str] = mapped_column(String(255))
     year: Mapped[str] = mapped_column(String(10))
@@ -27,7 +42,7 @@ class Item(Base, UuidPkMixin):
 
     # Foreign keys
     user_id: Mapped[UserIdType] = mapped_column(ForeignKey("users.id"))
-    collection_id: Mapped[str | None] = mapped_column(ForeignKey("collections.id"))
+    collection_id: Mapped[str | None] = mapped_column(ForeignKey("collections.id"), index=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="items")
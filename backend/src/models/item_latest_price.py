@@ -0,0 +1,184 @@
+from collections.abc import Sequence
+from datetime import date as dt_date
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Date,
+    ForeignKey,
+    Subquery,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.enums import Currency, PriceType
+
+from .base import Base
+from .fx_rate import converted_price
+from .item import Item
+from .item_price_history import ItemPriceHistory
+
+
+class ItemLatestPrice(Base):
+    """
+    Projection of `item_price_history` with one row per item: its purchase price and its
+    latest current market price.
+
+    Valuations read this table instead of ranking the whole history. It is kept in sync by
+    `refresh_item_latest_prices`, which must run in the same transaction as every change to
+    an item's price history.
+    """
+
+    __tablename__ = "item_latest_price"
+
+    item_id: Mapped[str] = mapped_column(ForeignKey("items.id", ondelete="cascade"), primary_key=True)
+    purchase_price: Mapped[int | None] = mapped_column(BigInteger, comment="Price in pennies/cents")
+    purchase_date: Mapped[dt_date | None] = mapped_column(Date)
+    purchase_currency: Mapped[Currency | None] = mapped_column()
+    market_price: Mapped[int | None] = mapped_column(
+        BigInteger, comment="Latest current market price in pennies/cents, null if never revalued"
+    )
+    market_price_date: Mapped[dt_date | None] = mapped_column(Date)
+    market_currency: Mapped[Currency | None] = mapped_column()
+
+
+async def refresh_item_latest_prices(session: AsyncSession, item_ids: Sequence[str] | None = None) -> None:
+    """
+    Recompute the latest price projection of the given items, or of all items when omitted.
+
+    Only the history rows of the given items are read, through the (item_id, type) index.
+    Pending changes of the session are flushed first so they are taken into account.
+
+    The item rows are locked first, in a stable order, so concurrent refreshes of an item run
+    one after the other: under READ COMMITTED the second one then sees the history and the
+    projection row committed by the first, instead of missing them and inserting a duplicate.
+    The lock is FOR NO KEY UPDATE, which does not conflict with the FOR KEY SHARE lock that the
+    foreign key check of each flushed history row takes on its item; FOR UPDATE would make two
+    concurrent price writes to an item wait on each other's key share and deadlock.
+    """
+    await session.flush()
+
+    items_to_lock = select(Item.id).order_by(Item.id).with_for_update(key_share=True)
+    if item_ids is not None:
+        items_to_lock = items_to_lock.where(Item.id.in_(item_ids))
+    await session.execute(items_to_lock)
+
+    ranked_prices = select(
+        ItemPriceHistory.item_id,
+        ItemPriceHistory.type,
+        ItemPriceHistory.price,
+        ItemPriceHistory.date,
+        ItemPriceHistory.currency,
+        func.row_number()
+        .over(
+            partition_by=(ItemPriceHistory.item_id, ItemPriceHistory.type),
+            order_by=(ItemPriceHistory.date.desc(), ItemPriceHistory.id.desc()),
+        )
+        .label("price_rank"),
+    )
+    stale_rows = delete(ItemLatestPrice)
+    if item_ids is not None:
+        ranked_prices = ranked_prices.where(ItemPriceHistory.item_id.in_(item_ids))
+        stale_rows = stale_rows.where(ItemLatestPrice.item_id.in_(item_ids))
+
+    ranked = ranked_prices.subquery("ranked_prices")
+    is_purchase = ranked.c.type == PriceType.PURCHASE
+    is_current = ranked.c.type == PriceType.CURRENT
+    latest_prices = (
+        select(
+            ranked.c.item_id,
+            func.max(case((is_purchase, ranked.c.price))),
+            func.max(case((is_purchase, ranked.c.date))),
+            func.max(case((is_purchase, ranked.c.currency))),
+            func.max(case((is_current, ranked.c.price))),
+            func.max(case((is_current, ranked.c.date))),
+            func.max(case((is_current, ranked.c.currency))),
+        )
+        .where(ranked.c.price_rank == 1)
+        .group_by(ranked.c.item_id)
+    )
+
+    await session.execute(stale_rows)
+    await session.execute(
+        insert(ItemLatestPrice).from_select(
+            [
+                "item_id",
+                "purchase_price",
+                "purchase_date",
+                "purchase_currency",
+                "market_price",
+                "market_price_date",
+                "market_currency",
+            ],
+            latest_prices,
+        )
+    )
+
+
+def latest_purchase_price_in(currency: Currency) -> ColumnElement[int]:
+    """Purchase price of the projection converted to `currency` at the rates of the purchase date."""
+    return converted_price(
+        ItemLatestPrice.purchase_price, ItemLatestPrice.purchase_currency, ItemLatestPrice.purchase_date, currency
+    )
+
+
+def latest_market_price_in(currency: Currency) -> ColumnElement[int]:
+    """Latest market price of the projection converted to `currency` at the rates of its date."""
+    return converted_price(
+        ItemLatestPrice.market_price, ItemLatestPrice.market_currency, ItemLatestPrice.market_price_date, currency
+    )
+
+
+def latest_valuation_in(currency: Currency) -> Subquery:
+    """
+    Subquery valuing every item of the projection in `currency`, with the columns item_id,
+    currency, purchase_price, purchase_date and market_price.
+
+    An item is valued in `currency` when both its prices can be converted to it. Otherwise,
+    one of them being in a currency without FX rates, the item is valued unconverted in the
+    currency of its purchase price, and a market price in another currency is left out as if
+    the item had never been revalued. Prices are thus never null for want of a rate, and the
+    prices of an item are always in the same currency.
+    """
+    converted = select(
+        ItemLatestPrice.item_id,
+        ItemLatestPrice.purchase_price,
+        ItemLatestPrice.purchase_date,
+        ItemLatestPrice.purchase_currency,
+        ItemLatestPrice.market_price,
+        ItemLatestPrice.market_currency,
+        latest_purchase_price_in(currency).label("purchase_converted"),
+        latest_market_price_in(currency).label("market_converted"),
+    ).subquery("converted_prices")
+
+    in_currency = and_(
+        or_(converted.c.purchase_price.is_(None), converted.c.purchase_converted.is_not(None)),
+        or_(converted.c.market_price.is_(None), converted.c.market_converted.is_not(None)),
+    )
+    return select(
+        converted.c.item_id,
+        case(
+            (in_currency, literal(currency, ItemLatestPrice.purchase_currency.type)),
+            else_=func.coalesce(converted.c.purchase_currency, converted.c.market_currency),
+        ).label("currency"),
+        case((in_currency, converted.c.purchase_converted), else_=converted.c.purchase_price).label("purchase_price"),
+        converted.c.purchase_date,
+        case(
+            (in_currency, converted.c.market_converted),
+            (
+                or_(
+                    converted.c.purchase_currency.is_(None),
+                    converted.c.market_currency == converted.c.purchase_currency,
+                ),
+                converted.c.market_price,
+            ),
+        ).label("market_price"),
+    ).subquery("latest_valuations")
@@ -1,33 +1,114 @@
 from datetime import date as dt_date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, Date, ForeignKey, func
+from sqlalchemy import BigInteger, Date, ForeignKey, Index, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.mixins.id_int_pk import IdIntPkMixin
-from utils.enums import PriceType
+from utils.enums import Currency, PriceType
 
 from .base import Base
 
 if TYPE_CHECKING:
     from .item import Item
 
+# Partitions are named with this prefix; they are created at runtime and unknown to the models
+PRICE_HISTORY_PARTITION_PREFIX = "item_price_history_"
+PARTITION_DEFAULT = f"{PRICE_HISTORY_PARTITION_PREFIX}default"
+
 
 class ItemPriceHistory(Base, IdIntPkMixin):
     """
     Track price history for items including purchase, sale, and current market prices.
 
     Stores prices as integers (pennies/cents) to avoid floating point precision issues.
+
+    On Postgres the table is range-partitioned by `date`, one partition per year plus a
+    default partition, so date-bounded queries only scan the partitions of their years and
+    old years can be detached or dropped without a bulk delete. The partition key has to be
+    part of the primary key there, which is (id, date) as created by the migration; `id`
+    alone stays unique, being drawn from a sequence, and is what the ORM maps.
     """
 
     __tablename__ = "item_price_history"
+    __table_args__ = (
+        # Join of an item to its purchase/current entries; price and date are covered on Postgres
+        Index(
+            "ix_item_price_history_item_id_type",
+            "item_id",
+            "type",
+            postgresql_include=["price", "date"],
+        ),
+        # Date range scans; tiny since rows are appended in roughly date order
+        Index("ix_item_price_history_date_brin", "date", postgresql_using="brin").ddl_if(dialect="postgresql"),
+    )
 
     price: Mapped[int] = mapped_column(BigInteger, comment="Price in pennies/cents")
     date: Mapped[dt_date] = mapped_column(Date, server_default=func.current_date())
     type: Mapped[PriceType] = mapped_column(index=True)
+    currency: Mapped[Currency] = mapped_column(default=Currency.USD, server_default=Currency.USD.name)
 
     # Foreign keys
-    item_id: Mapped[str] = mapped_column(ForeignKey("items.id"), index=True)
+    item_id: Mapped[str] = mapped_column(ForeignKey("items.id"))
 
     # Relationships
     item: Mapped["Item"] = relationship("Item", back_populates="price_history")
+
+
+def price_history_partition(year: int) -> str:
+    """Name of the partition of `item_price_history` holding the prices dated in `year`."""
+    return f"{PRICE_HISTORY_PARTITION_PREFIX}y{year:04d}"
+
+
+async def ensure_item_price_history_partitions(session: AsyncSession, years_ahead: int = 1) -> list[str]:
+    """
+    Create the yearly partitions of `item_price_history` that are missing on Postgres.
+
+    Covers the current year, the next `years_ahead` years, and every year with prices that
+    fell into the default partition for lack of one. Those prices are moved into the new
+    partition before it is attached. Does nothing on other databases, whose table is not
+    partitioned.
+
+    Returns:
+        The names of the created partitions
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return []
+
+    existing: set[str] = set(
+        await session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = 'item_price_history'::regclass"
+            )
+        )
+    )
+    this_year: int = dt_date.today().year
+    years: set[int] = set(range(this_year, this_year + years_ahead + 1))
+    years.update(await session.scalars(text(f"SELECT DISTINCT extract(year FROM date)::int FROM {PARTITION_DEFAULT}")))
+
+    created: list[str] = []
+    for year in sorted(years):
+        name: str = price_history_partition(year)
+        if name in existing:
+            continue
+
+        start, end = dt_date(year, 1, 1), dt_date(year + 1, 1, 1)
+        await session.execute(text(f"CREATE TABLE {name} (LIKE item_price_history INCLUDING DEFAULTS)"))
+        # Attaching is refused while the default partition holds rows of the new range
+        await session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {PARTITION_DEFAULT} WHERE date >= :start AND date < :end RETURNING *)"
+                f" INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        # Indexes, the primary key and the foreign key are created from the parent's
+        await session.execute(
+            text(f"ALTER TABLE item_price_history ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+        )
+        created.append(name)
+
+    return created
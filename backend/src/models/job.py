@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.enums import JobStatus
+from utils.types import UserIdType
+
+from .base import Base
+from .mixins.id_int_pk import IdIntPkMixin
+
+# Jobs that are pending or running, as the predicate of the partial index on their keys.
+# Statuses are stored by name.
+ACTIVE_JOB_KEY_WHERE = text("status IN ('PENDING', 'RUNNING')")
+
+
+class Job(Base, IdIntPkMixin):
+    """
+    Queued unit of background work, run by the job runner (see `jobs/runner.py`).
+
+    A job is claimed by setting it running with a lease: if its worker dies, the lease
+    expires and another worker claims it again.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claiming of the next due job
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+        # Per-user concurrency limit
+        Index("ix_jobs_user_id_status", "user_id", "status"),
+        # At most one pending or running job per key, enforced for concurrent enqueues
+        Index(
+            "ix_jobs_key_active",
+            "key",
+            unique=True,
+            postgresql_where=ACTIVE_JOB_KEY_WHERE,
+            sqlite_where=ACTIVE_JOB_KEY_WHERE,
+        ),
+    )
+
+    kind: Mapped[str] = mapped_column(String(64), comment="Name of the registered job handler")
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    key: Mapped[str | None] = mapped_column(String(255), comment="Deduplicates pending and running jobs")
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column()
+    last_error: Mapped[str | None] = mapped_column(Text)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), comment="Not claimed before this time")
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), comment="Lease of the running job")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    # Foreign keys
+    user_id: Mapped[UserIdType | None] = mapped_column(ForeignKey("users.id", ondelete="cascade"))
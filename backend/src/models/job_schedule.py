@@ -0,0 +1,48 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import DateTime, String, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class JobSchedule(Base):
+    """
+    When the job runner next queues a job of each scheduled kind (see `JobRunner.schedule`).
+
+    Every API process runs the schedules, so a process queues a job only after claiming its
+    run by moving `next_run_at` forward; the others find it in the future and skip it. The
+    schedule thus survives restarts and deploys instead of running again at every startup.
+    """
+
+    __tablename__ = "job_schedules"
+
+    kind: Mapped[str] = mapped_column(String(64), primary_key=True)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+async def claim_scheduled_run(session: AsyncSession, kind: str, interval_seconds: float) -> datetime | None:
+    """
+    Claim the due run of a scheduled job kind, without committing.
+
+    Returns:
+        None if the run was claimed and its job should be queued, otherwise when the next run is due
+    """
+    now: datetime = datetime.now(UTC)
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    await session.execute(
+        dialect.insert(JobSchedule).values(kind=kind, next_run_at=now).on_conflict_do_nothing(index_elements=["kind"])
+    )
+    # The conditional update lets a single one of concurrent claims through
+    result = await session.execute(
+        update(JobSchedule)
+        .where(JobSchedule.kind == kind, JobSchedule.next_run_at <= now)
+        .values(next_run_at=now + timedelta(seconds=interval_seconds))
+    )
+    if result.rowcount:
+        return None
+
+    next_run_at: datetime = await session.scalar(select(JobSchedule.next_run_at).where(JobSchedule.kind == kind))
+    return next_run_at if next_run_at.tzinfo else next_run_at.replace(tzinfo=UTC)
@@ -0,0 +1,59 @@
+"""
+Full-text search structures that live outside the ORM column mapping.
+
+On Postgres, items carry a generated `search_vector` tsvector column and the searchable
+names have pg_trgm GIN indexes; both are created by migrations. On SQLite (used by the
+test suite) the same searches run against FTS5 external-content tables that are kept in
+sync with their source tables by triggers created together with the metadata.
+"""
+
+from sqlalchemy import DDL, event, literal_column
+
+from .base import Base
+
+# Generated column created by migrations on Postgres only, see migrations/versions/*_add_full_text_search.py
+ITEM_SEARCH_VECTOR_COLUMN = "search_vector"
+item_search_vector = literal_column(f"items.{ITEM_SEARCH_VECTOR_COLUMN}")
+
+# Text search configuration: names are multilingual, so no stemming
+SEARCH_TS_CONFIG = "simple"
+
+# Source table -> columns indexed by its FTS5 table on SQLite
+SQLITE_FTS_TABLES: dict[str, tuple[str, ...]] = {
+    "items": ("name", "description"),
+    "collections": ("name",),
+    "dealers": ("name",),
+}
+
+
+def fts_table_name(table_name: str) -> str:
+    return f"{table_name}_fts"
+
+
+def _sqlite_fts_ddl(table_name: str, columns: tuple[str, ...]) -> list[str]:
+    fts_table: str = fts_table_name(table_name)
+    column_list: str = ", ".join(columns)
+    new_values: str = ", ".join(f"new.{column}" for column in columns)
+    old_values: str = ", ".join(f"old.{column}" for column in columns)
+    delete_row: str = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});"
+    )
+    insert_row: str = f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.rowid, {new_values});"
+
+    return [
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+        f"{column_list}, content='{table_name}', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table_name} BEGIN {insert_row} END",
+        f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table_name} BEGIN {delete_row} END",
+        f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table_name} BEGIN {delete_row} {insert_row} END",
+    ]
+
+
+for _table_name, _columns in SQLITE_FTS_TABLES.items():
+    for _statement in _sqlite_fts_ddl(_table_name, _columns):
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(
+        Base.metadata,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table_name(_table_name)}").execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,68 @@
+from collections.abc import Sequence
+from datetime import date as dt_date
+from typing import Any, NamedTuple
+
+from sqlalchemy import BigInteger, Date, delete, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.enums import Currency, Material
+
+from .base import Base
+from .feed_version import bump_feed_version
+
+SPOT_PRICES_FEED = "spot_prices"
+
+
+class SpotPrice(Base):
+    """
+    Daily spot price quote of a metal, loaded from the quote files dropped on the server.
+
+    Prices are per troy ounce of pure metal, as integers (pennies/cents) like every price.
+    """
+
+    __tablename__ = "spot_prices"
+
+    material: Mapped[Material] = mapped_column(primary_key=True)
+    date: Mapped[dt_date] = mapped_column(Date, primary_key=True)
+    price: Mapped[int] = mapped_column(BigInteger, comment="Price per troy ounce in pennies/cents")
+    currency: Mapped[Currency] = mapped_column(default=Currency.USD, server_default=Currency.USD.name)
+
+
+class LatestSpotPrice(NamedTuple):
+    price: int  # per troy ounce in pennies/cents
+    date: dt_date
+    currency: Currency
+
+
+async def upsert_spot_prices(session: AsyncSession, quotes: Sequence[dict[str, Any]]) -> None:
+    """
+    Store quotes given as `material`, `date`, `price` and `currency`, replacing those of the
+    same material and day.
+    """
+    # The last quote of a material and day wins
+    latest: dict[tuple[Material, dt_date], dict[str, Any]] = {
+        (quote["material"], quote["date"]): quote for quote in quotes
+    }
+    if latest:
+        await session.execute(delete(SpotPrice).where(tuple_(SpotPrice.material, SpotPrice.date).in_(list(latest))))
+        await session.execute(insert(SpotPrice), list(latest.values()))
+    await bump_feed_version(session, SPOT_PRICES_FEED)
+
+
+async def latest_spot_prices(session: AsyncSession) -> dict[Material, LatestSpotPrice]:
+    """Latest quoted price per troy ounce, with its date and currency, per material with any quote."""
+    latest_dates = (
+        select(SpotPrice.material, func.max(SpotPrice.date).label("date"))
+        .group_by(SpotPrice.material)
+        .subquery("latest_dates")
+    )
+    result = await session.execute(
+        select(SpotPrice.material, SpotPrice.price, SpotPrice.date, SpotPrice.currency).join(
+            latest_dates, (latest_dates.c.material == SpotPrice.material) & (latest_dates.c.date == SpotPrice.date)
+        )
+    )
+    return {
+        Material(material): LatestSpotPrice(price, date, Currency(currency))
+        for material, price, date, currency in result
+    }
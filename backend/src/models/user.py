@@ -1,9 +1,11 @@
 from typing import TYPE_CHECKING
 
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTable, SQLAlchemyUserDatabase
+from sqlalchemy import BigInteger
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from utils.enums import Currency, SubscriptionTier
 from utils.types import UserIdType
 
 from .base import Base
@@ -17,6 +19,16 @@ if TYPE_CHECKING:
 class User(Base, IdIntPkMixin, SQLAlchemyBaseUserTable[UserIdType]):
     __tablename__ = "users"
 
+    tier: Mapped[SubscriptionTier] = mapped_column(
+        default=SubscriptionTier.FREE, server_default=SubscriptionTier.FREE.name
+    )
+
+    # Currency prices are converted to for valuations and listings
+    currency: Mapped[Currency] = mapped_column(default=Currency.USD, server_default=Currency.USD.name)
+
+    # Bumped by every change to the user's items, collections and dealers; backs their ETags
+    data_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+
     # Relationships
     items: Mapped[list["Item"]] = relationship("Item", back_populates="user", lazy="select")
     collections: Mapped[list["Collection"]] = relationship("Collection", back_populates="user", lazy="select")
@@ -0,0 +1,103 @@
+from sqlalchemy import ForeignKey, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.types import UserIdType
+
+from .base import Base
+from .collection import Collection
+from .dealer import Dealer
+from .item import Item
+from .user import User
+
+
+class UserCounters(Base):
+    """
+    Number of items, collections and dealers of each user, to check tier limits without counting.
+
+    Kept in sync by `update_user_counters` in the transaction of every insert and delete, and
+    resynchronised by `reconcile_user_counters`. A user without a row yet gets one counted
+    from their data on first use.
+    """
+
+    __tablename__ = "user_counters"
+
+    user_id: Mapped[UserIdType] = mapped_column(ForeignKey("users.id", ondelete="cascade"), primary_key=True)
+    items: Mapped[int] = mapped_column(default=0, server_default="0")
+    collections: Mapped[int] = mapped_column(default=0, server_default="0")
+    dealers: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+async def count_user_rows(session: AsyncSession, user_id: UserIdType) -> tuple[int, int, int]:
+    """Count the user's items, collections and dealers."""
+    row = (
+        await session.execute(
+            select(
+                select(func.count()).select_from(Item).where(Item.user_id == user_id).scalar_subquery(),
+                select(func.count()).select_from(Collection).where(Collection.user_id == user_id).scalar_subquery(),
+                select(func.count()).select_from(Dealer).where(Dealer.user_id == user_id).scalar_subquery(),
+            )
+        )
+    ).one()
+    return row[0], row[1], row[2]
+
+
+async def lock_user_counters(session: AsyncSession, user_id: UserIdType) -> UserCounters:
+    """
+    Read the user's counters and lock them until the end of the transaction.
+
+    Holding the lock while checking a limit and inserting serialises concurrent inserts of
+    the same user, so they cannot overshoot the limit together.
+    """
+    locked_counters = select(UserCounters).where(UserCounters.user_id == user_id).with_for_update()
+    counters: UserCounters | None = await session.scalar(locked_counters)
+    if counters is not None:
+        return counters
+
+    # Lock the user while creating their row, so concurrent requests do not both insert it
+    await session.execute(select(User.id).where(User.id == user_id).with_for_update())
+    counters = await session.scalar(locked_counters)
+    if counters is None:
+        items, collections, dealers = await count_user_rows(session, user_id)
+        counters = UserCounters(user_id=user_id, items=items, collections=collections, dealers=dealers)
+        session.add(counters)
+        await session.flush()
+    return counters
+
+
+async def update_user_counters(
+    session: AsyncSession, user_id: UserIdType, *, items: int = 0, collections: int = 0, dealers: int = 0
+) -> None:
+    """
+    Add the given deltas to the user's counters.
+
+    Must run in the transaction of each insert and delete of the user's items, collections
+    or dealers. A user without a counters row is left alone: their row is counted from
+    their data, changes included, once it is needed.
+    """
+    await session.execute(
+        update(UserCounters)
+        .where(UserCounters.user_id == user_id)
+        .values(
+            items=UserCounters.items + items,
+            collections=UserCounters.collections + collections,
+            dealers=UserCounters.dealers + dealers,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_user_counters(session: AsyncSession, user_id: UserIdType) -> bool:
+    """
+    Recount the user's counters and correct them if they drifted, in the current transaction.
+
+    Returns:
+        Whether the counters were wrong
+    """
+    counters: UserCounters = await lock_user_counters(session, user_id)
+    counted: tuple[int, int, int] = await count_user_rows(session, user_id)
+    if (counters.items, counters.collections, counters.dealers) == counted:
+        return False
+
+    counters.items, counters.collections, counters.dealers = counted
+    return True
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Collection, Item, Job
+from models.item_latest_price import latest_valuation_in
+from reports.pdf import ReportItem, render_portfolio_pdf
+from settings import settings
+from utils.enums import Currency
+from utils.types import UserIdType
+
+
+class ReportRenderer:
+    """
+    Render PDF reports in a bounded pool of worker processes, off the event loop.
+
+    Reports are rendered by jobs of the job runner, so their status lives in the `jobs` table
+    and every API process sees it. A report is identified by a hash of its owner, its
+    parameters and the owner's data version, which doubles as the report ID and, prefixed,
+    as the key of its job. Requesting a report that is queued or rendering returns its job,
+    and a report that was rendered before is served from the disk cache until the user's
+    data changes.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor | None = None
+
+    @staticmethod
+    def job_id(user_id: UserIdType, parameters: dict[str, Any], data_version: int) -> str:
+        key: bytes = orjson.dumps([user_id, parameters, data_version], option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(key).hexdigest()[:32]
+
+    @staticmethod
+    def job_key(job_id: str) -> str:
+        """Key of the job rendering a report, which deduplicates identical requests."""
+        return f"report:{job_id}"
+
+    @staticmethod
+    def path(user_id: UserIdType, job_id: str) -> Path:
+        return settings.reports.cache_dir / str(user_id) / f"{job_id}.pdf"
+
+    async def get(self, session: AsyncSession, user_id: UserIdType, job_id: str) -> Job | None:
+        """Return the latest job of the user rendering a report, None if there is none."""
+        return await session.scalar(
+            select(Job).where(Job.user_id == user_id, Job.key == self.job_key(job_id)).order_by(Job.id.desc()).limit(1)
+        )
+
+    async def render(
+        self, user_id: UserIdType, job_id: str, title: str, subtitle: str, items: list[ReportItem]
+    ) -> None:
+        """Render a report into the disk cache in a worker process."""
+        path: Path = self.path(user_id, job_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.prune(path.parent)
+
+        await asyncio.get_running_loop().run_in_executor(
+            self.executor, render_portfolio_pdf, str(path), title, subtitle, items
+        )
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.reports.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def prune(self, directory: Path) -> None:
+        """Delete cached reports older than the configured TTL."""
+        expired_before: float = time.time() - settings.reports.cache_ttl_seconds
+        for path in directory.glob("*.pdf"):
+            if path.stat().st_mtime < expired_before:
+                path.unlink(missing_ok=True)
+
+
+report_renderer = ReportRenderer()
+
+
+async def render_portfolio_report(session: AsyncSession, payload: dict[str, Any]) -> None:
+    """
+    Render the portfolio report of a job payload: the `user_id` and `job_id` of the report,
+    the `currency` of its prices and its `collection_id`, `date_from` and `date_to` filters.
+
+    Does nothing when the report is in the disk cache already, so a job that runs again
+    does not render it twice.
+    """
+    user_id: UserIdType = payload["user_id"]
+    job_id: str = payload["job_id"]
+    if report_renderer.path(user_id, job_id).exists():
+        return
+
+    currency = Currency(payload["currency"])
+    collection_id: str | None = payload.get("collection_id")
+    date_from: date | None = date.fromisoformat(payload["date_from"]) if payload.get("date_from") else None
+    date_to: date | None = date.fromisoformat(payload["date_to"]) if payload.get("date_to") else None
+
+    valuation = latest_valuation_in(currency)
+    query = (
+        select(
+            Item.name,
+            Item.year,
+            Item.material,
+            Collection.name,
+            valuation.c.purchase_price,
+            valuation.c.purchase_date,
+            valuation.c.market_price,
+            valuation.c.currency,
+        )
+        .outerjoin(valuation, valuation.c.item_id == Item.id)
+        .outerjoin(Collection, Collection.id == Item.collection_id)
+        .where(Item.user_id == user_id)
+        .order_by(Item.name, Item.id)
+    )
+    if collection_id is not None:
+        query = query.where(Item.collection_id == collection_id)
+    if date_from is not None:
+        query = query.where(valuation.c.purchase_date >= date_from)
+    if date_to is not None:
+        query = query.where(valuation.c.purchase_date <= date_to)
+
+    result = await session.execute(query)
+    items: list[ReportItem] = [
+        ReportItem(
+            name,
+            year,
+            str(material),
+            collection,
+            purchase_price,
+            purchase_date,
+            market_price,
+            None if item_currency in (None, currency) else str(item_currency),
+        )
+        for name, year, material, collection, purchase_price, purchase_date, market_price, item_currency in result
+    ]
+    # Release the connection before rendering, which takes a while
+    await session.commit()
+
+    filters: list[str] = [f"generated {date.today().isoformat()}", f"prices in {currency}"]
+    if collection_id is not None:
+        filters.append(f"collection {items[0].collection if items else collection_id}")
+    if date_from is not None or date_to is not None:
+        filters.append(f"purchased {date_from or '…'} to {date_to or '…'}")
+
+    await report_renderer.render(user_id, job_id, "Portfolio report", ", ".join(filters), items)
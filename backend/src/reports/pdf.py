@@ -0,0 +1,127 @@
+"""
+Rendering of portfolio reports to PDF.
+
+Runs in the report worker processes, so this module must stay importable without the
+application settings or a database, and everything passed in must be picklable.
+"""
+
+import os
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import date
+from typing import NamedTuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+
+class ReportItem(NamedTuple):
+    name: str
+    year: str
+    material: str
+    collection: str | None
+    purchase_price: int | None
+    purchase_date: date | None
+    market_price: int | None
+    # Currency of prices that could not be converted to the report's, None for converted ones
+    currency: str | None = None
+
+    @property
+    def market_value(self) -> int:
+        """Latest current market price, or the purchase price for items never revalued."""
+        return self.market_price if self.market_price is not None else self.purchase_price or 0
+
+
+TABLE_STYLE = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.black),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+        ("ALIGN", (-3, 1), (-1, -1), "RIGHT"),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]
+)
+
+
+def format_money(pennies: int | None, currency: str | None = None) -> str:
+    if pennies is None:
+        return ""
+    return f"{pennies / 100:,.2f} {currency}" if currency else f"{pennies / 100:,.2f}"
+
+
+def breakdown_rows(title: str, items: Sequence[ReportItem], key: str) -> list[list[str]]:
+    totals: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for item in items:
+        if item.currency is not None:
+            continue
+        total = totals[getattr(item, key) or "—"]
+        total[0] += 1
+        total[1] += item.purchase_price or 0
+        total[2] += item.market_value
+
+    rows: list[list[str]] = [[title, "Items", "Purchase cost", "Market value", "Unrealised gain"]]
+    for name, (count, cost, value) in sorted(totals.items(), key=lambda total: -total[1][2]):
+        rows.append([name, str(count), format_money(cost), format_money(value), format_money(value - cost)])
+    return rows
+
+
+def render_portfolio_pdf(path: str, title: str, subtitle: str, items: Sequence[ReportItem]) -> None:
+    """
+    Render a portfolio report with totals, per collection and per material breakdowns and
+    the list of items, and write it to `path` atomically.
+
+    Items with prices in another currency are listed with it, and left out of the totals and
+    breakdowns, which are in the report's currency.
+    """
+    styles = getSampleStyleSheet()
+    converted: list[ReportItem] = [item for item in items if item.currency is None]
+    cost: int = sum(item.purchase_price or 0 for item in converted)
+    value: int = sum(item.market_value for item in converted)
+
+    story = [
+        Paragraph(escape(title), styles["Title"]),
+        Paragraph(escape(subtitle), styles["Normal"]),
+        Spacer(0, 6 * mm),
+        Table(
+            [
+                ["Items", "Purchase cost", "Market value", "Unrealised gain"],
+                [str(len(converted)), format_money(cost), format_money(value), format_money(value - cost)],
+            ],
+            style=TABLE_STYLE,
+            hAlign="LEFT",
+        ),
+        Spacer(0, 6 * mm),
+        Table(breakdown_rows("Collection", items, "collection"), style=TABLE_STYLE, hAlign="LEFT", repeatRows=1),
+        Spacer(0, 6 * mm),
+        Table(breakdown_rows("Material", items, "material"), style=TABLE_STYLE, hAlign="LEFT", repeatRows=1),
+        Spacer(0, 6 * mm),
+        Table(
+            [["Name", "Year", "Material", "Collection", "Purchase date", "Purchase price", "Market value"]]
+            + [
+                [
+                    Paragraph(escape(item.name), styles["BodyText"]),
+                    item.year,
+                    item.material,
+                    item.collection or "",
+                    item.purchase_date.isoformat() if item.purchase_date else "",
+                    format_money(item.purchase_price, item.currency),
+                    format_money(item.market_value, item.currency),
+                ]
+                for item in items
+            ],
+            colWidths=[80 * mm, 18 * mm, 24 * mm, 50 * mm, 26 * mm, 28 * mm, 28 * mm],
+            style=TABLE_STYLE,
+            hAlign="LEFT",
+            repeatRows=1,
+        ),
+    ]
+
+    temporary_path: str = f"{path}.{os.getpid()}.tmp"
+    SimpleDocTemplate(temporary_path, pagesize=landscape(A4), title=title).build(story)
+    os.replace(temporary_path, path)
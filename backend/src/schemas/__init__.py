@@ -1,4 +1,5 @@
 # Import all schemas
+from .analytics import AnalyticsMetrics, ItemAnalytics, PortfolioAnalytics
 from .collection import (
     CollectionAddItem,
     CollectionBase,
@@ -11,7 +12,17 @@ from .collection import (
 )
 from .item import (
     ItemBase,
+    ItemBulkCreateResult,
+    ItemBulkDelete,
+    ItemBulkDeleteResult,
+    ItemBulkPatch,
+    ItemBulkRowError,
+    ItemBulkUpdate,
+    ItemBulkUpdateResult,
     ItemCreate,
+    ItemFilter,
+    ItemImportResult,
+    ItemImportRowError,
     ItemRead,
     ItemReadWithPriceHistory,
     ItemReadWithPurchasePrice,
@@ -19,10 +30,21 @@ from .item import (
 )
 from .item_price_history import (
     ItemPriceHistoryBase,
+    ItemPriceHistoryBatchEntry,
     ItemPriceHistoryCreate,
     ItemPriceHistoryRead,
     ItemPriceHistoryUpdate,
+    PricePoint,
+    PriceSeries,
 )
+from .portfolio import (
+    PortfolioCollectionValuation,
+    PortfolioMaterialValuation,
+    PortfolioSummary,
+    PortfolioValuation,
+)
+from .report import ReportCreate, ReportJobRead
+from .search import SearchResults
 from .user import UserCreate, UserRead, UserRegisteredNotification, UserUpdate
 
 # Define what should be exported when using 'from schemas import *'
@@ -35,15 +57,32 @@ __all__ = [
     # Item schemas
     "ItemBase",
     "ItemCreate",
+    "ItemBulkRowError",
+    "ItemBulkCreateResult",
+    "ItemBulkPatch",
+    "ItemBulkUpdate",
+    "ItemBulkUpdateResult",
+    "ItemBulkDelete",
+    "ItemBulkDeleteResult",
+    "ItemImportRowError",
+    "ItemImportResult",
     "ItemUpdate",
+    "ItemFilter",
     "ItemRead",
     "ItemReadWithPurchasePrice",
     "ItemReadWithPriceHistory",
     # Item price history schemas
     "ItemPriceHistoryBase",
+    "ItemPriceHistoryBatchEntry",
     "ItemPriceHistoryCreate",
     "ItemPriceHistoryRead",
     "ItemPriceHistoryUpdate",
+    "PricePoint",
+    "PriceSeries",
+    # Analytics schemas
+    "AnalyticsMetrics",
+    "ItemAnalytics",
+    "PortfolioAnalytics",
     # Collection schemas
     "CollectionBase",
     "CollectionCreate",
@@ -53,4 +92,14 @@ __all__ = [
     "CollectionAddItem",
     "CollectionRemoveItem",
     "SharedCollectionRead",
+    # Portfolio schemas
+    "PortfolioValuation",
+    "PortfolioCollectionValuation",
+    "PortfolioMaterialValuation",
+    "PortfolioSummary",
+    # Report schemas
+    "ReportCreate",
+    "ReportJobRead",
+    # Search schemas
+    "SearchResults",
 ]
@@ -0,0 +1,43 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+from utils.enums import Currency
+
+
+class AnalyticsMetrics(SchemaConfigMixin):
+    """Performance of an item or a portfolio. Ratios are fractions, null where undefined."""
+
+    cost: Annotated[int, Field(description="Purchase cost in pennies/cents")]
+    value: Annotated[int, Field(description="Latest market value in pennies/cents")]
+    roi: Annotated[float | None, Field(description="Return on investment: value over cost, minus 1")]
+    cagr: Annotated[float | None, Field(description="Compound annual growth rate since purchase")]
+    volatility: Annotated[
+        float | None, Field(description="Standard deviation of the log returns between the latest valuations")
+    ]
+    max_drawdown: Annotated[float | None, Field(description="Largest fall from a previous high, as a fraction of it")]
+
+
+class ItemAnalytics(AnalyticsMetrics):
+    item_id: str
+    name: str
+    currency: Annotated[Currency, Field(description="Currency of the cost and value")]
+    purchase_date: date
+    valued_at: Annotated[date, Field(description="Date of the latest valuation")]
+
+
+class PortfolioAnalytics(SchemaConfigMixin):
+    """
+    Performance of the user's items and of all of them together.
+
+    Portfolio returns are time-weighted, so buying items does not count as growth. Items
+    priced in a currency without FX rates are valued in that currency, and left out of the
+    portfolio.
+    """
+
+    window: Annotated[int, Field(description="Number of latest returns the volatility is computed over")]
+    currency: Annotated[Currency, Field(description="Currency of every price")]
+    portfolio: AnalyticsMetrics
+    items: list[ItemAnalytics]
@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+
+
+class CacheStats(SchemaConfigMixin):
+    """Counters of an in-process cache since the process started."""
+
+    hits: Annotated[int, Field(description="Reads served from a cached entry")]
+    misses: Annotated[int, Field(description="Reads that loaded the entry themselves")]
+    coalesced: Annotated[int, Field(description="Reads that waited for a load started by another read")]
+    evictions: Annotated[int, Field(description="Entries dropped to stay within the size limit")]
+    invalidations: Annotated[int, Field(description="Entries dropped because their data changed")]
+    size: Annotated[int, Field(description="Entries currently cached")]
+    hit_rate: Annotated[float, Field(description="Share of reads that did not query the database")]
@@ -0,0 +1,15 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+from utils.enums import Currency
+
+
+class FxRateQuote(SchemaConfigMixin):
+    """Reference rate of a currency against the euro, as read from a rate file."""
+
+    currency: Annotated[Currency, Field(description="Quoted currency")]
+    date: Annotated[date, Field(description="Day of the rate")]
+    rate: Annotated[float, Field(gt=0, description="Units of the currency per euro")]
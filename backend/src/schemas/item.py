@@ -1,13 +1,17 @@
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Any
+from uuid import UUID
 
 from pydantic import Field
 
 from schemas.base import SchemaConfigMixin
 from schemas.item_price_history import ItemPriceHistoryRead
-from utils.enums import Material
+from utils.enums import Currency, Material
 from utils.types import UserIdType
 
+# Most items a single bulk request may create, update or delete
+ITEMS_BULK_MAX_SIZE = 1000
+
 
 class ItemBase(SchemaConfigMixin):
     name: Annotated[str, Field(min_length=1, max_length=255, description="Descriptive name")]
@@ -21,6 +25,9 @@ class ItemBase(SchemaConfigMixin):
 class ItemCreate(ItemBase):
     purchase_price: Annotated[int, Field(ge=0, description="Purchase price in pennies/cents")]
     purchase_date: Annotated[date | None, Field(description="Date when the item was purchased")] = None
+    purchase_currency: Annotated[
+        Currency | None, Field(description="Currency of the purchase price, the user's display currency by default")
+    ] = None
 
 
 class ItemUpdate(SchemaConfigMixin):
@@ -32,6 +39,19 @@ class ItemUpdate(SchemaConfigMixin):
     weight: Annotated[float | None, Field(gt=0, description="Weight in grams")] = None
 
 
+class ItemFilter(SchemaConfigMixin):
+    """Query parameters for narrowing item listings. Omitted parameters do not filter."""
+
+    material: Annotated[list[Material] | None, Field(description="Only items made of these materials")] = None
+    year_from: Annotated[str | None, Field(max_length=10, description="Minimum year of issue (inclusive)")] = None
+    year_to: Annotated[str | None, Field(max_length=10, description="Maximum year of issue (inclusive)")] = None
+    collection_id: Annotated[str | None, Field(description="Only items in this collection")] = None
+    purchase_price_min: Annotated[int | None, Field(ge=0, description="Minimum purchase price in pennies/cents")] = None
+    purchase_price_max: Annotated[int | None, Field(ge=0, description="Maximum purchase price in pennies/cents")] = None
+    purchase_date_from: Annotated[date | None, Field(description="Earliest purchase date (inclusive)")] = None
+    purchase_date_to: Annotated[date | None, Field(description="Latest purchase date (inclusive)")] = None
+
+
 class ItemRead(ItemBase):
     id: str
     user_id: UserIdType
@@ -43,6 +63,68 @@ class ItemReadWithPurchasePrice(ItemRead):
 
     purchase_price: Annotated[int, Field(ge=0, description="Purchase price in pennies/cents")]
     purchase_date: Annotated[date, Field(description="Date when the item was purchased")]
+    purchase_currency: Annotated[Currency, Field(description="Currency of the purchase price")]
+
+
+class ItemBulkRowError(SchemaConfigMixin):
+    """Validation errors of one payload of a bulk request."""
+
+    index: Annotated[int, Field(ge=0, description="Position of the payload in the request body")]
+    errors: Annotated[list[dict[str, Any]], Field(description="Validation errors in the same format as a 422 response")]
+
+
+class ItemBulkCreateResult(SchemaConfigMixin):
+    created: Annotated[
+        list[ItemReadWithPurchasePrice],
+        Field(default_factory=list, description="Created items, in the order of their payloads"),
+    ]
+    errors: Annotated[
+        list[ItemBulkRowError],
+        Field(default_factory=list, description="Payloads that were rejected and not created"),
+    ]
+
+
+class ItemImportRowError(SchemaConfigMixin):
+    """Validation errors of one CSV row of an import."""
+
+    line: Annotated[int, Field(ge=1, description="Line of the CSV file the row starts on")]
+    errors: Annotated[list[dict[str, Any]], Field(description="Validation errors in the same format as a 422 response")]
+
+
+class ItemImportResult(SchemaConfigMixin):
+    inserted: Annotated[int, Field(ge=0, description="Rows created as new items")] = 0
+    rejected: Annotated[int, Field(ge=0, description="Rows that failed validation or were too long")] = 0
+    duplicates: Annotated[
+        int,
+        Field(ge=0, description="Rows skipped because the same item with the same purchase already exists"),
+    ] = 0
+    errors: Annotated[
+        list[ItemImportRowError],
+        Field(default_factory=list, description="Errors of the first rejected rows"),
+    ]
+
+
+class ItemBulkPatch(ItemUpdate):
+    collection_id: Annotated[
+        str | None, Field(description="Move the items to this collection, or out of any collection with null")
+    ] = None
+
+
+class ItemBulkUpdate(SchemaConfigMixin):
+    ids: Annotated[list[UUID], Field(min_length=1, max_length=ITEMS_BULK_MAX_SIZE, description="IDs of the items")]
+    patch: Annotated[ItemBulkPatch, Field(description="Fields to set on every item")]
+
+
+class ItemBulkDelete(SchemaConfigMixin):
+    ids: Annotated[list[UUID], Field(min_length=1, max_length=ITEMS_BULK_MAX_SIZE, description="IDs of the items")]
+
+
+class ItemBulkUpdateResult(SchemaConfigMixin):
+    updated: Annotated[int, Field(ge=0, description="Number of items updated")]
+
+
+class ItemBulkDeleteResult(SchemaConfigMixin):
+    deleted: Annotated[int, Field(ge=0, description="Number of items deleted")]
 
 
 class ItemReadWithPriceHistory(ItemRead):
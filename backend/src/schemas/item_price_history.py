@@ -1,10 +1,14 @@
 from datetime import date as dt_date
 from typing import Annotated
+from uuid import UUID
 
 from pydantic import Field
 
 from schemas.base import SchemaConfigMixin
-from utils.enums import PriceType
+from utils.enums import Currency, PriceBucket, PriceType
+
+# Most entries a single batch request may add
+PRICE_HISTORY_BATCH_MAX_SIZE = 1000
 
 
 class ItemPriceHistoryBase(SchemaConfigMixin):
@@ -13,6 +17,7 @@ class ItemPriceHistoryBase(SchemaConfigMixin):
     price: Annotated[int, Field(ge=0, description="Price in pennies/cents")]
     date: Annotated[dt_date, Field(description="When this price was recorded")]
     type: Annotated[PriceType, Field(description="Type of price entry")]
+    currency: Annotated[Currency, Field(description="Currency of the price")]
 
 
 class ItemPriceHistoryCreate(SchemaConfigMixin):
@@ -20,6 +25,15 @@ class ItemPriceHistoryCreate(SchemaConfigMixin):
 
     price: Annotated[int, Field(ge=0, description="Price in pennies/cents")]
     date: Annotated[dt_date | None, Field(description="When this price was recorded")] = None
+    currency: Annotated[
+        Currency | None, Field(description="Currency of the price, the user's display currency by default")
+    ] = None
+
+
+class ItemPriceHistoryBatchEntry(ItemPriceHistoryCreate):
+    """Schema for one current market price of a batch, for any of the user's items."""
+
+    item_id: Annotated[UUID, Field(description="ID of the item")]
 
 
 class ItemPriceHistoryRead(ItemPriceHistoryBase):
@@ -34,3 +48,29 @@ class ItemPriceHistoryUpdate(SchemaConfigMixin):
 
     price: Annotated[int | None, Field(ge=0, description="Price in pennies/cents")] = None
     date: Annotated[dt_date | None, Field(description="When this price was recorded")] = None
+    currency: Annotated[Currency | None, Field(description="Currency of the price")] = None
+
+
+class PricePoint(SchemaConfigMixin):
+    """Open, high, low and close prices of the entries of one bucket of a price series."""
+
+    date: Annotated[dt_date, Field(description="First day of the bucket")]
+    currency: Annotated[Currency, Field(description="Currency of the prices")]
+    open: Annotated[int, Field(description="Earliest price of the bucket in pennies/cents")]
+    high: Annotated[int, Field(description="Highest price of the bucket in pennies/cents")]
+    low: Annotated[int, Field(description="Lowest price of the bucket in pennies/cents")]
+    close: Annotated[int, Field(description="Latest price of the bucket in pennies/cents")]
+    count: Annotated[int, Field(ge=1, description="Number of price entries in the bucket")]
+
+
+class PriceSeries(SchemaConfigMixin):
+    """
+    Price history of an item downsampled to one point per bucket, oldest first.
+
+    Prices that cannot be converted to the series currency, for want of FX rates, stay in
+    their own currency and are summarised in separate points of the same bucket.
+    """
+
+    bucket: Annotated[PriceBucket, Field(description="Period of each point")]
+    currency: Annotated[Currency, Field(description="Currency every price was converted to, where it could be")]
+    points: list[PricePoint]
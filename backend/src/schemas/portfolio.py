@@ -0,0 +1,92 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+from utils.enums import Currency, Material
+
+
+class PortfolioValuation(SchemaConfigMixin):
+    """
+    Valuation of a group of items.
+
+    Market value uses each item's latest current price and falls back to its purchase price
+    for items that were never revalued.
+    """
+
+    item_count: Annotated[int, Field(ge=0, description="Number of items")] = 0
+    purchase_cost: Annotated[int, Field(description="Total purchase price in pennies/cents")] = 0
+    market_value: Annotated[int, Field(description="Total latest current market price in pennies/cents")] = 0
+    unrealised_gain: Annotated[int, Field(description="Market value minus purchase cost in pennies/cents")] = 0
+
+
+class PortfolioCollectionValuation(PortfolioValuation):
+    collection_id: Annotated[str | None, Field(description="Collection ID, null for items outside any collection")]
+    collection_name: Annotated[str | None, Field(description="Collection name")] = None
+
+
+class PortfolioMaterialValuation(PortfolioValuation):
+    material: Annotated[Material, Field(description="Metal/alloy material")]
+
+
+class PortfolioCurrencyValuation(PortfolioValuation):
+    currency: Annotated[Currency, Field(description="Currency of the prices")]
+
+
+class PortfolioSummary(PortfolioValuation):
+    """
+    Valuation of all of the user's items, broken down per collection and per material.
+
+    Items priced in a currency without FX rates cannot be converted to the summary currency;
+    they are left out of its totals and breakdowns, and totalled per currency in `unconverted`.
+    """
+
+    currency: Annotated[Currency, Field(description="Currency of every price")]
+    collections: Annotated[list[PortfolioCollectionValuation], Field(default_factory=list)]
+    materials: Annotated[list[PortfolioMaterialValuation], Field(default_factory=list)]
+    unconverted: Annotated[
+        list[PortfolioCurrencyValuation],
+        Field(default_factory=list, description="Totals of the items that could not be converted, per currency"),
+    ]
+
+
+class ItemMelt(SchemaConfigMixin):
+    item_id: str
+    name: str
+    material: Material
+    weight: Annotated[float | None, Field(description="Weight in grams")]
+    melt_value: Annotated[
+        int | None, Field(description="Melt value in pennies/cents, null without a weight or a spot price")
+    ]
+    currency: Annotated[Currency | None, Field(description="Currency of the melt value, null without a spot price")]
+
+
+class MaterialMelt(SchemaConfigMixin):
+    material: Annotated[Material, Field(description="Metal/alloy material")]
+    item_count: Annotated[int, Field(ge=0, description="Number of items")]
+    weight: Annotated[float, Field(description="Total known weight in grams")]
+    spot_price: Annotated[
+        int | None, Field(description="Latest spot price per troy ounce in pennies/cents, null if never quoted")
+    ]
+    spot_date: Annotated[date | None, Field(description="Day of the spot price")]
+    currency: Annotated[
+        Currency | None, Field(description="Currency of the spot price and melt value, null if never quoted")
+    ]
+    melt_value: Annotated[int, Field(description="Total melt value in pennies/cents")]
+
+
+class PortfolioMelt(SchemaConfigMixin):
+    """
+    Melt (bullion) value of the user's items at the latest spot prices.
+
+    An item's weight is taken as its pure metal content, so alloys are valued only when their
+    material itself is quoted. Spot prices in a currency without FX rates cannot be converted;
+    the items they value are left out of the totals.
+    """
+
+    currency: Annotated[Currency, Field(description="Currency of the totals")]
+    melt_value: Annotated[int, Field(description="Total melt value in pennies/cents")]
+    valued_count: Annotated[int, Field(ge=0, description="Number of items with a melt value in the currency")]
+    materials: list[MaterialMelt]
+    items: list[ItemMelt]
@@ -0,0 +1,22 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+from utils.enums import JobStatus
+
+
+class ReportCreate(SchemaConfigMixin):
+    """Parameters of a PDF portfolio report. Omitted parameters do not filter."""
+
+    collection_id: Annotated[str | None, Field(description="Only items in this collection")] = None
+    date_from: Annotated[date | None, Field(description="Earliest purchase date (inclusive)")] = None
+    date_to: Annotated[date | None, Field(description="Latest purchase date (inclusive)")] = None
+
+
+class ReportJobRead(SchemaConfigMixin):
+    id: Annotated[str, Field(description="Job ID, the same for identical requests while the data is unchanged")]
+    status: Annotated[JobStatus, Field(description="Rendering status")]
+    error: Annotated[str | None, Field(description="Why rendering failed")] = None
+    download_url: Annotated[str | None, Field(description="Where to download the PDF once rendered")] = None
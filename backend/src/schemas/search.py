@@ -0,0 +1,16 @@
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+from schemas.collection import CollectionRead
+from schemas.dealer import DealerRead
+from schemas.item import ItemRead
+
+
+class SearchResults(SchemaConfigMixin):
+    """Best matches for a search query, grouped by entity type and ordered by relevance."""
+
+    items: Annotated[list[ItemRead], Field(default_factory=list, description="Matching items")]
+    collections: Annotated[list[CollectionRead], Field(default_factory=list, description="Matching collections")]
+    dealers: Annotated[list[DealerRead], Field(default_factory=list, description="Matching dealers")]
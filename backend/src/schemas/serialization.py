@@ -0,0 +1,73 @@
+from collections.abc import Iterable
+from typing import Any, get_args, get_origin
+
+import orjson
+from pydantic import BaseModel
+
+from schemas.collection import CollectionRead, CollectionWithItems, SharedCollectionRead
+from schemas.dealer import DealerRead
+from schemas.item import ItemRead, ItemReadWithPurchasePrice
+from schemas.item_price_history import ItemPriceHistoryRead
+
+# Matches pydantic's JSON output for timezone-aware UTC datetimes
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class RowSerializer:
+    """
+    Encode trusted database rows straight to JSON bytes in the shape of a read schema.
+
+    Rows are read by attribute, so both SQLAlchemy rows with labelled columns and ORM
+    instances are accepted. Nothing is validated: the schema only decides which fields are
+    written and in which order, and list fields of other schemas are encoded recursively.
+    Use it for read endpoints where the rows come from the database, and return the bytes
+    in a plain `Response` so FastAPI does not validate them against `response_model` again.
+    """
+
+    def __init__(self, schema: type[BaseModel], fields: Iterable[str] | None = None) -> None:
+        self.schema: type[BaseModel] = schema
+        self.fields: tuple[str, ...] = tuple(schema.model_fields) if fields is None else tuple(fields)
+        self._nested: dict[str, RowSerializer] = {}
+        self._subsets: dict[tuple[str, ...], RowSerializer] = {}
+        for name in self.fields:
+            annotation: Any = schema.model_fields[name].annotation
+            args: tuple[Any, ...] = get_args(annotation)
+            if get_origin(annotation) is list and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+                self._nested[name] = RowSerializer(args[0])
+
+    def only(self, fields: Iterable[str] | None) -> "RowSerializer":
+        """Return a serializer that writes only the given fields, or this one when fields is None."""
+        if fields is None:
+            return self
+        key: tuple[str, ...] = tuple(fields)
+        if key not in self._subsets:
+            self._subsets[key] = RowSerializer(self.schema, key)
+        return self._subsets[key]
+
+    def to_dict(self, row: Any) -> dict[str, Any]:
+        data: dict[str, Any] = {field: getattr(row, field) for field in self.fields}
+        for field, serializer in self._nested.items():
+            data[field] = [serializer.to_dict(child) for child in data[field]]
+        return data
+
+    def dumps(self, row: Any) -> bytes:
+        """Encode a single row as a JSON object."""
+        return orjson.dumps(self.to_dict(row), option=ORJSON_OPTIONS)
+
+    def dumps_many(self, rows: Iterable[Any]) -> bytes:
+        """Encode rows as a JSON array."""
+        return orjson.dumps([self.to_dict(row) for row in rows], option=ORJSON_OPTIONS)
+
+    def dumps_lines(self, rows: Iterable[Any]) -> bytes:
+        """Encode rows as NDJSON, one object per line."""
+        option: int = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+        return b"".join(orjson.dumps(self.to_dict(row), option=option) for row in rows)
+
+
+item_read_serializer = RowSerializer(ItemRead)
+item_read_with_purchase_price_serializer = RowSerializer(ItemReadWithPurchasePrice)
+item_price_history_read_serializer = RowSerializer(ItemPriceHistoryRead)
+collection_read_serializer = RowSerializer(CollectionRead)
+collection_with_items_serializer = RowSerializer(CollectionWithItems)
+shared_collection_read_serializer = RowSerializer(SharedCollectionRead)
+dealer_read_serializer = RowSerializer(DealerRead)
@@ -0,0 +1,16 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import SchemaConfigMixin
+from utils.enums import Currency, Material
+
+
+class SpotPriceQuote(SchemaConfigMixin):
+    """Spot price quote of a metal, as read from a quote file."""
+
+    material: Annotated[Material, Field(description="Quoted metal")]
+    date: Annotated[date, Field(description="Day of the quote")]
+    price: Annotated[int, Field(gt=0, description="Price per troy ounce in pennies/cents")]
+    currency: Annotated[Currency, Field(description="Currency of the price")] = Currency.USD
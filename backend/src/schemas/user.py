@@ -1,12 +1,16 @@
+from typing import Annotated
+
 from fastapi_users import schemas
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from schemas.base import SchemaConfigMixin
+from utils.enums import Currency, SubscriptionTier
 from utils.types import UserIdType
 
 
 class UserRead(SchemaConfigMixin, schemas.BaseUser[UserIdType]):
-    pass
+    tier: Annotated[SubscriptionTier, Field(description="Subscription tier")] = SubscriptionTier.FREE
+    currency: Annotated[Currency, Field(description="Currency prices are shown in")] = Currency.USD
 
 
 class UserCreate(SchemaConfigMixin, schemas.BaseUserCreate):
@@ -14,7 +18,7 @@ class UserCreate(SchemaConfigMixin, schemas.BaseUserCreate):
 
 
 class UserUpdate(SchemaConfigMixin, schemas.BaseUserUpdate):
-    pass
+    currency: Annotated[Currency | None, Field(description="Currency prices are shown in")] = None
 
 
 class UserRegisteredNotification(SchemaConfigMixin, BaseModel):
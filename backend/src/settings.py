@@ -1,4 +1,5 @@
 import sys
+import tempfile
 from enum import Enum
 from pathlib import Path
 from typing import Annotated
@@ -38,6 +39,49 @@ class AccessTokenSettings(BaseModel):
     verification_token_secret: str
 
 
+class ReportSettings(BaseModel):
+    cache_dir: Path = Path(tempfile.gettempdir()) / "numismatist" / "reports"
+    cache_ttl_seconds: Annotated[int, Field(default=7 * 86400, gt=0)]
+    workers: Annotated[int, Field(default=2, gt=0)]  # rendering processes
+
+
+class JobSettings(BaseModel):
+    workers: Annotated[int, Field(default=4, ge=0)]  # 0 disables the job runner
+    poll_interval_seconds: Annotated[float, Field(default=1.0, gt=0)]
+    per_user_limit: Annotated[int, Field(default=2, gt=0)]  # running jobs per user
+    max_attempts: Annotated[int, Field(default=5, gt=0)]
+    retry_backoff_seconds: Annotated[float, Field(default=10.0, gt=0)]  # doubled after every failed attempt
+    max_retry_backoff_seconds: Annotated[float, Field(default=3600.0, gt=0)]
+    lease_seconds: Annotated[int, Field(default=600, gt=0)]  # a running job is claimed again after that
+    shutdown_timeout_seconds: Annotated[float, Field(default=10.0, ge=0)]
+    cleanup_interval_seconds: Annotated[int, Field(default=3600, gt=0)]
+    reconcile_interval_seconds: Annotated[int, Field(default=86400, gt=0)]  # of the user counters
+    finished_retention_seconds: Annotated[int, Field(default=7 * 86400, gt=0)]
+    partition_interval_seconds: Annotated[int, Field(default=86400, gt=0)]  # of the price history partitions
+    price_history_partitions_ahead: Annotated[int, Field(default=1, ge=0)]  # years created in advance
+
+
+class SpotPriceSettings(BaseModel):
+    drop_dir: Path = Path(tempfile.gettempdir()) / "numismatist" / "spot-prices"  # quote files to load
+    load_interval_seconds: Annotated[int, Field(default=300, gt=0)]
+
+
+class FxRateSettings(BaseModel):
+    drop_dir: Path = Path(tempfile.gettempdir()) / "numismatist" / "fx-rates"  # rate files to load
+    load_interval_seconds: Annotated[int, Field(default=300, gt=0)]
+
+
+class SharedCollectionSettings(BaseModel):
+    cache_max_entries: Annotated[int, Field(default=1024, gt=0)]  # per process
+    cache_ttl_seconds: Annotated[float, Field(default=60.0, gt=0)]
+    max_age_seconds: Annotated[int, Field(default=60, ge=0)]  # of HTTP caches such as a CDN
+    stale_while_revalidate_seconds: Annotated[int, Field(default=600, ge=0)]
+    snapshot_dir: Path = Path(tempfile.gettempdir()) / "numismatist" / "shared-collections"
+    snapshot_html: bool = False  # also write an HTML page of each shared collection
+    snapshot_interval_seconds: Annotated[int, Field(default=3600, gt=0)]  # of reconciling snapshots with the database
+    snapshot_retention_seconds: Annotated[int, Field(default=86400, gt=0)]  # of snapshots no token links to
+
+
 class LogLevel(str, Enum):
     DEBUG = "DEBUG"
     INFO = "INFO"
@@ -54,7 +98,12 @@ class Settings(BaseSettings):
     access_token: AccessTokenSettings
     api: APISettings = APISettings()
     database: DatabaseSettings
+    fx_rates: FxRateSettings = FxRateSettings()
+    jobs: JobSettings = JobSettings()
     logger: LoggerSettings = LoggerSettings()
+    reports: ReportSettings = ReportSettings()
+    shared_collections: SharedCollectionSettings = SharedCollectionSettings()
+    spot_prices: SpotPriceSettings = SpotPriceSettings()
 
     model_config = SettingsConfigDict(
         env_file=(BASE_DIR / ".env",),
@@ -0,0 +1,323 @@
+"""
+Shared collections rendered once and written to disk as immutable snapshots.
+
+Snapshots live under `settings.shared_collections.snapshot_dir`:
+
+    objects/<ab>/<digest>.json      the JSON body, named after its BLAKE2b digest
+    objects/<ab>/<digest>.json.br   the body precompressed with brotli and gzip
+    objects/<ab>/<digest>.json.gz
+    objects/<ab>/<digest>.html      an HTML page of the collection, when enabled
+    tokens/<share_token>.json       symlink to the current object of the shared collection
+    tokens/<share_token>.html
+
+Objects are content-addressed and never change once written; their modification time is the
+collection's `updated_at`. Publishing a change writes new objects and atomically repoints the
+token links, so the API and a plain static file server can both serve `tokens/` without the
+database.
+
+Publishing runs after the change commits, in a transaction of its own that re-reads the
+collections under a row lock. Whichever of two concurrent changes publishes last thus writes
+what the database holds once both committed, never the older of the two, and a revoked token
+is unlinked only after its revocation committed, when no publisher can read it any more. A
+change whose publishing fails, or whose process dies before it, is published by the periodic
+reconciliation, which compares every link with the database.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from html import escape
+from logging import Logger
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from models import Collection
+from schemas.serialization import shared_collection_read_serializer
+from settings import settings
+from utils.encoding import compress
+from utils.logger import get_logger
+from utils.types import UserIdType
+
+logger: Logger = get_logger(__name__)
+
+# Suffix of the file holding a snapshot in each supported content coding
+ENCODING_SUFFIXES: dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+# Collections published per transaction when reconciling snapshots
+RECONCILE_BATCH_SIZE = 100
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Representation:
+    """A body identified by the digest of its unencoded bytes, possibly stored in other content codings."""
+
+    digest: str
+    last_modified: datetime
+    encodings: dict[str, Any]
+
+    def etag(self, encoding: str | None) -> str:
+        """Strong ETag of the body in a content coding; each coding is a representation of its own."""
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SharedCollection(Representation):
+    """A shared collection serialised to JSON, with the body precompressed in every coding that makes it smaller."""
+
+    collection_id: str
+    user_id: UserIdType
+    body: bytes
+    encodings: dict[str, bytes]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Snapshot(Representation):
+    """A snapshot on disk: the file of the JSON body and the files of its encodings."""
+
+    path: Path
+    encodings: dict[str, Path]
+
+
+def digest_of(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+async def render_shared_collection(collection: Collection) -> SharedCollection:
+    """Serialise a collection loaded with its items as shared, and compress the result."""
+    body: bytes = shared_collection_read_serializer.dumps(collection)
+    # Brotli at its highest quality is slow on large bodies; keep it off the event loop
+    encodings: dict[str, bytes] = await asyncio.to_thread(compress, body)
+    updated_at: datetime = collection.updated_at
+    return SharedCollection(
+        collection_id=collection.id,
+        user_id=collection.user_id,
+        body=body,
+        encodings=encodings,
+        digest=digest_of(body),
+        last_modified=updated_at if updated_at.tzinfo else updated_at.replace(tzinfo=UTC),
+    )
+
+
+def render_shared_collection_html(collection: Collection) -> bytes:
+    """Render a collection loaded with its items as a standalone HTML page."""
+    rows: str = "".join(
+        f"<tr><td>{escape(item.name)}</td><td>{escape(item.year)}</td><td>{escape(str(item.material))}</td>"
+        f"<td>{'' if item.weight is None else item.weight}</td></tr>"
+        for item in collection.items
+    )
+    description: str = f"<p>{escape(collection.description)}</p>" if collection.description else ""
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8">'
+        f"<title>{escape(collection.name)}</title></head>\n"
+        f"<body>\n<h1>{escape(collection.name)}</h1>\n{description}\n"
+        "<table>\n<thead><tr><th>Name</th><th>Year</th><th>Material</th><th>Weight (g)</th></tr></thead>\n"
+        f"<tbody>{rows}</tbody>\n</table>\n</body>\n</html>\n"
+    ).encode()
+
+
+def object_path(digest: str, suffix: str) -> Path:
+    return settings.shared_collections.snapshot_dir / "objects" / digest[:2] / f"{digest}{suffix}"
+
+
+def token_path(share_token: str, suffix: str) -> Path:
+    return settings.shared_collections.snapshot_dir / "tokens" / f"{share_token}{suffix}"
+
+
+def _write_object(path: Path, data: bytes, modified_at: float) -> None:
+    # Objects are immutable: one that exists already holds the same bytes
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path: Path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary_path.write_bytes(data)
+    os.utime(temporary_path, (modified_at, modified_at))
+    os.replace(temporary_path, path)
+
+
+def _link(link: Path, target: Path) -> None:
+    link.parent.mkdir(parents=True, exist_ok=True)
+    relative_target: str = os.path.relpath(target, link.parent)
+    if link.is_symlink() and os.readlink(link) == relative_target:
+        return
+    temporary_link: Path = link.with_name(f"{link.name}.{os.getpid()}.tmp")
+    temporary_link.unlink(missing_ok=True)
+    temporary_link.symlink_to(relative_target)
+    os.replace(temporary_link, link)
+
+
+def write_snapshot(shared: SharedCollection, share_token: str, html: bytes | None = None) -> None:
+    """Write the objects of a shared collection, then point the links of its share token at them."""
+    modified_at: float = shared.last_modified.timestamp()
+    path: Path = object_path(shared.digest, ".json")
+    for encoding, data in shared.encodings.items():
+        _write_object(path.with_name(path.name + ENCODING_SUFFIXES[encoding]), data, modified_at)
+    _write_object(path, shared.body, modified_at)
+    _link(token_path(share_token, ".json"), path)
+
+    if html is None:
+        token_path(share_token, ".html").unlink(missing_ok=True)
+    else:
+        html_path: Path = object_path(shared.digest, ".html")
+        _write_object(html_path, html, modified_at)
+        _link(token_path(share_token, ".html"), html_path)
+
+
+def remove_snapshot(share_token: str) -> None:
+    """Unlink the snapshot of a share token; its objects are left for pruning."""
+    for suffix in (".json", ".html"):
+        token_path(share_token, suffix).unlink(missing_ok=True)
+
+
+def read_snapshot(share_token: str) -> Snapshot | None:
+    """Find the current snapshot of a share token on disk, None if it has none."""
+    if not share_token.isalnum():
+        return None
+
+    try:
+        path: Path = token_path(share_token, ".json").resolve(strict=True)
+        modified_at: float = path.stat().st_mtime
+    except OSError:
+        return None
+
+    encodings: dict[str, Path] = {
+        encoding: path.with_name(path.name + suffix)
+        for encoding, suffix in ENCODING_SUFFIXES.items()
+        if path.with_name(path.name + suffix).exists()
+    }
+    return Snapshot(
+        path=path,
+        encodings=encodings,
+        digest=path.stem,
+        last_modified=datetime.fromtimestamp(modified_at, UTC),
+    )
+
+
+async def publish_shared_collections(
+    session: AsyncSession,
+    collection_ids: Iterable[str | None] | None = None,
+    user_id: UserIdType | None = None,
+    revoked_tokens: Iterable[str | None] = (),
+) -> None:
+    """
+    Write the snapshots of shared collections, by ID or of a user, and unlink revoked share tokens.
+
+    Must run after the change commits. The collections are re-read and locked in a transaction
+    that is committed once their snapshots are written. Unshared collections are skipped, and
+    nothing is written when neither IDs nor a user are given. Errors are logged rather than
+    raised, as the change is committed already; the reconciliation publishes it later.
+    """
+    for share_token in revoked_tokens:
+        if share_token is not None:
+            await asyncio.to_thread(remove_snapshot, share_token)
+    if collection_ids is None and user_id is None:
+        return
+
+    query = (
+        select(Collection)
+        .options(selectinload(Collection.items))
+        .where(Collection.share_token.isnot(None))
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    if collection_ids is not None:
+        ids: list[str] = [collection_id for collection_id in collection_ids if collection_id is not None]
+        if not ids:
+            return
+        query = query.where(Collection.id.in_(ids))
+    if user_id is not None:
+        query = query.where(Collection.user_id == user_id)
+
+    try:
+        for collection in await session.scalars(query):
+            shared: SharedCollection = await render_shared_collection(collection)
+            html: bytes | None = (
+                render_shared_collection_html(collection) if settings.shared_collections.snapshot_html else None
+            )
+            try:
+                await asyncio.to_thread(write_snapshot, shared, collection.share_token, html)
+            except OSError:
+                # Without its link the collection is served from the database rather than stale
+                logger.exception("Could not write the snapshot of shared collection %s", collection.id)
+                await asyncio.to_thread(remove_snapshot, collection.share_token)
+        await session.commit()
+    except SQLAlchemyError:
+        logger.exception("Could not publish shared collections, leaving them to reconciliation")
+        await session.rollback()
+
+
+def is_current(collection: Collection) -> bool:
+    """Whether the snapshot linked from the share token of a collection loaded with its items is up to date."""
+    snapshot: Snapshot | None = read_snapshot(collection.share_token)
+    if snapshot is None or snapshot.digest != digest_of(shared_collection_read_serializer.dumps(collection)):
+        return False
+    return token_path(collection.share_token, ".html").is_symlink() == settings.shared_collections.snapshot_html
+
+
+async def reconcile_shared_collection_snapshots(session: AsyncSession) -> tuple[int, int, int]:
+    """
+    Bring the snapshots on disk in line with the database, committing as it goes.
+
+    Publishes shared collections whose snapshot is missing or differs from the database, such
+    as those shared before snapshots existed or whose publishing failed, unlinks tokens that
+    are no longer shared, and prunes objects that no token links to once they are older than
+    the retention.
+
+    Returns:
+        The number of collections published, tokens unlinked and objects pruned
+    """
+    shared: dict[str, str] = dict(
+        (await session.execute(select(Collection.share_token, Collection.id).where(Collection.share_token.isnot(None))))
+        .tuples()
+        .all()
+    )
+    tokens_dir: Path = settings.shared_collections.snapshot_dir / "tokens"
+    linked: set[str] = {path.stem for path in tokens_dir.glob("*.json")}
+
+    unlinked: set[str] = linked - shared.keys()
+    for share_token in unlinked:
+        remove_snapshot(share_token)
+
+    published: int = 0
+    collection_ids: list[str] = sorted(shared.values())
+    for start in range(0, len(collection_ids), RECONCILE_BATCH_SIZE):
+        collections = await session.scalars(
+            select(Collection)
+            .options(selectinload(Collection.items))
+            .where(
+                Collection.id.in_(collection_ids[start : start + RECONCILE_BATCH_SIZE]),
+                Collection.share_token.isnot(None),
+            )
+            .execution_options(populate_existing=True)
+        )
+        stale: list[str] = [collection.id for collection in collections if not is_current(collection)]
+        # Publishing re-reads the stale collections under a lock in a transaction of its own
+        await session.commit()
+        await publish_shared_collections(session, stale)
+        published += len(stale)
+
+    referenced: set[str] = set()
+    for link in tokens_dir.glob("*"):
+        try:
+            referenced.add(link.resolve(strict=True).name)
+        except OSError:
+            continue
+
+    pruned: int = 0
+    expired_before: float = time.time() - settings.shared_collections.snapshot_retention_seconds
+    for path in (settings.shared_collections.snapshot_dir / "objects").glob("*/*"):
+        name: str = path.name.removesuffix(".br").removesuffix(".gz")
+        # The change time is when the object was written; its modification time is the collection's
+        if name not in referenced and path.stat().st_ctime < expired_before:
+            path.unlink(missing_ok=True)
+            pruned += 1
+
+    return published, len(unlinked), pruned
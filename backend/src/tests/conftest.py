@@ -1,4 +1,9 @@
 """Test configuration and fixtures."""
+import os
+
+# The job runner would poll the real database; tests run jobs explicitly instead
+os.environ.setdefault("JOBS__WORKERS", "0")
+
 from datetime import date
 from typing import AsyncGenerator
 import pytest
@@ -14,7 +19,9 @@ from models.base import Base
 from models.user import User
 from models.item import Item
 from models.item_price_history import ItemPriceHistory
+from models.item_latest_price import refresh_item_latest_prices
 from models.collection import Collection
+from settings import settings
 from utils.tokens import generate_share_token
 from utils.enums import PriceType
 
@@ -23,6 +30,13 @@ from utils.enums import PriceType
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    """Write snapshots of shared collections to a temporary directory."""
+    monkeypatch.setattr(settings.shared_collections, "snapshot_dir", tmp_path / "snapshots")
+    return tmp_path / "snapshots"
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_db_engine():
     """Create a test database engine."""
@@ -171,6 +185,7 @@ async def test_item(test_session, test_user) -> Item:
         date=date.today()
     )
     test_session.add(price_history)
+    await refresh_item_latest_prices(test_session, [item.id])
     
     await test_session.commit()
     await test_session.refresh(item)
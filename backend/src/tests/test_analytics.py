@@ -0,0 +1,108 @@
+"""Tests for portfolio analytics."""
+import math
+from datetime import date
+
+import pytest
+from fastapi import status
+
+from analytics.portfolio import ValuationSeries
+
+
+@pytest.fixture
+def portfolio(authenticated_client, test_user) -> dict[str, str]:
+    """
+    Item A bought for 10.00 in 2020 and revalued yearly to 15.00, 12.00 and 18.00;
+    item B bought for 20.00 in 2021 and never revalued. Returns their IDs by name.
+    """
+    ids = {}
+    for name, price, day in (("A", 1000, "2020-01-01"), ("B", 2000, "2021-01-01")):
+        item = authenticated_client.post(
+            "/api/items/",
+            json={"name": name, "year": "2000", "material": "gold", "purchase_price": price, "purchase_date": day},
+        ).json()
+        ids[name] = item["id"]
+    authenticated_client.post(
+        "/api/price-history/batch",
+        json=[
+            {"item_id": ids["A"], "price": price, "date": day}
+            for price, day in ((1500, "2021-01-01"), (1200, "2022-01-01"), (1800, "2023-01-01"))
+        ],
+    )
+    return ids
+
+
+class TestItemAnalytics:
+    """Test GET /api/analytics/items."""
+
+    def test_item_metrics(self, authenticated_client, portfolio):
+        """
+        Flow: GET /api/analytics/items
+        Expected: ROI, CAGR, volatility and max drawdown of each item
+        """
+        response = authenticated_client.get("/api/analytics/items")
+
+        assert response.status_code == status.HTTP_200_OK
+        items = {item["name"]: item for item in response.json()["items"]}
+        a, b = items["A"], items["B"]
+        assert (a["cost"], a["value"], a["purchase_date"], a["valued_at"]) == (1000, 1800, "2020-01-01", "2023-01-01")
+        assert a["roi"] == pytest.approx(0.8)
+        assert a["cagr"] == pytest.approx(1.8 ** (365.25 / 1096) - 1)
+        log_returns = [math.log(1.5), math.log(0.8), math.log(1.5)]
+        mean = sum(log_returns) / 3
+        assert a["volatility"] == pytest.approx(math.sqrt(sum((r - mean) ** 2 for r in log_returns) / 2))
+        assert a["max_drawdown"] == pytest.approx(0.2)
+        assert (b["roi"], b["cagr"], b["volatility"], b["max_drawdown"]) == (0, None, None, 0)
+
+    def test_portfolio_metrics(self, authenticated_client, portfolio):
+        """
+        Flow: GET /api/analytics/items with a volatility window of 2
+        Expected: Portfolio totals, time-weighted CAGR and drawdown that ignore the purchase of B
+        """
+        response = authenticated_client.get("/api/analytics/items", params={"window": 2})
+
+        result = response.json()
+        assert result["window"] == 2
+        total = result["portfolio"]
+        assert (total["cost"], total["value"]) == (3000, 3800)
+        assert total["roi"] == pytest.approx(0.8 / 3)
+        returns = [0.5, 3200 / 3500 - 1, 3800 / 3200 - 1]
+        growth = math.prod(1 + r for r in returns)
+        assert total["cagr"] == pytest.approx(growth ** (365.25 / 1096) - 1)
+        assert total["max_drawdown"] == pytest.approx(1 - 3200 / 3500)
+        last = [math.log1p(r) for r in returns[-2:]]
+        assert total["volatility"] == pytest.approx(abs(last[0] - last[1]) / math.sqrt(2))
+
+    def test_collection_filter_and_empty_portfolio(self, authenticated_client, portfolio, test_collection):
+        """
+        Flow: GET /api/analytics/items for an empty collection
+        Expected: No items, zero totals and null ratios
+        """
+        response = authenticated_client.get("/api/analytics/items", params={"collection_id": test_collection.id})
+
+        result = response.json()
+        assert result["items"] == []
+        assert result["portfolio"] == {
+            "cost": 0, "value": 0, "roi": None, "cagr": None, "volatility": None, "max_drawdown": None
+        }
+
+
+class TestValuationSeries:
+    """Test the vectorised valuation series directly."""
+
+    def test_rows_outside_valuation_are_ignored(self):
+        """
+        Flow: A market price before the purchase, two purchase prices, an item without purchase price
+        Expected: Valued from the first purchase only; the item without purchase price is left out
+        """
+        series = ValuationSeries(
+            ["x", "x", "x", "x", "y"],
+            [date(2020, 1, 1), date(2019, 1, 1), date(2021, 1, 1), date(2022, 1, 1), date(2020, 1, 1)],
+            [100, 999, 500, 200, 50],
+            [True, False, True, False, False],
+        )
+
+        metrics = series.item_metrics(window=12)
+
+        assert list(metrics.item_ids) == ["x"]
+        assert (metrics.cost[0], metrics.value[0]) == (100, 200)
+        assert metrics.purchase_dates[0] == date(2020, 1, 1)
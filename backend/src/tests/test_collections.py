@@ -82,6 +82,16 @@ class TestCollectionsEndpoints:
         assert data[0]["name"] == test_collection.name
         assert data[0]["id"] == str(test_collection.id)
 
+    def test_list_collections_sparse_fields(self, authenticated_client, test_collection):
+        """
+        Flow: GET /api/collections/?fields=id,name
+        Expected: 200 OK with only id and name in each collection
+        """
+        response = authenticated_client.get("/api/collections/", params={"fields": "name,id"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"name": test_collection.name, "id": str(test_collection.id)}]
+
     def test_get_collection_by_id(self, authenticated_client, test_collection):
         """
         Flow: GET /api/collections/{id} for existing collection
@@ -46,6 +46,31 @@ class TestDealersEndpoints:
         data = response.json()
         assert any(d["name"] == "DealerList" for d in data)
 
+    async def test_get_dealers_sparse_fields(self, authenticated_client, test_user, test_session):
+        dealer = Dealer(name="DealerFields", email="fields@test.com", note="Long note", user_id=test_user.id)
+        test_session.add(dealer)
+        await test_session.commit()
+        response = authenticated_client.get("/api/dealers/", params={"fields": "id,name"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"name": "DealerFields", "id": dealer.id}]
+
+    async def test_get_dealers_etag(self, authenticated_client, test_user, test_session):
+        """
+        Flow: GET /api/dealers/ -> repeat with If-None-Match -> create a dealer -> repeat again
+        Expected: 304 while nothing changed, 200 with a new ETag after the change
+        """
+        etag = authenticated_client.get("/api/dealers/").headers["ETag"]
+
+        response = authenticated_client.get("/api/dealers/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        authenticated_client.post("/api/dealers/", json={"name": "NewDealer"})
+
+        response = authenticated_client.get("/api/dealers/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert [dealer["name"] for dealer in response.json()] == ["NewDealer"]
+
     async def test_get_dealer_by_id(self, authenticated_client, test_user, test_session):
         dealer = Dealer(name="DealerById", email=None, phone=None, address=None, website=None, note=None, user_id=test_user.id)
         test_session.add(dealer)
@@ -0,0 +1,218 @@
+"""Tests for FX rates and currency conversion."""
+import math
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+
+from analytics.feeds import FeedCache
+from analytics.fx_rates import fx_rate_cache, load_fx_rate_files, load_fx_rates
+from models.fx_rate import FX_RATES_FEED
+from settings import settings
+from utils.enums import Currency
+
+RATES_CSV = "currency,date,rate\nUSD,2020-01-01,1.1\nUSD,2024-01-01,1.25\nGBP,2020-01-01,0.8\n"
+
+
+@pytest.fixture
+def drop_dir(tmp_path, monkeypatch):
+    """Drop rate files into a temporary directory, starting from an empty rate cache."""
+    monkeypatch.setattr(settings.fx_rates, "drop_dir", tmp_path)
+    fx_rate_cache.invalidate()
+    yield tmp_path
+    fx_rate_cache.invalidate()
+
+
+@pytest_asyncio.fixture
+async def fx_rates(drop_dir, test_session):
+    """USD at 1.10 per euro from 2020 and 1.25 from 2024, GBP at 0.80 from 2020."""
+    (drop_dir / "rates.csv").write_text(RATES_CSV)
+    assert await load_fx_rate_files(test_session) == 3
+
+
+@pytest_asyncio.fixture
+async def euro_user(test_session, test_user):
+    test_user.currency = Currency.EUR
+    await test_session.commit()
+    return test_user
+
+
+class TestFxRates:
+    """Test loading rates and converting prices held in arrays."""
+
+    async def test_convert(self, fx_rates, test_session):
+        """
+        Flow: Convert USD, GBP and EUR prices to EUR and USD on several dates
+        Expected: Latest rate on or before each date, the earliest one before any rate
+        """
+        rates = await fx_rate_cache.get(test_session)
+        dates = [date(2024, 6, 1), date(2019, 1, 1), date(2021, 1, 1), date(2024, 6, 1)]
+
+        in_euros = rates.convert([12500, 1100, 800, 1000], ["USD", "USD", "GBP", "EUR"], dates, Currency.EUR)
+        in_dollars = rates.convert([10000], ["GBP"], [date(2024, 6, 1)], Currency.USD)
+
+        assert in_euros.tolist() == pytest.approx([10000, 1000, 1000, 1000])
+        assert in_dollars.tolist() == pytest.approx([10000 * 1.25 / 0.8])
+
+    async def test_unquoted_currency_is_nan(self, drop_dir, test_session):
+        """
+        Flow: Convert a USD price to EUR without any rate loaded
+        Expected: NaN
+        """
+        rates = await fx_rate_cache.get(test_session)
+
+        assert math.isnan(rates.convert([100], ["USD"], [date(2024, 1, 1)], Currency.EUR)[0])
+
+    async def test_cache_follows_loads_of_other_workers(self, fx_rates, drop_dir, test_session):
+        """
+        Flow: Read rates through a second cache -> load a new USD rate -> read again
+        Expected: New rate seen without invalidating that cache
+        """
+        other_worker = FeedCache(FX_RATES_FEED, load_fx_rates)
+        before = (await other_worker.get(test_session)).convert([125], ["USD"], [date(2025, 1, 1)], Currency.EUR)
+
+        (drop_dir / "new.csv").write_text("currency,date,rate\nUSD,2025-01-01,1.0\n")
+        await load_fx_rate_files(test_session)
+        after = (await other_worker.get(test_session)).convert([125], ["USD"], [date(2025, 1, 1)], Currency.EUR)
+
+        assert (before[0], after[0]) == pytest.approx((100, 125))
+
+
+class TestCurrencyConversion:
+    """Test prices converted to the user's display currency in SQL."""
+
+    def test_summary_in_display_currency(self, authenticated_client, euro_user, fx_rates):
+        """
+        Flow: EUR user with a USD purchase revalued in GBP -> GET /api/portfolio/summary
+        Expected: Cost and value converted to EUR at the rates of their dates
+        """
+        item = authenticated_client.post(
+            "/api/items/",
+            json={
+                "name": "Eagle",
+                "year": "1907",
+                "material": "gold",
+                "purchase_price": 12500,
+                "purchase_date": "2024-06-01",
+                "purchase_currency": "USD",
+            },
+        ).json()
+        authenticated_client.post(
+            f"/api/items/{item['id']}/price-history/",
+            json={"price": 16000, "date": "2024-07-01", "currency": "GBP"},
+        )
+
+        data = authenticated_client.get("/api/portfolio/summary").json()
+
+        assert data["currency"] == "EUR"
+        assert (data["purchase_cost"], data["market_value"]) == (10000, 20000)
+
+    def test_prices_default_to_display_currency(self, authenticated_client, euro_user):
+        """
+        Flow: EUR user creates an item and a price without currencies
+        Expected: Both recorded in EUR
+        """
+        item = authenticated_client.post(
+            "/api/items/", json={"name": "Krone", "year": "1912", "material": "gold", "purchase_price": 100}
+        ).json()
+        price = authenticated_client.post(f"/api/items/{item['id']}/price-history/", json={"price": 120}).json()
+
+        assert item["purchase_currency"] == "EUR"
+        assert price["currency"] == "EUR"
+
+    def test_listing_converted_filtered_and_sorted(self, authenticated_client, euro_user, fx_rates):
+        """
+        Flow: EUR user with a 110 USD item of 2020 and a 90 EUR item -> list sorted by price
+        Expected: Prices in EUR, ordered and filtered by the converted price
+        """
+        for name, price, currency in (("Dollar", 11000, "USD"), ("Euro", 9000, "EUR")):
+            authenticated_client.post(
+                "/api/items/",
+                json={
+                    "name": name,
+                    "year": "2020",
+                    "material": "silver",
+                    "purchase_price": price,
+                    "purchase_date": "2020-06-01",
+                    "purchase_currency": currency,
+                },
+            )
+
+        listed = authenticated_client.get("/api/items/", params={"sort": "-purchase_price"}).json()
+        filtered = authenticated_client.get("/api/items/", params={"purchase_price_min": 9500}).json()
+
+        assert [(item["name"], item["purchase_price"], item["purchase_currency"]) for item in listed] == [
+            ("Dollar", 10000, "EUR"),
+            ("Euro", 9000, "EUR"),
+        ]
+        assert [item["name"] for item in filtered] == ["Dollar"]
+
+    def test_prices_without_rates_stay_unconverted(self, authenticated_client, euro_user, drop_dir):
+        """
+        Flow: EUR user without any FX rates loaded, with a USD item revalued in USD and a EUR item
+              -> list paged by price, get the USD item's series, the summary and the analytics
+        Expected: USD prices are returned unconverted in USD everywhere instead of null, and are
+                  kept out of the EUR totals and portfolio metrics
+        """
+        ids = {}
+        for name, price, currency in (("Dollar", 11000, "USD"), ("Euro", 9000, "EUR")):
+            ids[name] = authenticated_client.post(
+                "/api/items/",
+                json={
+                    "name": name,
+                    "year": "2020",
+                    "material": "silver",
+                    "purchase_price": price,
+                    "purchase_date": "2020-06-01",
+                    "purchase_currency": currency,
+                },
+            ).json()["id"]
+        authenticated_client.post(
+            f"/api/items/{ids['Dollar']}/price-history/",
+            json={"price": 12000, "date": "2021-06-01", "currency": "USD"},
+        )
+
+        first = authenticated_client.get("/api/items/", params={"sort": "purchase_price", "limit": 1})
+        second = authenticated_client.get(
+            "/api/items/", params={"sort": "purchase_price", "limit": 1, "cursor": first.headers["X-Next-Cursor"]}
+        )
+        series = authenticated_client.get(f"/api/items/{ids['Dollar']}/price-history/series")
+        summary = authenticated_client.get("/api/portfolio/summary").json()
+        analytics = authenticated_client.get("/api/analytics/items").json()
+
+        assert [(item["name"], item["purchase_price"], item["purchase_currency"]) for item in first.json()] == [
+            ("Euro", 9000, "EUR")
+        ]
+        assert [(item["name"], item["purchase_price"], item["purchase_currency"]) for item in second.json()] == [
+            ("Dollar", 11000, "USD")
+        ]
+        assert series.status_code == status.HTTP_200_OK
+        assert [(point["currency"], point["close"]) for point in series.json()["points"]] == [
+            ("USD", 11000),
+            ("USD", 12000),
+        ]
+        assert (summary["item_count"], summary["purchase_cost"], summary["market_value"]) == (1, 9000, 9000)
+        assert [
+            (total["currency"], total["item_count"], total["purchase_cost"], total["market_value"])
+            for total in summary["unconverted"]
+        ] == [("USD", 1, 11000, 12000)]
+        assert {item["name"]: (item["currency"], item["value"]) for item in analytics["items"]} == {
+            "Dollar": ("USD", 12000),
+            "Euro": ("EUR", 9000),
+        }
+        assert analytics["portfolio"]["value"] == 9000
+
+    async def test_etag_changes_with_rates(self, authenticated_client, test_item, drop_dir, test_session):
+        """
+        Flow: GET /api/portfolio/summary -> load rates -> conditional GET with the old ETag
+        Expected: 200 with a new ETag
+        """
+        etag = authenticated_client.get("/api/portfolio/summary").headers["ETag"]
+
+        (drop_dir / "rates.csv").write_text(RATES_CSV)
+        await load_fx_rate_files(test_session)
+        response = authenticated_client.get("/api/portfolio/summary", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
@@ -1,12 +1,18 @@
 """Tests for item price history functionality."""
+import json
+from datetime import date
 from typing import Any
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 from httpx import Response
 
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from models.user import User
 from models.item import Item
+from models.item_latest_price import ItemLatestPrice, refresh_item_latest_prices
 
 
 class TestItemPriceHistory:
@@ -43,6 +49,24 @@ class TestItemPriceHistory:
         assert price_entry["type"] == "c"  # Current market price
         assert price_entry["item_id"] == str(test_item.id)
 
+    def test_price_history_stream_ndjson(self, authenticated_client: TestClient, test_user: User, test_item: Item):
+        """
+        Flow: Add a current price entry -> GET /api/items/{item_id}/price-history?stream=1
+        Expected: 200 OK NDJSON body with one entry per line, newest first
+        """
+        response: Response = authenticated_client.post(
+            f"/api/items/{test_item.id}/price-history", json={"price": 12000, "date": "2000-01-15"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = authenticated_client.get(f"/api/items/{test_item.id}/price-history", params={"stream": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        entries: list[dict[str, Any]] = [json.loads(line) for line in response.text.splitlines()]
+        assert [entry["type"] for entry in entries] == ["p", "c"]
+        assert entries[1]["price"] == 12000
+
     def test_add_price_without_date(self, authenticated_client: TestClient, test_user: User, test_item: Item):
         """
         Flow: POST /api/items/{item_id}/price-history without date
@@ -286,3 +310,193 @@ class TestItemPriceHistory:
         
         # Verify the deleted entry is gone
         assert not any(entry["id"] == entry_to_delete["id"] for entry in final_history)
+
+
+@pytest.mark.asyncio
+class TestItemLatestPrice:
+    """Test the latest price projection kept in sync with the price history."""
+
+    async def get_latest_price(self, session: AsyncSession, item_id: str) -> tuple[Any, ...] | None:
+        result = await session.execute(
+            select(
+                ItemLatestPrice.purchase_price,
+                ItemLatestPrice.market_price,
+                ItemLatestPrice.market_price_date,
+            ).where(ItemLatestPrice.item_id == item_id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def test_projection_follows_price_history_changes(
+        self, authenticated_client: TestClient, test_item: Item, test_session: AsyncSession
+    ):
+        """
+        Flow: Add two current prices -> move the newest back in time -> delete the other one
+        Expected: The projection always holds the purchase price and the newest current price
+        """
+        assert await self.get_latest_price(test_session, test_item.id) == (50000, None, None)
+
+        url = f"/api/items/{test_item.id}/price-history"
+        older = authenticated_client.post(url, json={"price": 60000, "date": "2024-01-01"}).json()
+        newer = authenticated_client.post(url, json={"price": 70000, "date": "2024-02-01"}).json()
+        assert await self.get_latest_price(test_session, test_item.id) == (50000, 70000, date(2024, 2, 1))
+
+        authenticated_client.patch(f"{url}/{newer['id']}", json={"date": "2023-12-01"})
+        assert await self.get_latest_price(test_session, test_item.id) == (50000, 60000, date(2024, 1, 1))
+
+        authenticated_client.delete(f"{url}/{older['id']}")
+        assert await self.get_latest_price(test_session, test_item.id) == (50000, 70000, date(2023, 12, 1))
+
+    async def test_rebuild_restores_projection(
+        self, authenticated_client: TestClient, test_item: Item, test_session: AsyncSession
+    ):
+        """
+        Flow: Add a current price -> wipe the projection -> rebuild it for all items
+        Expected: The rebuilt row matches the one maintained by the API
+        """
+        authenticated_client.post(
+            f"/api/items/{test_item.id}/price-history", json={"price": 65000, "date": "2024-05-01"}
+        )
+        expected = await self.get_latest_price(test_session, test_item.id)
+
+        await test_session.execute(delete(ItemLatestPrice))
+        await refresh_item_latest_prices(test_session)
+        await test_session.commit()
+
+        assert await self.get_latest_price(test_session, test_item.id) == expected == (50000, 65000, date(2024, 5, 1))
+
+
+class TestPriceHistoryBatch:
+    """Test POST /api/price-history/batch."""
+
+    def test_add_batch(self, authenticated_client: TestClient, test_user: User, test_item: Item):
+        """
+        Flow: Create a second item -> add current prices to both items in one batch, one without date
+        Expected: 201 with the entries in request order, latest prices of both items updated
+        """
+        other = authenticated_client.post(
+            "/api/items/", json={"name": "Other", "year": "1900", "material": "silver", "purchase_price": 100}
+        ).json()
+
+        response = authenticated_client.post(
+            "/api/price-history/batch",
+            json=[
+                {"item_id": test_item.id, "price": 60000, "date": "2024-01-01"},
+                {"item_id": other["id"], "price": 200},
+                {"item_id": test_item.id, "price": 61000, "date": "2024-02-01"},
+            ],
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        entries = response.json()
+        assert [(entry["item_id"], entry["price"], entry["type"]) for entry in entries] == [
+            (test_item.id, 60000, "c"),
+            (other["id"], 200, "c"),
+            (test_item.id, 61000, "c"),
+        ]
+        assert entries[1]["date"] == date.today().isoformat()
+        history = authenticated_client.get(f"/api/items/{test_item.id}/price-history").json()
+        assert sorted(entry["price"] for entry in history) == [50000, 60000, 61000]
+
+    def test_batch_rejects_foreign_items(
+        self, authenticated_client: TestClient, test_user: User, test_item: Item, another_user_client: TestClient
+    ):
+        """
+        Flow: Another user adds a batch naming test_user's item and an unknown item
+        Expected: 404 listing both, nothing added
+        """
+        unknown = "00000000-0000-0000-0000-000000000000"
+
+        response = another_user_client.post(
+            "/api/price-history/batch",
+            json=[{"item_id": test_item.id, "price": 1}, {"item_id": unknown, "price": 2}],
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == f"Items not found: {', '.join(sorted([test_item.id, unknown]))}"
+        history = authenticated_client.get(f"/api/items/{test_item.id}/price-history").json()
+        assert len(history) == 1
+
+    def test_batch_validation(self, authenticated_client: TestClient, test_user: User, test_item: Item):
+        """
+        Flow: POST an empty batch, a negative price
+        Expected: 422 Unprocessable Entity
+        """
+        assert authenticated_client.post("/api/price-history/batch", json=[]).status_code == 422
+        response = authenticated_client.post("/api/price-history/batch", json=[{"item_id": test_item.id, "price": -1}])
+        assert response.status_code == 422
+
+
+class TestPriceSeries:
+    """Test GET /api/items/{item_id}/price-history/series."""
+
+    @pytest.fixture
+    def quotes(self, authenticated_client: TestClient, test_item: Item) -> str:
+        """Add current prices over three weeks and two months; returns the series URL."""
+        authenticated_client.post(
+            "/api/price-history/batch",
+            json=[
+                {"item_id": test_item.id, "price": price, "date": day}
+                for price, day in [
+                    (100, "2024-01-01"),
+                    (300, "2024-01-03"),
+                    (200, "2024-01-05"),
+                    (400, "2024-01-08"),
+                    (50, "2024-02-15"),
+                ]
+            ],
+        )
+        return f"/api/items/{test_item.id}/price-history/series"
+
+    def points(self, response: Response) -> list[tuple[Any, ...]]:
+        return [
+            (point["date"], point["open"], point["high"], point["low"], point["close"], point["count"])
+            for point in response.json()["points"]
+        ]
+
+    def test_weekly_series(self, authenticated_client: TestClient, quotes: str):
+        """
+        Flow: GET the weekly series of current prices
+        Expected: One OHLC point per week starting on Monday, oldest first
+        """
+        response = authenticated_client.get(quotes, params={"bucket": "week", "type": "c"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["bucket"] == "week"
+        assert self.points(response) == [
+            ("2024-01-01", 100, 300, 100, 200, 3),
+            ("2024-01-08", 400, 400, 400, 400, 1),
+            ("2024-02-12", 50, 50, 50, 50, 1),
+        ]
+
+    def test_daily_series_by_default(self, authenticated_client: TestClient, quotes: str):
+        """
+        Flow: GET the series without bucket, with the purchase price included
+        Expected: One point per day with entries
+        """
+        response = authenticated_client.get(quotes)
+
+        assert response.json()["bucket"] == "day"
+        assert len(response.json()["points"]) == 6
+
+    def test_max_points_picks_bucket(self, authenticated_client: TestClient, quotes: str):
+        """
+        Flow: GET the series of current prices with max_points=2
+        Expected: Monthly buckets, the shortest period giving at most 2 points
+        """
+        response = authenticated_client.get(quotes, params={"max_points": 2, "type": "c"})
+
+        assert response.json()["bucket"] == "month"
+        assert self.points(response) == [
+            ("2024-01-01", 100, 400, 100, 400, 4),
+            ("2024-02-01", 50, 50, 50, 50, 1),
+        ]
+
+    def test_series_ownership(self, test_item: Item, another_user_client: TestClient):
+        """
+        Flow: Another user GETs the series of test_item
+        Expected: 404 Not Found
+        """
+        response = another_user_client.get(f"/api/items/{test_item.id}/price-history/series")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,4 +1,6 @@
 """Tests for items endpoints."""
+import json
+
 import pytest
 from fastapi import status
 
@@ -208,6 +210,243 @@ class TestItemsEndpoints:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_list_items_keyset_pagination(self, authenticated_client, test_user):
+        """
+        Flow: Create 5 items -> GET /api/items/?limit=2 -> follow X-Next-Cursor until it is absent
+        Expected: Pages of 2, 2 and 1 items covering every item once, ordered by name
+        """
+        for name in ["Coin E", "Coin C", "Coin A", "Coin D", "Coin B"]:
+            response = authenticated_client.post(
+                "/api/items/", json={"name": name, "year": "2024", "material": "gold", "purchase_price": 1000}
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        pages = []
+        params = {"limit": 2}
+        while True:
+            response = authenticated_client.get("/api/items/", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append([item["name"] for item in response.json()])
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            params = {"limit": 2, "cursor": next_cursor}
+
+        assert pages == [["Coin A", "Coin B"], ["Coin C", "Coin D"], ["Coin E"]]
+
+    def test_list_items_last_page_has_no_cursor(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/items/?limit=1 when user has exactly one item
+        Expected: 200 OK with the item and no X-Next-Cursor header
+        """
+        response = authenticated_client.get("/api/items/", params={"limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_list_items_invalid_cursor(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/items/ with a malformed cursor
+        Expected: 400 Bad Request with "Invalid cursor" in error detail
+        """
+        response = authenticated_client.get("/api/items/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Invalid cursor" in response.json()["detail"]
+
+    def test_list_items_filters(self, authenticated_client, test_user):
+        """
+        Flow: Create items with different materials, years and prices -> GET /api/items/ with filters
+        Expected: 200 OK with only the items matching every filter
+        """
+        items_data = [
+            {"name": "Gold Old", "year": "1900", "material": "gold", "purchase_price": 90000},
+            {"name": "Gold New", "year": "2020", "material": "gold", "purchase_price": 150000},
+            {"name": "Silver New", "year": "2021", "material": "silver", "purchase_price": 3000},
+            {"name": "Copper New", "year": "2022", "material": "copper", "purchase_price": 500},
+        ]
+        for item_data in items_data:
+            response = authenticated_client.post("/api/items/", json=item_data)
+            assert response.status_code == status.HTTP_201_CREATED
+
+        response = authenticated_client.get("/api/items/", params={"material": ["gold", "silver"], "year_from": "2000"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in response.json()] == ["Gold New", "Silver New"]
+
+        response = authenticated_client.get(
+            "/api/items/", params={"purchase_price_min": 1000, "purchase_price_max": 100000}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in response.json()] == ["Gold Old", "Silver New"]
+
+    def test_list_items_sort_descending_with_pagination(self, authenticated_client, test_user):
+        """
+        Flow: Create 3 items -> page through GET /api/items/?sort=-purchase_price&limit=2
+        Expected: Items ordered by purchase price descending across pages
+        """
+        for name, price in [("Cheap", 100), ("Dear", 30000), ("Middle", 2000)]:
+            response = authenticated_client.post(
+                "/api/items/", json={"name": name, "year": "2024", "material": "gold", "purchase_price": price}
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        first_page = authenticated_client.get("/api/items/", params={"sort": "-purchase_price", "limit": 2})
+        assert first_page.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in first_page.json()] == ["Dear", "Middle"]
+
+        cursor = first_page.headers["X-Next-Cursor"]
+        second_page = authenticated_client.get(
+            "/api/items/", params={"sort": "-purchase_price", "limit": 2, "cursor": cursor}
+        )
+        assert second_page.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in second_page.json()] == ["Cheap"]
+
+        # A cursor is bound to the sort it was issued for
+        other_sort = authenticated_client.get("/api/items/", params={"sort": "name", "cursor": cursor})
+        assert other_sort.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_list_items_unknown_sort(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/items/?sort=description (not whitelisted)
+        Expected: 422 Unprocessable Entity
+        """
+        response = authenticated_client.get("/api/items/", params={"sort": "description"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_list_items_stream_ndjson(self, authenticated_client, test_user):
+        """
+        Flow: Create 3 items -> GET /api/items/?stream=1 and with Accept: application/x-ndjson
+        Expected: 200 OK NDJSON body with one item per line ordered by name, no page limit applied
+        """
+        for name in ["Coin C", "Coin A", "Coin B"]:
+            response = authenticated_client.post(
+                "/api/items/", json={"name": name, "year": "2024", "material": "gold", "purchase_price": 1000}
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        for request_kwargs in [{"params": {"stream": 1}}, {"headers": {"Accept": "application/x-ndjson"}}]:
+            response = authenticated_client.get("/api/items/", **request_kwargs)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert [item["name"] for item in lines] == ["Coin A", "Coin B", "Coin C"]
+            assert all("purchase_price" in item for item in lines)
+
+    def test_list_items_stream_respects_filters_and_limit(self, authenticated_client, test_user):
+        """
+        Flow: Create gold and silver items -> stream with material filter and explicit limit
+        Expected: Only the first matching item is streamed
+        """
+        for name, material in [("Gold A", "gold"), ("Silver A", "silver"), ("Gold B", "gold")]:
+            authenticated_client.post(
+                "/api/items/", json={"name": name, "year": "2024", "material": material, "purchase_price": 1000}
+            )
+
+        response = authenticated_client.get("/api/items/", params={"stream": 1, "material": "gold", "limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["Gold A"]
+
+    def test_list_items_sparse_fields(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/items/?fields=id,name,year,material (paged and streamed)
+        Expected: 200 OK with only the requested fields, description and images left out
+        """
+        expected = {
+            "id": str(test_item.id),
+            "name": test_item.name,
+            "year": test_item.year,
+            "material": test_item.material,
+        }
+
+        response = authenticated_client.get("/api/items/", params={"fields": "id,name,year,material"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [expected]
+
+        response = authenticated_client.get("/api/items/", params={"fields": "id,name,year,material", "stream": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert [json.loads(line) for line in response.text.splitlines()] == [expected]
+
+    def test_list_items_sparse_fields_with_cursor(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/items/?fields=name&sort=-purchase_price&limit=1 -> follow the cursor
+        Expected: Pagination still works although neither id nor the sort column is returned
+        """
+        for name, price in [("Cheap", 100), ("Dear", 30000)]:
+            authenticated_client.post(
+                "/api/items/", json={"name": name, "year": "2024", "material": "gold", "purchase_price": price}
+            )
+
+        params = {"fields": "name", "sort": "-purchase_price", "limit": 1}
+        first_page = authenticated_client.get("/api/items/", params=params)
+        assert first_page.json() == [{"name": "Dear"}]
+
+        second_page = authenticated_client.get(
+            "/api/items/", params={**params, "cursor": first_page.headers["X-Next-Cursor"]}
+        )
+        assert second_page.json() == [{"name": "Cheap"}]
+
+    def test_list_items_unknown_fields(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/items/?fields=name,secret
+        Expected: 400 Bad Request naming the unknown field
+        """
+        response = authenticated_client.get("/api/items/", params={"fields": "name,secret"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "secret" in response.json()["detail"]
+
+    def test_list_items_etag_not_modified(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/items/ -> repeat with If-None-Match (paged and streamed)
+        Expected: ETag on the first response, 304 with an empty body on the conditional one
+        """
+        for params in ({}, {"stream": 1}):
+            response = authenticated_client.get("/api/items/", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            etag = response.headers["ETag"]
+
+            response = authenticated_client.get("/api/items/", params=params, headers={"If-None-Match": etag})
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+
+    def test_etag_differs_per_representation(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/items/ with different query strings, and GET /api/items/{id}
+        Expected: Each representation gets its own ETag
+        """
+        etags = {
+            authenticated_client.get("/api/items/").headers["ETag"],
+            authenticated_client.get("/api/items/", params={"sort": "-name"}).headers["ETag"],
+            authenticated_client.get(f"/api/items/{test_item.id}").headers["ETag"],
+        }
+        assert len(etags) == 3
+
+    def test_etag_changes_after_mutation(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/items/{id} -> PATCH the item -> GET with the old If-None-Match
+        Expected: 200 OK with the new data and a new ETag instead of 304
+        """
+        etag = authenticated_client.get(f"/api/items/{test_item.id}").headers["ETag"]
+
+        authenticated_client.patch(f"/api/items/{test_item.id}", json={"name": "Renamed"})
+
+        response = authenticated_client.get(f"/api/items/{test_item.id}", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Renamed"
+        assert response.headers["ETag"] != etag
+
+        authenticated_client.post(f"/api/items/{test_item.id}/price-history", json={"price": 2000, "type": "c", "date": "2024-06-01"})
+
+        response = authenticated_client.get(
+            f"/api/items/{test_item.id}", headers={"If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
     def test_unauthenticated_access(self, client):
         """
         Flow: Access all item endpoints without authentication
@@ -232,6 +471,156 @@ class TestItemsEndpoints:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class TestItemsBulkEndpoints:
+    """Test creating, updating and deleting many items per request."""
+
+    def test_bulk_create_items(self, authenticated_client, test_user):
+        """
+        Flow: POST /api/items/bulk with two payloads -> GET /api/items/
+        Expected: 201 Created with both items and purchase prices, in payload order
+        """
+        payloads = [
+            {"name": "Krugerrand", "year": "1978", "material": "gold", "purchase_price": 180000, "purchase_date": "2023-05-01"},
+            {"name": "Britannia", "year": "2020", "material": "silver", "purchase_price": 3000},
+        ]
+
+        response = authenticated_client.post("/api/items/bulk", json=payloads)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        result = response.json()
+        assert result["errors"] == []
+        assert [item["name"] for item in result["created"]] == ["Krugerrand", "Britannia"]
+        assert [item["purchase_price"] for item in result["created"]] == [180000, 3000]
+        assert result["created"][0]["purchase_date"] == "2023-05-01"
+        assert result["created"][1]["purchase_date"] is not None
+        assert all(item["user_id"] == test_user.id for item in result["created"])
+
+        listing = authenticated_client.get("/api/items/").json()
+        assert {item["id"] for item in listing} == {item["id"] for item in result["created"]}
+
+        summary = authenticated_client.get("/api/portfolio/summary").json()
+        assert summary["purchase_cost"] == 183000
+
+    def test_bulk_create_rejects_invalid_payloads(self, authenticated_client, test_user):
+        """
+        Flow: POST /api/items/bulk with one valid and one invalid payload
+        Expected: 422 naming the invalid payload, nothing created
+        """
+        payloads = [
+            {"name": "Valid", "year": "2024", "material": "gold", "purchase_price": 100},
+            {"name": "Invalid", "year": "2024", "material": "unobtainium", "purchase_price": -1},
+        ]
+
+        response = authenticated_client.post("/api/items/bulk", json=payloads)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        errors = response.json()["detail"]
+        assert [error["index"] for error in errors] == [1]
+        assert {tuple(error["loc"]) for error in errors[0]["errors"]} == {("material",), ("purchase_price",)}
+        assert authenticated_client.get("/api/items/").json() == []
+
+    def test_bulk_create_partial(self, authenticated_client, test_user):
+        """
+        Flow: POST /api/items/bulk?partial=true with one valid and one invalid payload
+        Expected: 201 Created with the valid item created and the invalid one reported
+        """
+        payloads = [
+            {"name": "Invalid", "year": "2024", "material": "gold"},
+            {"name": "Valid", "year": "2024", "material": "gold", "purchase_price": 100},
+        ]
+
+        response = authenticated_client.post("/api/items/bulk", params={"partial": True}, json=payloads)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        result = response.json()
+        assert [item["name"] for item in result["created"]] == ["Valid"]
+        assert [error["index"] for error in result["errors"]] == [0]
+        assert [item["name"] for item in authenticated_client.get("/api/items/").json()] == ["Valid"]
+
+    def test_bulk_create_limits(self, authenticated_client, test_user):
+        """
+        Flow: POST /api/items/bulk with an empty list and with too many payloads
+        Expected: 422 for both
+        """
+        item = {"name": "Coin", "year": "2024", "material": "gold", "purchase_price": 100}
+
+        assert authenticated_client.post("/api/items/bulk", json=[]).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response = authenticated_client.post("/api/items/bulk", json=[item] * 1001)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+    def create_items(self, client, *names, material="gold"):
+        payloads = [{"name": name, "year": "2024", "material": material, "purchase_price": 100} for name in names]
+        return [item["id"] for item in client.post("/api/items/bulk", json=payloads).json()["created"]]
+
+    def test_bulk_update_items(self, authenticated_client, test_user, test_item):
+        """
+        Flow: PATCH /api/items/bulk re-tagging two of three items
+        Expected: 200 OK with updated=2, only the listed items changed
+        """
+        first_id, second_id = self.create_items(authenticated_client, "First", "Second")
+
+        response = authenticated_client.patch(
+            "/api/items/bulk", json={"ids": [first_id, second_id], "patch": {"material": "silver", "year": "1999"}}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"updated": 2}
+        items = {item["id"]: item for item in authenticated_client.get("/api/items/").json()}
+        assert items[first_id]["material"] == items[second_id]["material"] == "silver"
+        assert items[first_id]["year"] == "1999"
+        assert items[str(test_item.id)]["material"] == "gold"
+
+    def test_bulk_update_moves_items_between_collections(self, authenticated_client, test_user, test_collection):
+        """
+        Flow: PATCH /api/items/bulk with collection_id -> again with collection_id null
+        Expected: Items are moved into the collection, then out of it
+        """
+        item_ids = self.create_items(authenticated_client, "First", "Second")
+
+        response = authenticated_client.patch(
+            "/api/items/bulk", json={"ids": item_ids, "patch": {"collection_id": test_collection.id}}
+        )
+        assert response.json() == {"updated": 2}
+        collection = authenticated_client.get(f"/api/collections/{test_collection.id}").json()
+        assert {item["id"] for item in collection["items"]} == set(item_ids)
+
+        response = authenticated_client.patch("/api/items/bulk", json={"ids": item_ids, "patch": {"collection_id": None}})
+        assert response.json() == {"updated": 2}
+        assert authenticated_client.get(f"/api/collections/{test_collection.id}").json()["items"] == []
+
+    def test_bulk_update_rejects_foreign_collection_and_empty_patch(self, authenticated_client, test_user, test_item):
+        """
+        Flow: PATCH /api/items/bulk with an unknown collection, then with an empty patch
+        Expected: 404 Not Found, then 400 Bad Request
+        """
+        ids = [str(test_item.id)]
+
+        response = authenticated_client.patch("/api/items/bulk", json={"ids": ids, "patch": {"collection_id": "missing"}})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = authenticated_client.patch("/api/items/bulk", json={"ids": ids, "patch": {}})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_delete_items(self, authenticated_client, test_user, test_item):
+        """
+        Flow: DELETE /api/items/bulk with two own items and an unknown ID
+        Expected: 200 OK with deleted=2, their price history gone, the other item kept
+        """
+        first_id, second_id = self.create_items(authenticated_client, "First", "Second")
+        authenticated_client.post(f"/api/items/{first_id}/price-history", json={"price": 500})
+
+        response = authenticated_client.request(
+            "DELETE", "/api/items/bulk", json={"ids": [first_id, second_id, "12345678-1234-1234-1234-123456789012"]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"deleted": 2}
+        assert [item["id"] for item in authenticated_client.get("/api/items/").json()] == [str(test_item.id)]
+        assert authenticated_client.get(f"/api/items/{first_id}/price-history").status_code == status.HTTP_404_NOT_FOUND
+        assert authenticated_client.get("/api/portfolio/summary").json()["item_count"] == 1
+
+
 class TestItemsWorkflows:
     """Test comprehensive item management workflows and user journeys."""
 
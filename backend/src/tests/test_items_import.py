@@ -0,0 +1,197 @@
+"""Tests for importing items from CSV."""
+import csv
+import io
+
+import pytest
+from fastapi import status
+
+from utils.csv_stream import iter_csv_records
+
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.mark.asyncio
+class TestIterCsvRecords:
+    """Test incremental CSV parsing of a byte stream."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+    async def test_records_split_across_chunks(self, chunk_size):
+        """
+        Flow: Parse CSV with a BOM, CRLF, a quoted multi-line field and a blank line in chunks
+        Expected: Same records with their starting line numbers for every chunk size
+        """
+        data = '﻿name,year\r\n"Morgan, ""CC""\nDollar",1921\n\nPeace,1922'.encode()
+
+        records = [record async for record in iter_csv_records(chunked(data, chunk_size))]
+
+        assert records == [(1, ["name", "year"]), (2, ['Morgan, "CC"\nDollar', "1921"]), (5, ["Peace", "1922"])]
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+    async def test_overlong_records_are_dropped(self, chunk_size):
+        """
+        Flow: Parse CSV with a quote opening a field that never closes, followed by many lines, and an overlong
+              unquoted line, with a small cap
+        Expected: Each overlong record is dropped once and parsing resumes on the line after it
+        """
+        data = ('name,year\n"Bad coin,1921\n' + "Coin,1922\n" * 10 + "x" * 100 + "\nPeace,1923").encode()
+
+        records = [
+            record async for record in iter_csv_records(chunked(data, chunk_size), max_record_size=40)
+        ]
+
+        assert records == [
+            (1, ["name", "year"]),
+            (2, None),
+            *((line, ["Coin", "1922"]) for line in range(6, 13)),
+            (13, None),
+            (14, ["Peace", "1923"]),
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+    async def test_literal_quotes(self, chunk_size):
+        """
+        Flow: Parse CSV with quotes inside unquoted fields, after a closing quote and escaped in a quoted field
+        Expected: Same records as the csv module, each on its own line
+        """
+        text = 'name,year\nMedal 1.5" wide,2024\n"Morgan ""CC"" 1.5"" ",1921\n"Peace" 2",1922\n' + "Coin,1923\n" * 50
+
+        records = [record async for record in iter_csv_records(chunked(text.encode(), chunk_size))]
+
+        assert records == list(enumerate(csv.reader(io.StringIO(text)), start=1))
+
+    async def test_unterminated_record_at_end(self):
+        """
+        Flow: Parse CSV whose last record opens a quoted field that never closes
+        Expected: The record is dropped instead of failing the parse
+        """
+        records = [record async for record in iter_csv_records(chunked(b'name,year\nPeace,"1921\n', 4))]
+
+        assert records == [(1, ["name", "year"]), (2, None)]
+
+    async def test_invalid_utf8(self):
+        """
+        Flow: Parse bytes that are not UTF-8
+        Expected: UnicodeDecodeError
+        """
+        with pytest.raises(UnicodeDecodeError):
+            [record async for record in iter_csv_records(chunked(b"name\n\xff\xfe", 1))]
+
+
+class TestItemsImport:
+    """Test POST /api/items/import."""
+
+    def test_import_items(self, authenticated_client, test_user):
+        """
+        Flow: POST /api/items/import with valid rows, an invalid row and an extra column
+        Expected: 200 OK counting inserted and rejected rows, items listed afterwards
+        """
+        csv_data = (
+            "name,year,material,purchase_price,purchase_date,notes\n"
+            "Krugerrand,1978,gold,180000,2023-05-01,first\n"
+            "Britannia,2020,silver,3000,,\n"
+            "Broken,2020,unobtainium,3000,,\n"
+        )
+
+        response = authenticated_client.post("/api/items/import", content=csv_data, headers=CSV_HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert (result["inserted"], result["rejected"], result["duplicates"]) == (2, 1, 0)
+        assert result["errors"][0]["line"] == 4
+        assert result["errors"][0]["errors"][0]["loc"] == ["material"]
+
+        items = {item["name"]: item for item in authenticated_client.get("/api/items/").json()}
+        assert set(items) == {"Krugerrand", "Britannia"}
+        assert items["Krugerrand"]["purchase_date"] == "2023-05-01"
+        assert items["Britannia"]["purchase_price"] == 3000
+
+    def test_import_skips_duplicates(self, authenticated_client, test_user):
+        """
+        Flow: Import the same file twice, the second time with one new row
+        Expected: Only the new row is inserted, the others are counted as duplicates
+        """
+        csv_data = "name;year;material;purchase_price\nSovereign;1911;gold;30000\nSovereign;1911;gold;30000\n"
+        response = authenticated_client.post(
+            "/api/items/import", params={"delimiter": ";"}, content=csv_data, headers=CSV_HEADERS
+        )
+        assert (response.json()["inserted"], response.json()["duplicates"]) == (1, 1)
+
+        response = authenticated_client.post(
+            "/api/items/import",
+            params={"delimiter": ";"},
+            content=csv_data + "Sovereign;1912;gold;30000\n",
+            headers=CSV_HEADERS,
+        )
+        assert (response.json()["inserted"], response.json()["duplicates"]) == (1, 2)
+        assert len(authenticated_client.get("/api/items/").json()) == 2
+
+    def test_import_in_batches(self, authenticated_client, test_user, monkeypatch):
+        """
+        Flow: Import five rows with a batch size of two
+        Expected: All rows are inserted across three batches
+        """
+        monkeypatch.setattr("api.routes.items.ITEMS_IMPORT_BATCH_SIZE", 2)
+        rows = "".join(f"Coin {index},2024,gold,{index}\n" for index in range(5))
+
+        response = authenticated_client.post(
+            "/api/items/import", content="name,year,material,purchase_price\n" + rows, headers=CSV_HEADERS
+        )
+
+        assert response.json()["inserted"] == 5
+        assert len(authenticated_client.get("/api/items/").json()) == 5
+
+    def test_import_rejects_overlong_rows(self, authenticated_client, test_user, monkeypatch):
+        """
+        Flow: Import a file with a quote opening a field that never closes, with a small record cap
+        Expected: The overlong row is rejected with an error, the rows after the cap are imported
+        """
+        monkeypatch.setattr(iter_csv_records, "__defaults__", (",", 60))
+        content = 'name,year,material,purchase_price\n"Bad Coin,2024,gold,100\n'
+        content += "".join(f"Coin {index},2024,gold,100\n" for index in range(5))
+        content += "\nGood Coin,2024,gold,100\n"
+
+        response = authenticated_client.post("/api/items/import", content=content, headers=CSV_HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        # The open record swallows Coin 0 and is dropped at Coin 1, which would exceed the cap
+        assert (result["inserted"], result["rejected"], result["duplicates"]) == (4, 1, 0)
+        assert result["errors"][0]["line"] == 2
+        assert result["errors"][0]["errors"][0]["type"] == "record_too_long"
+
+    def test_import_literal_quotes(self, authenticated_client, test_user):
+        """
+        Flow: Import a row with a quote inside an unquoted field followed by 50 valid rows
+        Expected: Every row is imported, the quote kept in the name
+        """
+        content = 'name,year,material,purchase_price\nMedal 1.5" wide,2024,gold,100\n'
+        content += "".join(f"Coin {index},2024,gold,100\n" for index in range(50))
+
+        response = authenticated_client.post("/api/items/import", content=content, headers=CSV_HEADERS)
+
+        assert (response.json()["inserted"], response.json()["rejected"]) == (51, 0)
+        names = {item["name"] for item in authenticated_client.get("/api/items/", params={"limit": 100}).json()}
+        assert 'Medal 1.5" wide' in names
+
+    def test_import_rejects_bad_files(self, authenticated_client, test_user):
+        """
+        Flow: Import an empty file, a file without required columns and a non UTF-8 file
+        Expected: 400 Bad Request for each
+        """
+        response = authenticated_client.post("/api/items/import", content="", headers=CSV_HEADERS)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = authenticated_client.post("/api/items/import", content="name,year\nCoin,2024\n", headers=CSV_HEADERS)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Missing CSV columns: material, purchase_price"
+
+        response = authenticated_client.post(
+            "/api/items/import", content=b"name,year,material,purchase_price\n\xff\n", headers=CSV_HEADERS
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,295 @@
+"""Tests for the background job runner."""
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from jobs import JobRunner, enqueue_job
+from jobs.runner import job_handlers
+from jobs.tasks import CLEANUP_JOBS, ENSURE_PRICE_HISTORY_PARTITIONS, REFRESH_ITEM_LATEST_PRICES
+from models import ItemLatestPrice, Job, JobSchedule
+from models.job_schedule import claim_scheduled_run
+from settings import JobSettings
+from utils.enums import JobStatus
+
+
+@pytest.fixture
+def session_factory(test_db_engine):
+    return async_sessionmaker(test_db_engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def runner(session_factory):
+    return JobRunner(session_factory, JobSettings(workers=1, per_user_limit=1, retry_backoff_seconds=10))
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Register an `echo` job kind recording its payloads and a `broken` one that always fails."""
+    payloads = []
+
+    async def echo(session, payload):
+        payloads.append(payload)
+
+    async def broken(session, payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(job_handlers, "echo", echo)
+    monkeypatch.setitem(job_handlers, "broken", broken)
+    return payloads
+
+
+async def enqueue(session_factory, kind, payload=None, **kwargs) -> Job:
+    async with session_factory() as session:
+        job = await enqueue_job(session, kind, payload, **kwargs)
+        await session.commit()
+        return job
+
+
+async def get_job(session_factory, job_id) -> Job:
+    async with session_factory() as session:
+        return await session.get(Job, job_id)
+
+
+class TestJobRunner:
+    """Test claiming, running and retrying jobs."""
+
+    async def test_run_job(self, session_factory, runner, calls):
+        """
+        Flow: Enqueue a job -> run the next job twice
+        Expected: Handler called with the payload, job done, nothing left to run
+        """
+        job = await enqueue(session_factory, "echo", {"n": 1})
+
+        assert await runner.run_next() is True
+        assert await runner.run_next() is False
+
+        assert calls == [{"n": 1}]
+        job = await get_job(session_factory, job.id)
+        assert job.status == JobStatus.DONE
+        assert job.attempts == 1
+        assert job.finished_at is not None
+
+    async def test_delayed_job(self, session_factory, runner, calls):
+        """
+        Flow: Enqueue a job delayed by a minute -> run the next job
+        Expected: Not claimed yet
+        """
+        await enqueue(session_factory, "echo", delay_seconds=60)
+
+        assert await runner.run_next() is False
+        assert calls == []
+
+    async def test_retry_with_backoff(self, session_factory, runner, calls):
+        """
+        Flow: Run a failing job with 2 attempts, again once it is due, then once more
+        Expected: Rescheduled with backoff after the first failure, failed after the second
+        """
+        job = await enqueue(session_factory, "broken")
+        async with session_factory() as session:
+            (await session.get(Job, job.id)).max_attempts = 2
+            await session.commit()
+
+        assert await runner.run_next() is True
+        job = await get_job(session_factory, job.id)
+        assert job.status == JobStatus.PENDING
+        assert job.attempts == 1
+        assert job.last_error == "RuntimeError: boom"
+        assert job.run_at.replace(tzinfo=UTC) > datetime.now(UTC) + timedelta(seconds=5)
+        assert await runner.run_next() is False
+
+        async with session_factory() as session:
+            (await session.get(Job, job.id)).run_at = datetime.now(UTC)
+            await session.commit()
+        assert await runner.run_next() is True
+        job = await get_job(session_factory, job.id)
+        assert job.status == JobStatus.FAILED
+        assert job.attempts == 2
+        assert await runner.run_next() is False
+
+    def test_backoff(self, runner):
+        """
+        Flow: Backoff after successive attempts
+        Expected: Doubles every attempt, capped at the maximum
+        """
+        assert [runner.backoff(attempts) for attempts in (1, 2, 3)] == [10, 20, 40]
+        assert runner.backoff(30) == 3600
+
+    async def test_unknown_kind_fails(self, session_factory, runner):
+        """
+        Flow: Run a job of a kind without handler
+        Expected: Failed attempt with the error recorded
+        """
+        job = await enqueue(session_factory, "missing")
+
+        assert await runner.run_next() is True
+
+        job = await get_job(session_factory, job.id)
+        assert job.status == JobStatus.PENDING
+        assert "No handler" in job.last_error
+
+    async def test_per_user_limit(self, session_factory, runner, calls, test_user, test_superuser):
+        """
+        Flow: A user has a running job and another pending one, another user has a pending job
+        Expected: Only the other user's job is claimed while the limit of 1 is reached
+        """
+        running = await enqueue(session_factory, "echo", {"user": 1}, user_id=test_user.id)
+        async with session_factory() as session:
+            job = await session.get(Job, running.id)
+            job.status = JobStatus.RUNNING
+            job.locked_until = datetime.now(UTC) + timedelta(minutes=5)
+            await session.commit()
+        await enqueue(session_factory, "echo", {"user": 1}, user_id=test_user.id)
+        await enqueue(session_factory, "echo", {"user": 2}, user_id=test_superuser.id)
+
+        assert await runner.run_next() is True
+        assert await runner.run_next() is False
+        assert calls == [{"user": 2}]
+
+    async def test_expired_lease_is_reclaimed(self, session_factory, runner, calls):
+        """
+        Flow: A job is running with an expired lease -> run the next job
+        Expected: Claimed again and done on its second attempt
+        """
+        job = await enqueue(session_factory, "echo")
+        async with session_factory() as session:
+            stale = await session.get(Job, job.id)
+            stale.status = JobStatus.RUNNING
+            stale.attempts = 1
+            stale.locked_until = datetime.now(UTC) - timedelta(seconds=1)
+            await session.commit()
+
+        assert await runner.run_next() is True
+
+        job = await get_job(session_factory, job.id)
+        assert job.status == JobStatus.DONE
+        assert job.attempts == 2
+
+    async def test_enqueue_deduplicates_by_key(self, session_factory, runner, calls):
+        """
+        Flow: Enqueue two jobs with the same key, run it, enqueue again
+        Expected: Same job while it is pending, a new one once it is done
+        """
+        first = await enqueue(session_factory, "echo", key="k")
+        again = await enqueue(session_factory, "echo", key="k")
+        await runner.run_next()
+        later = await enqueue(session_factory, "echo", key="k")
+
+        assert again.id == first.id
+        assert later.id != first.id
+
+
+    async def test_active_keys_are_unique(self, session_factory, runner, calls):
+        """
+        Flow: Enqueue a job with a key, then add another pending job with the same key directly
+        Expected: Rejected by the unique index on the keys of active jobs
+        """
+        first = await enqueue(session_factory, "echo", key="k")
+
+        async with session_factory() as session:
+            session.add(Job(kind="echo", key="k", status=JobStatus.PENDING, max_attempts=1, run_at=first.run_at))
+            with pytest.raises(IntegrityError):
+                await session.commit()
+
+    async def test_lease_is_renewed_while_running(self, session_factory, calls, monkeypatch):
+        """
+        Flow: Run a job that takes longer than its one second lease
+        Expected: The lease is renewed while it runs, so it never expires
+        """
+        leases = []
+
+        async def slow(session, payload):
+            await asyncio.sleep(1.5)
+            job = (await session.scalars(select(Job).where(Job.kind == "slow"))).one()
+            leases.append(job.locked_until.replace(tzinfo=UTC))
+
+        monkeypatch.setitem(job_handlers, "slow", slow)
+        runner = JobRunner(session_factory, JobSettings(workers=1, lease_seconds=1))
+        await enqueue(session_factory, "slow")
+
+        assert await runner.run_next() is True
+        assert leases[0] > datetime.now(UTC)
+
+
+    async def test_scheduled_run_is_claimed_once(self, session_factory):
+        """
+        Flow: Claim the run of a scheduled kind twice, then again once it is due
+        Expected: The first claim succeeds, the second gets the next run an interval later, the third succeeds
+        """
+        async with session_factory() as session:
+            assert await claim_scheduled_run(session, "echo", 3600) is None
+            next_run_at = await claim_scheduled_run(session, "echo", 3600)
+            assert next_run_at > datetime.now(UTC) + timedelta(minutes=59)
+
+            await session.execute(
+                update(JobSchedule).values(next_run_at=datetime.now(UTC) - timedelta(seconds=1))
+            )
+            assert await claim_scheduled_run(session, "echo", 3600) is None
+
+    async def test_schedule_survives_processes_and_restarts(self, session_factory, calls):
+        """
+        Flow: Run an hourly schedule in two runners, as in two processes or before and after a restart
+        Expected: The job is queued and run once, and the second runner waits for the next run
+        """
+        runners = [JobRunner(session_factory, JobSettings(workers=1)) for _ in range(2)]
+
+        waits = [await runner.run_schedule("echo", 3600) for runner in runners]
+        while await runners[0].run_next():
+            pass
+
+        assert calls == [{}]
+        assert waits[0] == 3600
+        assert 3500 < waits[1] <= 3600
+
+class TestBuiltinJobs:
+    """Test the built-in job kinds."""
+
+    async def test_refresh_item_latest_prices(self, session_factory, runner, test_item):
+        """
+        Flow: Drop the latest price projection -> run a refresh job
+        Expected: Projection rebuilt
+        """
+        async with session_factory() as session:
+            await session.delete(await session.get(ItemLatestPrice, test_item.id))
+            await session.commit()
+
+        await enqueue(session_factory, REFRESH_ITEM_LATEST_PRICES, {"item_ids": [test_item.id]})
+        await runner.run_next()
+
+        async with session_factory() as session:
+            latest = await session.get(ItemLatestPrice, test_item.id)
+        assert latest.purchase_price == 50000
+
+    async def test_cleanup_jobs(self, session_factory, runner, calls):
+        """
+        Flow: A job finished long ago and a recent one -> run a cleanup job
+        Expected: Only the old job is deleted
+        """
+        old = await enqueue(session_factory, "echo")
+        recent = await enqueue(session_factory, "echo")
+        await runner.run_next()
+        await runner.run_next()
+        async with session_factory() as session:
+            (await session.get(Job, old.id)).finished_at = datetime.now(UTC) - timedelta(days=30)
+            await session.commit()
+
+        await enqueue(session_factory, CLEANUP_JOBS)
+        await runner.run_next()
+
+        async with session_factory() as session:
+            remaining = set(await session.scalars(select(Job.id).where(Job.kind == "echo")))
+        assert remaining == {recent.id}
+
+    async def test_ensure_price_history_partitions_without_partitioning(self, session_factory, runner):
+        """
+        Flow: Run a partition job on a database whose price history is not partitioned
+        Expected: Job done without creating anything
+        """
+        job = await enqueue(session_factory, ENSURE_PRICE_HISTORY_PARTITIONS)
+        await runner.run_next()
+
+        async with session_factory() as session:
+            assert (await session.get(Job, job.id)).status == JobStatus.DONE
@@ -0,0 +1,190 @@
+"""Tests for spot prices and melt values."""
+import math
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+
+from analytics.fx_rates import fx_rate_cache
+from analytics.melt import TROY_OUNCE_GRAMS, melt_valuation
+from analytics.spot_prices import load_quote_files, spot_price_cache
+from models.fx_rate import upsert_fx_rates
+from settings import settings
+from utils.enums import Currency
+
+
+@pytest.fixture
+def drop_dir(tmp_path, monkeypatch):
+    """Drop quote files into a temporary directory, starting from an empty spot price cache."""
+    monkeypatch.setattr(settings.spot_prices, "drop_dir", tmp_path)
+    spot_price_cache.invalidate()
+    yield tmp_path
+    spot_price_cache.invalidate()
+
+
+@pytest_asyncio.fixture
+async def spot_prices(drop_dir, test_session):
+    """Gold quoted at 2000.00 then 3110.35 per troy ounce, silver at 31.10."""
+    (drop_dir / "2026-01-01.csv").write_text("material,date,price\ngold,2026-01-01,200000\n")
+    (drop_dir / "2026-01-02.json").write_text(
+        '[{"material": "gold", "date": "2026-01-02", "price": 311035},'
+        ' {"material": "silver", "date": "2026-01-02", "price": 3110}]'
+    )
+    assert await load_quote_files(test_session) == 3
+
+
+@pytest_asyncio.fixture
+async def euro_user_with_rates(test_session, test_user):
+    """EUR user, with USD at 1.25 per euro from 2024 and no rate for GBP."""
+    fx_rate_cache.invalidate()
+    test_user.currency = Currency.EUR
+    await upsert_fx_rates(test_session, [{"currency": Currency.USD, "date": date(2024, 1, 1), "rate": 1.25}])
+    await test_session.commit()
+    yield test_user
+    fx_rate_cache.invalidate()
+
+
+class TestMeltValuation:
+    """Test the vectorised melt value engine."""
+
+    def test_melt_valuation(self):
+        """
+        Flow: Value gold, silver, an unweighed gold item and an unquoted bronze item
+        Expected: Item and material values, NaN for items that cannot be valued
+        """
+        valuation = melt_valuation(
+            ["gold", "silver", "gold", "bronze"], [TROY_OUNCE_GRAMS, 15.55, None, 5.0], {"gold": 200000, "silver": 3000}
+        )
+
+        assert valuation.item_values[0] == pytest.approx(200000)
+        assert valuation.item_values[1] == pytest.approx(1500, rel=1e-3)
+        assert math.isnan(valuation.item_values[2]) and math.isnan(valuation.item_values[3])
+        assert valuation.materials.tolist() == ["bronze", "gold", "silver"]
+        assert valuation.item_count.tolist() == [1, 2, 1]
+        assert valuation.melt_value.tolist() == pytest.approx([0, 200000, 1500], rel=1e-3)
+
+    def test_empty(self):
+        """
+        Flow: Value no items
+        Expected: Empty arrays
+        """
+        valuation = melt_valuation([], [], {"gold": 200000})
+
+        assert len(valuation.item_values) == 0 and len(valuation.materials) == 0
+
+
+class TestSpotPrices:
+    """Test loading quote files and the spot price cache."""
+
+    async def test_load_quote_files(self, drop_dir, spot_prices):
+        """
+        Flow: Load a CSV and a JSON quote file
+        Expected: Both moved to the loaded directory
+        """
+        assert sorted(path.name for path in (drop_dir / "loaded").iterdir()) == ["2026-01-01.csv", "2026-01-02.json"]
+        assert not any(path.is_file() for path in drop_dir.iterdir())
+
+    async def test_invalid_file_is_set_aside(self, drop_dir, test_session):
+        """
+        Flow: Drop a file with an unknown material
+        Expected: Nothing loaded, file moved to the failed directory
+        """
+        (drop_dir / "bad.csv").write_text("material,date,price\nunobtainium,2026-01-01,100\n")
+
+        assert await load_quote_files(test_session) == 0
+        assert (drop_dir / "failed" / "bad.csv").exists()
+
+    async def test_loading_invalidates_cache(self, drop_dir, spot_prices, test_session):
+        """
+        Flow: Read the cached spot prices -> load a newer gold quote -> read them again
+        Expected: Newer quote returned at once
+        """
+        assert (await spot_price_cache.get(test_session))["gold"][0] == 311035
+
+        (drop_dir / "2026-01-03.csv").write_text("material,date,price\ngold,2026-01-03,400000\n")
+        await load_quote_files(test_session)
+
+        assert (await spot_price_cache.get(test_session))["gold"][0] == 400000
+
+    async def test_same_day_quote_is_replaced(self, drop_dir, spot_prices, test_session):
+        """
+        Flow: Load a second file quoting gold on an already quoted day
+        Expected: Latest load wins
+        """
+        (drop_dir / "2026-01-02-fix.csv").write_text("material,date,price\ngold,2026-01-02,300000\n")
+        await load_quote_files(test_session)
+
+        assert (await spot_price_cache.get(test_session))["gold"][0] == 300000
+
+
+class TestPortfolioMelt:
+    """Test GET /api/portfolio/melt."""
+
+    def test_portfolio_melt(self, authenticated_client, test_item, spot_prices):
+        """
+        Flow: GET /api/portfolio/melt with a 10.5 g gold item and gold quoted at 3110.35/oz
+        Expected: Melt value of 10.5 g at the latest gold quote
+        """
+        authenticated_client.post(
+            "/api/items/",
+            json={"name": "Unweighed", "year": "2000", "material": "silver", "purchase_price": 100},
+        )
+
+        response = authenticated_client.get("/api/portfolio/melt")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        expected = round(10.5 * 311035 / TROY_OUNCE_GRAMS)
+        assert data["melt_value"] == expected
+        assert data["valued_count"] == 1
+        assert [item["melt_value"] for item in data["items"]] == [expected, None]
+        gold, silver = data["materials"]
+        assert (gold["material"], gold["spot_price"], gold["spot_date"]) == ("gold", 311035, "2026-01-02")
+        assert (silver["item_count"], silver["melt_value"], silver["weight"]) == (1, 0, 0)
+
+    def test_without_spot_prices(self, authenticated_client, test_item, drop_dir):
+        """
+        Flow: GET /api/portfolio/melt before any quote is loaded
+        Expected: No item valued
+        """
+        response = authenticated_client.get("/api/portfolio/melt")
+
+        data = response.json()
+        assert data["melt_value"] == 0
+        assert data["materials"][0]["spot_price"] is None
+
+    async def test_spot_prices_converted_to_display_currency(
+        self, authenticated_client, test_item, drop_dir, euro_user_with_rates, test_session
+    ):
+        """
+        Flow: EUR user with a 10.5 g gold item and an ounce of silver, gold quoted in USD and
+              silver in GBP, which has no FX rate -> GET /api/portfolio/melt
+        Expected: Gold valued in EUR and totalled, silver valued in GBP and left out of the totals
+        """
+        authenticated_client.post(
+            "/api/items/",
+            json={
+                "name": "Britannia",
+                "year": "2020",
+                "material": "silver",
+                "weight": TROY_OUNCE_GRAMS,
+                "purchase_price": 3000,
+            },
+        )
+        (drop_dir / "2026-01-02.csv").write_text(
+            "material,date,price,currency\ngold,2026-01-02,311035,USD\nsilver,2026-01-02,2500,GBP\n"
+        )
+        await load_quote_files(test_session)
+
+        data = authenticated_client.get("/api/portfolio/melt").json()
+
+        gold_value = round(10.5 * 248828 / TROY_OUNCE_GRAMS)
+        assert (data["currency"], data["melt_value"], data["valued_count"]) == ("EUR", gold_value, 1)
+        materials = {melt["material"]: melt for melt in data["materials"]}
+        assert (materials["gold"]["spot_price"], materials["gold"]["currency"]) == (248828, "EUR")
+        assert (materials["silver"]["spot_price"], materials["silver"]["currency"]) == (2500, "GBP")
+        assert {item["name"]: (item["melt_value"], item["currency"]) for item in data["items"]} == {
+            "Britannia": (2500, "GBP"),
+            test_item.name: (gold_value, "EUR"),
+        }
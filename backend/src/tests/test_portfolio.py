@@ -0,0 +1,113 @@
+"""Tests for the portfolio endpoints."""
+import pytest
+from fastapi import status
+from models import Item, ItemPriceHistory
+from models.item_latest_price import refresh_item_latest_prices
+from utils.enums import PriceType
+
+
+class TestPortfolioSummary:
+    """Test valuation of a user's items computed in the database."""
+
+    def create_item(self, client, name: str, material: str, purchase_price: int) -> str:
+        response = client.post(
+            "/api/items/",
+            json={"name": name, "year": "2020", "material": material, "purchase_price": purchase_price},
+        )
+        return response.json()["id"]
+
+    def test_summary_empty_portfolio(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/portfolio/summary without any items
+        Expected: 200 OK with zero totals and empty breakdowns
+        """
+        response = authenticated_client.get("/api/portfolio/summary")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "item_count": 0,
+            "purchase_cost": 0,
+            "market_value": 0,
+            "unrealised_gain": 0,
+            "currency": "USD",
+            "collections": [],
+            "materials": [],
+            "unconverted": [],
+        }
+
+    def test_summary_uses_latest_current_price(self, authenticated_client, test_user):
+        """
+        Flow: Create gold and silver items, revalue some of them, put one into a collection
+        Expected: Totals use the latest current price per item, falling back to the purchase
+                  price, and are broken down per collection and per material
+        """
+        gold_id = self.create_item(authenticated_client, "Sovereign", "gold", 30000)
+        silver_id = self.create_item(authenticated_client, "Morgan", "silver", 4000)
+        self.create_item(authenticated_client, "Peace", "silver", 3000)
+
+        # Older revaluation is superseded by the later one regardless of insertion order
+        authenticated_client.post(f"/api/items/{gold_id}/price-history", json={"price": 45000, "date": "2024-06-01"})
+        authenticated_client.post(f"/api/items/{gold_id}/price-history", json={"price": 35000, "date": "2024-01-01"})
+        authenticated_client.post(f"/api/items/{silver_id}/price-history", json={"price": 3500, "date": "2024-03-01"})
+
+        collection = authenticated_client.post("/api/collections/", json={"name": "Gold"}).json()
+        authenticated_client.post(f"/api/collections/{collection['id']}/items", json={"item_id": gold_id})
+
+        response = authenticated_client.get("/api/portfolio/summary")
+        assert response.status_code == status.HTTP_200_OK
+        summary = response.json()
+
+        assert summary["item_count"] == 3
+        assert summary["purchase_cost"] == 37000
+        assert summary["market_value"] == 45000 + 3500 + 3000
+        assert summary["unrealised_gain"] == 51500 - 37000
+
+        assert summary["collections"] == [
+            {
+                "collection_id": collection["id"],
+                "collection_name": "Gold",
+                "item_count": 1,
+                "purchase_cost": 30000,
+                "market_value": 45000,
+                "unrealised_gain": 15000,
+            },
+            {
+                "collection_id": None,
+                "collection_name": None,
+                "item_count": 2,
+                "purchase_cost": 7000,
+                "market_value": 6500,
+                "unrealised_gain": -500,
+            },
+        ]
+        assert [(row["material"], row["item_count"], row["market_value"]) for row in summary["materials"]] == [
+            ("gold", 1, 45000),
+            ("silver", 2, 6500),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_summary_excludes_other_users(self, authenticated_client, test_item, test_superuser, test_session):
+        """
+        Flow: Items owned by the test user and by another user -> GET /api/portfolio/summary
+        Expected: Only the test user's item is valued
+        """
+        other_item = Item(name="Other Coin", year="2024", material="gold", user_id=test_superuser.id)
+        test_session.add(other_item)
+        await test_session.flush()
+        test_session.add(ItemPriceHistory(item_id=other_item.id, price=99999, type=PriceType.PURCHASE))
+        await refresh_item_latest_prices(test_session, [other_item.id])
+        await test_session.commit()
+
+        response = authenticated_client.get("/api/portfolio/summary")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["item_count"] == 1
+        assert response.json()["purchase_cost"] == 50000
+
+    def test_summary_unauthenticated(self, client):
+        """
+        Flow: GET /api/portfolio/summary without authentication
+        Expected: 401 Unauthorized
+        """
+        response = client.get("/api/portfolio/summary")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
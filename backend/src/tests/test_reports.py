@@ -0,0 +1,236 @@
+"""Tests for report endpoints."""
+import csv
+import io
+from datetime import date
+
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from jobs import JobRunner
+from jobs.runner import job_handlers
+from jobs.tasks import RENDER_REPORT
+from models.fx_rate import upsert_fx_rates
+from reports.jobs import report_renderer
+from settings import JobSettings, settings
+from utils.enums import Currency, JobStatus, SubscriptionTier
+
+
+def read_csv(response) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+class TestReportExport:
+    """Test the streaming CSV export of GET /api/reports/export."""
+
+    def test_export_requires_paid_tier(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/reports/export as a Free tier user
+        Expected: 403 Forbidden
+        """
+        response = authenticated_client.get("/api/reports/export")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "This feature requires the Advanced or Pro tier"
+
+    def test_export_price_history(self, authenticated_client, test_user, test_item, test_collection):
+        """
+        Flow: Revalue an item, add a second one to a collection -> GET /api/reports/export
+        Expected: CSV attachment with one row per price entry, items in name order, prices by date
+        """
+        test_user.tier = SubscriptionTier.ADVANCED
+        authenticated_client.post(f"/api/items/{test_item.id}/price-history", json={"price": 60000, "date": "2099-03-01"})
+        other = authenticated_client.post(
+            "/api/items/",
+            json={"name": "A Coin", "year": "1900", "material": "silver", "purchase_price": 700, "purchase_date": "2020-01-01"},
+        ).json()
+        authenticated_client.post(f"/api/collections/{test_collection.id}/items", json={"item_id": other["id"]})
+
+        response = authenticated_client.get("/api/reports/export")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"].startswith("attachment;")
+        rows = read_csv(response)
+        assert [(row["item_name"], row["price_type"], row["price"]) for row in rows] == [
+            ("A Coin", "purchase", "700"),
+            ("Test Coin", "purchase", "50000"),
+            ("Test Coin", "current", "60000"),
+        ]
+        assert rows[0]["collection"] == test_collection.name
+        assert rows[0]["material"] == "silver"
+        assert rows[1]["collection"] == ""
+
+    def test_export_escapes_formulas(self, authenticated_client, test_user, test_collection):
+        """
+        Flow: Export an item whose name and collection name start with formula characters
+        Expected: Those cells are prefixed with a quote, other cells are unchanged
+        """
+        test_user.tier = SubscriptionTier.ADVANCED
+        authenticated_client.put(f"/api/collections/{test_collection.id}", json={"name": "@SUM(A1:A9)"})
+        item = authenticated_client.post(
+            "/api/items/",
+            json={"name": '=HYPERLINK("http://example.com")', "year": "1900", "material": "silver", "purchase_price": 700},
+        ).json()
+        authenticated_client.post(f"/api/collections/{test_collection.id}/items", json={"item_id": item["id"]})
+
+        rows = read_csv(authenticated_client.get("/api/reports/export"))
+
+        assert (rows[0]["item_name"], rows[0]["collection"]) == ("'=HYPERLINK(\"http://example.com\")", "'@SUM(A1:A9)")
+        assert (rows[0]["year"], rows[0]["price"]) == ("1900", "700")
+
+    def test_export_filters(self, authenticated_client, test_user, test_item, test_collection):
+        """
+        Flow: GET /api/reports/export filtered by date range, by collection, by a foreign collection
+        Expected: Only matching rows; 404 for a collection the user does not own
+        """
+        test_user.tier = SubscriptionTier.PRO
+        url = f"/api/items/{test_item.id}/price-history"
+        for price, day in [(1, "2024-01-01"), (2, "2024-02-01"), (3, "2024-03-01")]:
+            authenticated_client.post(url, json={"price": price, "date": day})
+
+        response = authenticated_client.get(
+            "/api/reports/export", params={"date_from": "2024-02-01", "date_to": "2024-03-01"}
+        )
+        assert [row["price"] for row in read_csv(response)] == ["2", "3"]
+
+        response = authenticated_client.get("/api/reports/export", params={"collection_id": test_collection.id})
+        assert response.status_code == status.HTTP_200_OK
+        assert read_csv(response) == []
+        assert response.text.startswith("item_id,item_name,")
+
+        response = authenticated_client.get("/api/reports/export", params={"collection_id": "missing"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.fixture
+def report_cache(tmp_path, monkeypatch):
+    """Render reports into a temporary cache directory and stop the worker processes afterwards."""
+    monkeypatch.setattr(settings.reports, "cache_dir", tmp_path)
+    yield tmp_path
+    report_renderer.shutdown()
+
+
+@pytest.fixture
+def report_runner(test_db_engine):
+    """Job runner to render the queued reports with, as the runner of the API is off in tests."""
+    return JobRunner(async_sessionmaker(test_db_engine, expire_on_commit=False), JobSettings(workers=1))
+
+
+async def wait_for_report(client, runner, job_id: str) -> dict:
+    while await runner.run_next():
+        pass
+    return client.get(f"/api/reports/{job_id}").json()
+
+
+class TestPdfReports:
+    """Test PDF report jobs of POST /api/reports and GET /api/reports/{job_id}."""
+
+    def test_report_requires_paid_tier(self, authenticated_client, test_user, report_cache):
+        """
+        Flow: POST /api/reports as a Free tier user
+        Expected: 403 Forbidden
+        """
+        response = authenticated_client.post("/api/reports/", json={})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_render_and_download_report(
+        self, authenticated_client, test_user, test_item, report_cache, report_runner
+    ):
+        """
+        Flow: POST /api/reports -> download before it runs -> run the job -> GET its download URL
+        Expected: 202 with a pending job and 409 until it runs, then the download is a PDF served
+                  from the cache
+        """
+        test_user.tier = SubscriptionTier.ADVANCED
+
+        response = authenticated_client.post("/api/reports/", json={})
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()["id"]
+        assert response.json()["status"] == JobStatus.PENDING
+        early = authenticated_client.get(f"/api/reports/{job_id}/download")
+        assert early.status_code == status.HTTP_409_CONFLICT
+        job = await wait_for_report(authenticated_client, report_runner, job_id)
+        assert job["status"] == JobStatus.DONE, job
+        assert job["download_url"] == f"/api/reports/{job_id}/download"
+
+        download = authenticated_client.get(job["download_url"])
+        assert download.status_code == status.HTTP_200_OK
+        assert download.headers["content-type"] == "application/pdf"
+        assert download.content.startswith(b"%PDF")
+        assert (report_cache / str(test_user.id) / f"{job_id}.pdf").exists()
+
+        cached = authenticated_client.post("/api/reports/", json={})
+        assert cached.json() == job
+
+    async def test_report_deduplication(self, authenticated_client, test_user, test_item, report_cache, report_runner):
+        """
+        Flow: POST the same report twice, with other parameters, after changing an item
+        Expected: Same job for the same parameters and data, a new job otherwise
+        """
+        test_user.tier = SubscriptionTier.PRO
+
+        first = authenticated_client.post("/api/reports/", json={"date_from": "2000-01-01"}).json()
+        again = authenticated_client.post("/api/reports/", json={"date_from": "2000-01-01"}).json()
+        other = authenticated_client.post("/api/reports/", json={"date_from": "2001-01-01"}).json()
+        authenticated_client.patch(f"/api/items/{test_item.id}", json={"name": "Renamed Coin"})
+        changed = authenticated_client.post("/api/reports/", json={"date_from": "2000-01-01"}).json()
+
+        assert again["id"] == first["id"]
+        assert len({first["id"], other["id"], changed["id"]}) == 3
+        for job_id in (first["id"], other["id"], changed["id"]):
+            assert (await wait_for_report(authenticated_client, report_runner, job_id))["status"] == JobStatus.DONE
+
+    async def test_report_renders_again_after_rate_load(
+        self, authenticated_client, test_user, test_item, report_cache, report_runner, test_session
+    ):
+        """
+        Flow: POST a report -> load FX rates -> POST the same report
+        Expected: A new job, since its prices are converted at the new rates
+        """
+        test_user.tier = SubscriptionTier.ADVANCED
+
+        first = authenticated_client.post("/api/reports/", json={}).json()
+        await upsert_fx_rates(test_session, [{"currency": Currency.GBP, "date": date(2024, 1, 1), "rate": 0.85}])
+        await test_session.commit()
+        after_load = authenticated_client.post("/api/reports/", json={}).json()
+
+        assert after_load["id"] != first["id"]
+        for job_id in (first["id"], after_load["id"]):
+            assert (await wait_for_report(authenticated_client, report_runner, job_id))["status"] == JobStatus.DONE
+
+    async def test_failed_report(self, authenticated_client, test_user, report_cache, report_runner, monkeypatch):
+        """
+        Flow: POST a report whose rendering fails on its only attempt -> GET it -> POST it again
+        Expected: Failed with the error, then queued again as a new job
+        """
+        test_user.tier = SubscriptionTier.ADVANCED
+
+        async def broken(session, payload):
+            raise RuntimeError("out of paper")
+
+        monkeypatch.setitem(job_handlers, RENDER_REPORT, broken)
+        monkeypatch.setattr(settings.jobs, "max_attempts", 1)
+
+        job_id = authenticated_client.post("/api/reports/", json={}).json()["id"]
+        failed = await wait_for_report(authenticated_client, report_runner, job_id)
+        again = authenticated_client.post("/api/reports/", json={}).json()
+
+        assert (failed["status"], failed["error"]) == (JobStatus.FAILED, "RuntimeError: out of paper")
+        assert (again["id"], again["status"]) == (job_id, JobStatus.PENDING)
+
+    def test_unknown_report(self, authenticated_client, test_user, report_cache):
+        """
+        Flow: GET an unknown job, its download, a malformed job ID, a report of a foreign collection
+        Expected: 404 Not Found, 422 for the malformed ID
+        """
+        test_user.tier = SubscriptionTier.ADVANCED
+        job_id = "0" * 32
+
+        assert authenticated_client.get(f"/api/reports/{job_id}").status_code == status.HTTP_404_NOT_FOUND
+        assert authenticated_client.get(f"/api/reports/{job_id}/download").status_code == status.HTTP_404_NOT_FOUND
+        assert authenticated_client.get("/api/reports/nope").status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response = authenticated_client.post("/api/reports/", json={"collection_id": "missing"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,81 @@
+"""Tests for the search endpoint."""
+from fastapi import status
+
+
+class TestSearchEndpoints:
+    """Test searching a user's items, collections and dealers in one call."""
+
+    def test_search_matches_all_entity_types(self, authenticated_client, test_user, test_session):
+        """
+        Flow: Create item, collection and dealer sharing a word -> GET /api/search/?q=morgan
+        Expected: 200 OK with the match in every group and non-matching items excluded
+        """
+        authenticated_client.post(
+            "/api/items/",
+            json={"name": "Morgan Dollar", "year": "1921", "material": "silver", "purchase_price": 4000},
+        )
+        authenticated_client.post(
+            "/api/items/",
+            json={"name": "Peace Dollar", "year": "1922", "material": "silver", "purchase_price": 3500},
+        )
+        authenticated_client.post("/api/collections/", json={"name": "Morgan Set"})
+        authenticated_client.post("/api/dealers/", json={"name": "Morgan Coins Ltd"})
+
+        response = authenticated_client.get("/api/search/", params={"q": "morgan"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [item["name"] for item in data["items"]] == ["Morgan Dollar"]
+        assert [collection["name"] for collection in data["collections"]] == ["Morgan Set"]
+        assert [dealer["name"] for dealer in data["dealers"]] == ["Morgan Coins Ltd"]
+
+    def test_search_item_description_and_prefix(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/search/?q=purpo (prefix of a word in the test item description)
+        Expected: 200 OK with the test item found through its description
+        """
+        response = authenticated_client.get("/api/search/", params={"q": "purpo"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.json()["items"]] == [str(test_item.id)]
+
+    def test_search_reflects_updates(self, authenticated_client, test_user, test_item):
+        """
+        Flow: Rename the test item and replace its description -> search for old and new names
+        Expected: Only the new name matches
+        """
+        response = authenticated_client.patch(
+            f"/api/items/{test_item.id}", json={"name": "Krugerrand", "description": "South African bullion"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        assert authenticated_client.get("/api/search/", params={"q": "krugerrand"}).json()["items"]
+        assert not authenticated_client.get("/api/search/", params={"q": "test coin"}).json()["items"]
+
+    def test_search_user_isolation(self, another_user_client, another_user, test_item):
+        """
+        Flow: Another user searches for the test user's item name
+        Expected: 200 OK with no results
+        """
+        response = another_user_client.get("/api/search/", params={"q": "test"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"items": [], "collections": [], "dealers": []}
+
+    def test_search_special_characters(self, authenticated_client, test_user, test_item):
+        """
+        Flow: GET /api/search/ with FTS syntax characters in the query
+        Expected: 200 OK, the query is treated as plain text
+        """
+        response = authenticated_client.get("/api/search/", params={"q": '"coin" OR * -'})
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_search_requires_query(self, authenticated_client, test_user):
+        """
+        Flow: GET /api/search/ without q
+        Expected: 422 Unprocessable Entity
+        """
+        response = authenticated_client.get("/api/search/")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,77 @@
+"""Tests for the fast row-to-JSON serialisation of read schemas."""
+import json
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from schemas.collection import CollectionWithItems
+from schemas.item import ItemReadWithPurchasePrice
+from schemas.serialization import collection_with_items_serializer, item_read_with_purchase_price_serializer
+from utils.enums import Currency, Material
+
+
+def make_item_row(**overrides) -> SimpleNamespace:
+    values = {
+        "id": "6f1c2a8e-1b7d-4a55-9a43-0c1f3e5b7d21",
+        "name": "Morgan Dollar",
+        "year": "1921",
+        "description": None,
+        "images": None,
+        "material": Material.SILVER,
+        "weight": 26.73,
+        "user_id": 1,
+        "collection_id": None,
+        "purchase_price": 4000,
+        "purchase_date": date(2024, 1, 15),
+        "purchase_currency": Currency.USD,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestRowSerializer:
+    """Test that the fast path produces the same JSON as the pydantic schemas."""
+
+    def test_item_rows_match_schema_output(self):
+        """
+        Flow: Encode item rows with the serializer and with ItemReadWithPurchasePrice
+        Expected: Identical JSON documents
+        """
+        rows = [make_item_row(), make_item_row(name="Peace Dollar", weight=None, description="Worn")]
+
+        fast = json.loads(item_read_with_purchase_price_serializer.dumps_many(rows))
+        validated = [json.loads(ItemReadWithPurchasePrice.model_validate(row).model_dump_json()) for row in rows]
+
+        assert fast == validated
+
+    def test_nested_items_and_utc_datetimes_match_schema_output(self):
+        """
+        Flow: Encode a collection with items and timezone-aware timestamps
+        Expected: Identical JSON text to CollectionWithItems, including the UTC "Z" suffix
+        """
+        timestamp = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        collection = SimpleNamespace(
+            id="0b5e8f47-3c62-4d8e-9f61-2a7c4b9d1e03",
+            name="Dollars",
+            description=None,
+            user_id=1,
+            share_token=None,
+            created_at=timestamp,
+            updated_at=timestamp,
+            items=[make_item_row(collection_id="0b5e8f47-3c62-4d8e-9f61-2a7c4b9d1e03")],
+        )
+
+        fast = collection_with_items_serializer.dumps(collection)
+        validated = CollectionWithItems.model_validate(collection).model_dump_json()
+
+        assert json.loads(fast) == json.loads(validated)
+        assert b'"2024-05-01T12:30:00Z"' in fast
+
+    def test_ndjson_lines(self):
+        """
+        Flow: Encode two rows as NDJSON
+        Expected: Two newline-terminated JSON objects
+        """
+        lines = item_read_with_purchase_price_serializer.dumps_lines([make_item_row(), make_item_row()])
+
+        assert lines.endswith(b"\n")
+        assert len(lines.splitlines()) == 2
@@ -0,0 +1,414 @@
+"""Tests for the in-memory and HTTP caching and the disk snapshots of shared collections."""
+import asyncio
+import os
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+import pytest_asyncio
+from fastapi import status
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependency.shared_collection import shared_collection_cache
+from models import Collection, Item
+from settings import settings
+from sharing import snapshots
+from sharing.snapshots import reconcile_shared_collection_snapshots
+from utils.cache import AsyncLRUCache
+from utils.encoding import negotiate_encoding
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test from an empty shared collection cache."""
+    shared_collection_cache.clear()
+    yield
+    shared_collection_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def shared_with_items(test_session, test_public_collection_with_share) -> tuple[Collection, str]:
+    """The shared collection with enough items to compress, last updated on 2026-01-01."""
+    collection, share_token = test_public_collection_with_share
+    test_session.add_all(
+        Item(name=f"Coin {number}", year="2024", material="silver", user_id=collection.user_id, collection_id=collection.id)
+        for number in range(20)
+    )
+    await test_session.execute(
+        update(Collection).where(Collection.id == collection.id).values(updated_at=datetime(2026, 1, 1, tzinfo=UTC))
+    )
+    await test_session.commit()
+    return collection, share_token
+
+
+class TestAsyncLRUCache:
+    """Test the LRU cache with TTL and single-flight loads."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self):
+        """
+        Flow: Read an uncached key from five coroutines at once
+        Expected: The value is loaded once and every read gets it
+        """
+        cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+        loads = 0
+
+        async def load():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        values = await asyncio.gather(*(cache.get("key", load) for _ in range(5)))
+
+        assert values == ["value"] * 5
+        assert loads == 1
+        stats = cache.stats()
+        assert (stats.misses, stats.coalesced, stats.hits) == (1, 4, 0)
+        assert stats.hit_rate == pytest.approx(0.8)
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_retried_by_waiters(self):
+        """
+        Flow: Read a key concurrently while the first load fails
+        Expected: The first read raises, the waiting read loads the value itself
+        """
+        cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+        attempts = 0
+
+        async def load():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            if attempts == 1:
+                raise RuntimeError("database unavailable")
+            return "value"
+
+        first, second = await asyncio.gather(cache.get("key", load), cache.get("key", load), return_exceptions=True)
+
+        assert isinstance(first, RuntimeError)
+        assert second == "value"
+        assert await cache.get("key", load) == "value"
+        assert attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_expiry_eviction_and_none(self):
+        """
+        Flow: Read expired entries, more keys than fit, and a key that loads None
+        Expected: Expired entries reload, the least recently used entry is evicted, None is not cached
+        """
+        expired = AsyncLRUCache(max_entries=10, ttl_seconds=0)
+        await expired.get("key", lambda: asyncio.sleep(0, "value"))
+        await expired.get("key", lambda: asyncio.sleep(0, "value"))
+        assert expired.stats().misses == 2
+
+        cache = AsyncLRUCache(max_entries=2, ttl_seconds=60)
+        for key in ("a", "b", "a", "c"):
+            await cache.get(key, lambda key=key: asyncio.sleep(0, key))
+        await cache.get("missing", lambda: asyncio.sleep(0))
+
+        assert list(cache._entries) == ["a", "c"]
+        assert cache.stats().evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load(self):
+        """
+        Flow: Invalidate a tag while its entry is loading, then invalidate a cached entry by tag
+        Expected: The value loaded before the invalidation is returned but not cached; tagged entries are dropped
+        """
+        cache = AsyncLRUCache(max_entries=10, ttl_seconds=60, tags=lambda value: (value["collection"],))
+
+        async def load():
+            cache.invalidate_tag("c1")
+            return {"collection": "c1"}
+
+        await cache.get("key", load)
+        assert cache.stats().size == 0
+
+        await cache.get("key", lambda: asyncio.sleep(0, {"collection": "c1"}))
+        cache.invalidate_tag("c2")
+        assert cache.stats().size == 1
+        cache.invalidate_tag("c1")
+        assert cache.stats().size == 0
+        assert cache.stats().invalidations == 1
+
+
+class TestSharedCollectionCache:
+    """Test caching of GET /api/collections/shared/{share_token}."""
+
+    def test_repeated_reads_are_cached(self, authenticated_client, test_public_collection_with_share):
+        """
+        Flow: GET a shared collection twice, then an unknown token twice
+        Expected: The second read is a cache hit; unknown tokens return 404 and are not cached
+        """
+        _, share_token = test_public_collection_with_share
+        before = shared_collection_cache.stats()
+
+        first = authenticated_client.get(f"/api/collections/shared/{share_token}")
+        second = authenticated_client.get(f"/api/collections/shared/{share_token}")
+        for _ in range(2):
+            assert authenticated_client.get("/api/collections/shared/unknown").status_code == status.HTTP_404_NOT_FOUND
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert first.json() == second.json()
+        stats = shared_collection_cache.stats()
+        assert (stats.hits - before.hits, stats.misses - before.misses, stats.size) == (1, 3, 1)
+
+    def test_collection_changes_invalidate(self, authenticated_client, test_public_collection_with_share, test_item):
+        """
+        Flow: Cache a shared collection, then rename it, add an item, rename the item, remove it and revoke the link
+        Expected: Every read after a change reflects it
+        """
+        collection, share_token = test_public_collection_with_share
+        url = f"/api/collections/shared/{share_token}"
+        assert authenticated_client.get(url).json()["items"] == []
+
+        authenticated_client.put(f"/api/collections/{collection.id}", json={"name": "Renamed"})
+        assert authenticated_client.get(url).json()["name"] == "Renamed"
+
+        authenticated_client.post(f"/api/collections/{collection.id}/items", json={"item_id": test_item.id})
+        assert [item["id"] for item in authenticated_client.get(url).json()["items"]] == [test_item.id]
+
+        authenticated_client.patch(f"/api/items/{test_item.id}", json={"name": "Renamed Coin"})
+        assert authenticated_client.get(url).json()["items"][0]["name"] == "Renamed Coin"
+
+        authenticated_client.request(
+            "DELETE", f"/api/collections/{collection.id}/items", json={"item_id": test_item.id}
+        )
+        assert authenticated_client.get(url).json()["items"] == []
+
+        authenticated_client.delete(f"/api/collections/{collection.id}/share")
+        assert authenticated_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_regenerate_invalidates_old_token(self, authenticated_client, test_public_collection_with_share):
+        """
+        Flow: Cache a shared collection, then regenerate its share token
+        Expected: The old token returns 404 and the new one the collection
+        """
+        collection, share_token = test_public_collection_with_share
+        assert authenticated_client.get(f"/api/collections/shared/{share_token}").status_code == status.HTTP_200_OK
+
+        new_token = authenticated_client.put(f"/api/collections/{collection.id}/share").json()["share_token"]
+
+        assert authenticated_client.get(f"/api/collections/shared/{share_token}").status_code == status.HTTP_404_NOT_FOUND
+        assert authenticated_client.get(f"/api/collections/shared/{new_token}").status_code == status.HTTP_200_OK
+
+    def test_stats(self, superuser_client):
+        """
+        Flow: GET /api/collections/shared-cache/stats as a superuser
+        Expected: 200 with the cache counters
+        """
+        response = superuser_client.get("/api/collections/shared-cache/stats")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()) == {
+            "hits",
+            "misses",
+            "coalesced",
+            "evictions",
+            "invalidations",
+            "size",
+            "hit_rate",
+        }
+
+
+class TestSharedCollectionHttpCaching:
+    """Test the HTTP caching headers and encodings of GET /api/collections/shared/{share_token}."""
+
+    def test_negotiate_encoding(self):
+        """
+        Flow: Negotiate codings from various Accept-Encoding headers
+        Expected: The highest q-value wins, brotli on ties, q=0 and unavailable codings are skipped
+        """
+        available = {"br", "gzip"}
+
+        assert negotiate_encoding(None, available) is None
+        assert negotiate_encoding("gzip, deflate, br, zstd", available) == "br"
+        assert negotiate_encoding("br;q=0.5, gzip", available) == "gzip"
+        assert negotiate_encoding("br;q=0, *", available) == "gzip"
+        assert negotiate_encoding("br", {"gzip"}) is None
+        assert negotiate_encoding("identity", available) is None
+
+    def test_headers_and_encodings(self, authenticated_client, shared_with_items):
+        """
+        Flow: GET a shared collection accepting brotli, gzip and no coding
+        Expected: The same JSON in each coding, with a strong ETag per coding and public caching headers
+        """
+        _, share_token = shared_with_items
+        url = f"/api/collections/shared/{share_token}"
+
+        responses = {
+            encoding: authenticated_client.get(url, headers={"Accept-Encoding": encoding})
+            for encoding in ("br", "gzip", "identity")
+        }
+
+        assert responses["br"].headers["content-encoding"] == "br"
+        assert responses["gzip"].headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in responses["identity"].headers
+        assert responses["br"].json() == responses["gzip"].json() == responses["identity"].json()
+        assert len(responses["identity"].json()["items"]) == 20
+
+        etags = {response.headers["etag"] for response in responses.values()}
+        assert len(etags) == 3 and not any(etag.startswith("W/") for etag in etags)
+        for response in responses.values():
+            assert response.headers["last-modified"] == "Thu, 01 Jan 2026 00:00:00 GMT"
+            assert response.headers["vary"] == "Accept-Encoding"
+            assert response.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=600"
+
+    def test_conditional_requests(self, authenticated_client, shared_with_items):
+        """
+        Flow: Revalidate a shared collection with If-None-Match and If-Modified-Since, then remove an item and revalidate
+        Expected: 304 while unchanged; 200 with a new ETag and a later Last-Modified once an item is removed
+        """
+        collection, share_token = shared_with_items
+        url = f"/api/collections/shared/{share_token}"
+        response = authenticated_client.get(url)
+        etag = response.headers["etag"]
+
+        not_modified = authenticated_client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.headers["etag"] == etag
+        since = {"If-Modified-Since": response.headers["last-modified"]}
+        assert authenticated_client.get(url, headers=since).status_code == status.HTTP_304_NOT_MODIFIED
+        assert authenticated_client.get(url, headers={"If-None-Match": '"other"'}).status_code == status.HTTP_200_OK
+
+        item_id = response.json()["items"][0]["id"]
+        authenticated_client.request("DELETE", f"/api/collections/{collection.id}/items", json={"item_id": item_id})
+
+        changed = authenticated_client.get(url, headers={"If-None-Match": etag, **since})
+        assert changed.status_code == status.HTTP_200_OK
+        assert changed.headers["etag"] != etag
+        assert changed.headers["last-modified"] != response.headers["last-modified"]
+
+
+class TestSharedCollectionSnapshots:
+    """Test the snapshots of shared collections written to disk."""
+
+    def test_served_without_queries(self, authenticated_client, test_db_engine, test_collection, snapshot_dir):
+        """
+        Flow: Share a collection, then GET it by its token while counting database queries
+        Expected: The token links to a content-addressed snapshot, served with no query
+        """
+        share_token = authenticated_client.post(f"/api/collections/{test_collection.id}/share").json()["share_token"]
+        link = snapshot_dir / "tokens" / f"{share_token}.json"
+        assert link.is_symlink()
+        assert link.resolve().parent.parent == snapshot_dir / "objects"
+
+        queries = []
+        listener = lambda *args: queries.append(args[2])  # noqa: E731
+        event.listen(test_db_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_client.get(f"/api/collections/shared/{share_token}")
+        finally:
+            event.remove(test_db_engine.sync_engine, "before_cursor_execute", listener)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == test_collection.name
+        assert response.headers["etag"].startswith(f'"{link.resolve().stem}')
+        assert queries == []
+
+    def test_changes_republish(self, authenticated_client, test_collection, snapshot_dir, monkeypatch):
+        """
+        Flow: Share a collection with HTML snapshots enabled, rename it, then revoke its link
+        Expected: The rename writes new objects and repoints the links; revoking unlinks the token
+        """
+        monkeypatch.setattr(settings.shared_collections, "snapshot_html", True)
+        share_token = authenticated_client.post(f"/api/collections/{test_collection.id}/share").json()["share_token"]
+        link = snapshot_dir / "tokens" / f"{share_token}.json"
+        first_object = link.resolve()
+
+        authenticated_client.put(f"/api/collections/{test_collection.id}", json={"name": "Coins <&> Medals"})
+
+        assert link.resolve() != first_object and first_object.exists()
+        assert authenticated_client.get(f"/api/collections/shared/{share_token}").json()["name"] == "Coins <&> Medals"
+        html = (snapshot_dir / "tokens" / f"{share_token}.html").read_text()
+        assert "<h1>Coins &lt;&amp;&gt; Medals</h1>" in html
+
+        authenticated_client.delete(f"/api/collections/{test_collection.id}/share")
+
+        assert not link.exists() and not link.is_symlink()
+        response = authenticated_client.get(f"/api/collections/shared/{share_token}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_item_changes_republish_their_collections(
+        self, authenticated_client, test_collection, test_public_collection_with_share, test_item, snapshot_dir, monkeypatch
+    ):
+        """
+        Flow: Move an item into one of two shared collections with a bulk patch, then delete it
+        Expected: Only the collection the item is in is published each time
+        """
+        share_token = authenticated_client.post(f"/api/collections/{test_collection.id}/share").json()["share_token"]
+        published = []
+        write_snapshot = snapshots.write_snapshot
+        monkeypatch.setattr(
+            snapshots, "write_snapshot", lambda shared, token, html: published.append(token) or write_snapshot(shared, token, html)
+        )
+
+        authenticated_client.patch(
+            "/api/items/bulk", json={"ids": [test_item.id], "patch": {"collection_id": test_collection.id}}
+        )
+        assert published == [share_token]
+        assert len(authenticated_client.get(f"/api/collections/shared/{share_token}").json()["items"]) == 1
+
+        authenticated_client.delete(f"/api/items/{test_item.id}")
+        assert published == [share_token, share_token]
+        assert authenticated_client.get(f"/api/collections/shared/{share_token}").json()["items"] == []
+
+    async def test_reconcile(self, test_session, test_public_collection_with_share, snapshot_dir, monkeypatch):
+        """
+        Flow: Reconcile with a collection shared without snapshot, a link of an unknown token and an old object
+        Expected: The collection is published, the stale link unlinked and the unreferenced object pruned
+        """
+        _, share_token = test_public_collection_with_share
+        stale_object = snapshot_dir / "objects" / "ab" / "abcdef.json"
+        stale_object.parent.mkdir(parents=True)
+        stale_object.write_bytes(b"{}")
+        (snapshot_dir / "tokens").mkdir()
+        os.symlink("../objects/ab/abcdef.json", snapshot_dir / "tokens" / "revoked.json")
+        monkeypatch.setattr(settings.shared_collections, "snapshot_retention_seconds", -1)
+
+        assert await reconcile_shared_collection_snapshots(test_session) == (1, 1, 1)
+
+        assert (snapshot_dir / "tokens" / f"{share_token}.json").resolve().exists()
+        assert not (snapshot_dir / "tokens" / "revoked.json").is_symlink()
+        assert not stale_object.exists()
+        assert await reconcile_shared_collection_snapshots(test_session) == (0, 0, 0)
+
+    async def test_reconcile_republishes_stale_snapshots(
+        self, test_session, test_public_collection_with_share, snapshot_dir
+    ):
+        """
+        Flow: Publish a shared collection, change it without publishing, then reconcile twice
+        Expected: The link is repointed at a snapshot of the change once, then left alone
+        """
+        collection, share_token = test_public_collection_with_share
+        await snapshots.publish_shared_collections(test_session, [collection.id])
+        first_object = (snapshot_dir / "tokens" / f"{share_token}.json").resolve()
+
+        await test_session.execute(update(Collection).where(Collection.id == collection.id).values(name="Renamed"))
+        await test_session.commit()
+
+        assert await reconcile_shared_collection_snapshots(test_session) == (1, 0, 0)
+        link = snapshot_dir / "tokens" / f"{share_token}.json"
+        assert link.resolve() != first_object
+        assert orjson.loads(link.read_bytes())["name"] == "Renamed"
+        assert await reconcile_shared_collection_snapshots(test_session) == (0, 0, 0)
+
+    async def test_publish_rereads_committed_state(
+        self, test_session, test_db_engine, test_public_collection_with_share, snapshot_dir
+    ):
+        """
+        Flow: Load a shared collection, commit a rename from another session, then publish it
+        Expected: The snapshot holds the committed name rather than the one loaded before
+        """
+        collection, share_token = test_public_collection_with_share
+        assert (await test_session.get(Collection, collection.id)).name == collection.name
+        async with AsyncSession(test_db_engine) as other_session:
+            await other_session.execute(update(Collection).where(Collection.id == collection.id).values(name="Newer"))
+            await other_session.commit()
+
+        await snapshots.publish_shared_collections(test_session, [collection.id])
+
+        link = snapshot_dir / "tokens" / f"{share_token}.json"
+        assert orjson.loads(link.read_bytes())["name"] == "Newer"
@@ -0,0 +1,144 @@
+"""Tests for the per-user counters and the tier item limits."""
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.dependency.tier import TIER_ITEM_LIMITS
+from jobs import JobRunner, enqueue_job
+from jobs.tasks import RECONCILE_USER_COUNTERS
+from models import UserCounters
+from settings import JobSettings
+from utils.enums import SubscriptionTier
+
+
+def item_payload(name: str) -> dict:
+    return {"name": name, "year": "2024", "material": "gold", "purchase_price": 100}
+
+
+async def get_counters(test_session, user_id) -> UserCounters:
+    test_session.expire_all()
+    return await test_session.get(UserCounters, user_id)
+
+
+@pytest.fixture
+def item_limits(monkeypatch):
+    """Lower the Free tier limit to 3 items."""
+    monkeypatch.setitem(TIER_ITEM_LIMITS, SubscriptionTier.FREE, 3)
+
+
+class TestUserCounters:
+    """Test that creating and deleting keeps the counters in sync."""
+
+    async def test_counters_follow_changes(self, authenticated_client, test_session, test_user, test_item):
+        """
+        Flow: Create an item (counting the existing one), bulk create 2, delete 1, bulk delete 1,
+              create and delete collections and dealers
+        Expected: Counters match the user's data after every step
+        """
+        created = authenticated_client.post("/api/items/", json=item_payload("One")).json()
+        assert (await get_counters(test_session, test_user.id)).items == 2
+
+        bulk = authenticated_client.post("/api/items/bulk", json=[item_payload("Two"), item_payload("Three")]).json()
+        assert (await get_counters(test_session, test_user.id)).items == 4
+
+        authenticated_client.delete(f"/api/items/{created['id']}")
+        authenticated_client.request("DELETE", "/api/items/bulk", json={"ids": [bulk["created"][0]["id"]]})
+        assert (await get_counters(test_session, test_user.id)).items == 2
+
+        collection = authenticated_client.post("/api/collections/", json={"name": "Gold"}).json()
+        authenticated_client.post("/api/collections/", json={"name": "Silver"})
+        authenticated_client.delete(f"/api/collections/{collection['id']}")
+        dealer = authenticated_client.post("/api/dealers/", json={"name": "Dealer"}).json()
+        authenticated_client.delete(f"/api/dealers/{dealer['id']}")
+        authenticated_client.post("/api/dealers/", json={"name": "Other"})
+
+        counters = await get_counters(test_session, test_user.id)
+        assert (counters.items, counters.collections, counters.dealers) == (2, 1, 1)
+
+    async def test_reconcile_job_corrects_drift(self, authenticated_client, test_session, test_user, test_item, test_db_engine):
+        """
+        Flow: Corrupt the counters -> run the reconciliation job
+        Expected: Counters recounted from the user's data
+        """
+        authenticated_client.post("/api/items/", json=item_payload("One"))
+        counters = await get_counters(test_session, test_user.id)
+        counters.items = 42
+        await test_session.commit()
+
+        session_factory = async_sessionmaker(test_db_engine, expire_on_commit=False)
+        async with session_factory() as session:
+            await enqueue_job(session, RECONCILE_USER_COUNTERS)
+            await session.commit()
+        assert await JobRunner(session_factory, JobSettings()).run_next() is True
+
+        assert (await get_counters(test_session, test_user.id)).items == 2
+
+
+class TestItemLimits:
+    """Test the item limits of the subscription tiers."""
+
+    def test_create_item_over_limit(self, authenticated_client, test_user, test_item, item_limits):
+        """
+        Flow: A Free user with 1 item (limit 3) creates 2 items, then a third
+        Expected: 201 twice, then 403 Forbidden
+        """
+        for name in ("One", "Two"):
+            assert authenticated_client.post("/api/items/", json=item_payload(name)).status_code == status.HTTP_201_CREATED
+
+        response = authenticated_client.post("/api/items/", json=item_payload("Three"))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "The Free tier is limited to 3 items, 0 more can be added"
+
+    def test_delete_frees_quota(self, authenticated_client, test_user, test_item, item_limits):
+        """
+        Flow: Fill the limit, delete an item, create one
+        Expected: Creation allowed again
+        """
+        authenticated_client.post("/api/items/bulk", json=[item_payload("One"), item_payload("Two")])
+        authenticated_client.delete(f"/api/items/{test_item.id}")
+
+        response = authenticated_client.post("/api/items/", json=item_payload("Three"))
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_bulk_create_over_limit(self, authenticated_client, test_user, test_item, item_limits):
+        """
+        Flow: A Free user with 1 item (limit 3) bulk creates 3 items
+        Expected: 403 Forbidden, nothing created
+        """
+        response = authenticated_client.post(
+            "/api/items/bulk", json=[item_payload("One"), item_payload("Two"), item_payload("Three")]
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "The Free tier is limited to 3 items, 2 more can be added"
+        assert len(authenticated_client.get("/api/items/").json()) == 1
+
+    def test_import_stops_at_limit(self, authenticated_client, test_user, test_item, item_limits, monkeypatch):
+        """
+        Flow: Import 4 rows in batches of 2 with room for 2 items
+        Expected: 403 Forbidden after the first batch was imported
+        """
+        monkeypatch.setattr("api.routes.items.ITEMS_IMPORT_BATCH_SIZE", 2)
+        rows = "".join(f"Coin {index},2024,gold,{index}\n" for index in range(4))
+
+        response = authenticated_client.post(
+            "/api/items/import", content="name,year,material,purchase_price\n" + rows, headers={"Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"].endswith("; 2 items before the limit were imported")
+        assert len(authenticated_client.get("/api/items/").json()) == 3
+
+    def test_pro_tier_is_unlimited(self, authenticated_client, test_user, test_item, item_limits):
+        """
+        Flow: A Pro user creates more items than the Free limit
+        Expected: All created
+        """
+        test_user.tier = SubscriptionTier.PRO
+
+        response = authenticated_client.post("/api/items/bulk", json=[item_payload(str(index)) for index in range(5)])
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.json()["created"]) == 5
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from schemas.cache import CacheStats
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: Any
+    expires_at: float
+    tags: tuple[Hashable, ...]
+
+
+class AsyncLRUCache:
+    """
+    In-process LRU cache whose entries expire after a TTL, for values loaded by coroutines.
+
+    Concurrent misses of a key are coalesced: the first read loads the value and the others
+    wait for its result instead of loading it again (single-flight). Entries carry tags, such
+    as the IDs of the rows they were built from, so a change can drop every entry it affects.
+
+    The cache is local to the process. Changes invalidate it in the process that made them,
+    so other workers may serve an entry until its TTL runs out.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        tags: Callable[[Any], Iterable[Hashable]] = lambda value: (),
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._tags_of = tags
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._keys_by_tag: dict[Hashable, set[Hashable]] = {}
+        self._loading: dict[Hashable, asyncio.Future[Any]] = {}
+        # Incremented by every invalidation, so loads that started before it are not cached
+        self._generation: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._coalesced: int = 0
+        self._evictions: int = 0
+        self._invalidations: int = 0
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value of `key`, loading it with `load` on a miss.
+
+        None is returned as loaded but never cached, so unknown keys cannot fill the cache.
+        If the read that is loading a key fails or is cancelled, the reads waiting for it
+        load the key themselves.
+        """
+        while True:
+            entry: CacheEntry | None = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.value
+                self._remove(key)
+
+            loading: asyncio.Future[Any] | None = self._loading.get(key)
+            if loading is None:
+                break
+            try:
+                value: Any = await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                if not loading.cancelled():
+                    raise
+                continue
+            self._coalesced += 1
+            return value
+
+        self._misses += 1
+        generation: int = self._generation
+        loading = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await load()
+        except BaseException:
+            loading.cancel()
+            raise
+        finally:
+            del self._loading[key]
+
+        loading.set_result(value)
+        if value is not None and generation == self._generation:
+            self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry of `key`."""
+        self._generation += 1
+        if key in self._entries:
+            self._remove(key)
+            self._invalidations += 1
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        """Drop every entry tagged with `tag`."""
+        self._generation += 1
+        for key in list(self._keys_by_tag.get(tag, ())):
+            self._remove(key)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def stats(self) -> CacheStats:
+        reads: int = self._hits + self._misses + self._coalesced
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+            size=len(self._entries),
+            hit_rate=(self._hits + self._coalesced) / reads if reads else 0.0,
+        )
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if key in self._entries:
+            self._remove(key)
+        tags: tuple[Hashable, ...] = tuple(self._tags_of(value))
+        self._entries[key] = CacheEntry(value=value, expires_at=time.monotonic() + self.ttl_seconds, tags=tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry: CacheEntry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys: set[Hashable] | None = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -0,0 +1,101 @@
+import codecs
+import csv
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+
+# Characters a single record may span, quoted line breaks included
+CSV_MAX_RECORD_SIZE = 64 * 1024
+
+
+def ends_in_quoted_field(line: str, delimiter: str, quoted: bool) -> bool:
+    """
+    Whether a line ends inside a quoted field, given whether it starts inside one.
+
+    Follows the `csv` module: a quote opens a quoted field only at the start of a field, two
+    quotes inside a quoted field are an escaped quote, and any other quote is literal.
+    """
+    field_start: int = -1 if quoted else 0
+    escaped_until: int = -1
+    for match in re.finditer(f'["{re.escape(delimiter)}]', line):
+        position: int = match.start()
+        if position < escaped_until:
+            continue
+        if quoted:
+            if line[position] == '"':
+                if line.startswith('"', position + 1):
+                    escaped_until = position + 2
+                else:
+                    quoted = False
+        elif line[position] == delimiter:
+            field_start = position + 1
+        elif position == field_start:
+            quoted = True
+    return quoted
+
+
+async def iter_csv_records(
+    chunks: AsyncIterable[bytes], delimiter: str = ",", max_record_size: int = CSV_MAX_RECORD_SIZE
+) -> AsyncIterator[tuple[int, list[str] | None]]:
+    """
+    Parse UTF-8 CSV incrementally from a stream of byte chunks, such as a request body.
+
+    Only the current record is held in memory, so input of any size is parsed in constant
+    memory. Quoted fields may span lines; blank lines are skipped. A record longer than
+    `max_record_size` characters, such as the rest of a file after an unbalanced quote that
+    opens a field, is dropped and parsing resumes on the line after it; so is a record left
+    open at the end of the input.
+
+    Yields:
+        The number of the line each record starts on, and the record's fields, or None for
+        a record that was dropped for being too long or unterminated
+
+    Raises:
+        UnicodeDecodeError: If the input is not valid UTF-8
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail: str = ""
+    line_number: int = 0
+    record_lines: list[str] = []
+    record_size: int = 0
+    record_start: int = 0
+    quoted: bool = False
+
+    async def lines() -> AsyncIterator[str | None]:
+        """Yield the lines of the input, None for a line longer than a record may be."""
+        nonlocal tail
+        overflow: bool = False
+        async for chunk in chunks:
+            *complete, tail = (tail + decoder.decode(chunk)).split("\n")
+            for line in complete:
+                yield None if overflow or len(line) > max_record_size else line
+                overflow = False
+            # Drop the start of an overlong line instead of buffering it until its end
+            if len(tail) > max_record_size:
+                tail, overflow = "", True
+        tail += decoder.decode(b"", final=True)
+        if tail or overflow:
+            yield None if overflow or len(tail) > max_record_size else tail
+
+    async for line in lines():
+        line_number += 1
+        if not record_lines:
+            if line is not None and not line.strip():
+                continue
+            record_start = line_number
+
+        if line is None or record_size + len(line) > max_record_size:
+            yield record_start, None
+            record_lines, record_size, quoted = [], 0, False
+            continue
+
+        record_lines.append(line)
+        record_size += len(line) + 1
+        # A record is complete at the end of a line outside any quoted field
+        quoted = ends_in_quoted_field(line, delimiter, quoted)
+        if not quoted:
+            yield record_start, next(csv.reader(["\n".join(record_lines)], delimiter=delimiter))
+            record_lines, record_size = [], 0
+
+    if record_lines:
+        # The input ended inside a quoted field
+        yield record_start, None
@@ -0,0 +1,29 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset values of the last returned row into an opaque, URL-safe cursor."""
+    raw: bytes = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """
+    Decode a cursor produced by `encode_cursor` back into its keyset values.
+
+    Raises:
+        ValueError: If the cursor is malformed or was not produced by `encode_cursor`.
+    """
+    try:
+        raw: bytes = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values: Any = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError("Malformed cursor") from error
+
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+
+    return values
@@ -0,0 +1,58 @@
+import gzip
+from collections.abc import Collection
+
+import brotli
+
+# Supported content codings, most preferred first
+CONTENT_ENCODINGS: tuple[str, ...] = ("br", "gzip")
+
+
+def compress(body: bytes) -> dict[str, bytes]:
+    """
+    Encode a body with every supported content coding at the highest compression level.
+
+    Meant for bodies that are compressed once and served many times. Codings that would not
+    make the body smaller are left out.
+    """
+    encoded: dict[str, bytes] = {
+        "br": brotli.compress(body, quality=11),
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    return {encoding: data for encoding, data in encoded.items() if len(data) < len(body)}
+
+
+def negotiate_encoding(accept_encoding: str | None, available: Collection[str]) -> str | None:
+    """
+    Choose the content coding of a response from an Accept-Encoding header value.
+
+    The coding with the highest q-value among `available` wins, ties going to the preferred
+    coding. `*` covers codings the header does not list and q=0 rules a coding out; without
+    the header, or when no available coding is acceptable, the body is sent unencoded.
+
+    Returns:
+        The chosen coding, or None to send the body unencoded
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *parameters = (token.strip() for token in part.split(";"))
+        weight: float = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.lower()] = weight
+
+    best: str | None = None
+    best_weight: float = 0.0
+    for encoding in CONTENT_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if encoding in available and weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
@@ -16,6 +16,14 @@ class Material(StrEnum):
     LEAD = "lead"
 
 
+class Currency(StrEnum):
+    """ISO 4217 code of the currency of a price."""
+
+    EUR = "EUR"
+    USD = "USD"
+    GBP = "GBP"
+
+
 class PriceType(StrEnum):
     """Price type for item price history tracking."""
 
@@ -23,6 +31,45 @@ class PriceType(StrEnum):
     CURRENT = "c"  # current market price
 
 
+class SubscriptionTier(StrEnum):
+    """Subscription tier of a user, deciding item limits and access to report export."""
+
+    FREE = "free"
+    ADVANCED = "advanced"
+    PRO = "pro"
+
+
+class JobStatus(StrEnum):
+    """Status of a background job, of the job runner or of report rendering."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class PriceBucket(StrEnum):
+    """Period of the buckets of a downsampled price series."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+
+class ItemSort(StrEnum):
+    """Whitelisted sort orders for item listings. A leading '-' sorts descending."""
+
+    NAME = "name"
+    NAME_DESC = "-name"
+    YEAR = "year"
+    YEAR_DESC = "-year"
+    PURCHASE_PRICE = "purchase_price"
+    PURCHASE_PRICE_DESC = "-purchase_price"
+    PURCHASE_DATE = "purchase_date"
+    PURCHASE_DATE_DESC = "-purchase_date"
+
+
 class ErrorCode(StrEnum):
     UNKNOWN_ERROR = "000001"
 
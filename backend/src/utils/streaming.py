@@ -0,0 +1,95 @@
+import csv
+import io
+from collections.abc import AsyncGenerator, Sequence
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.serialization import RowSerializer
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Rows fetched from the server-side cursor and sent to the client per chunk
+STREAM_PARTITION_SIZE = 500
+
+# First characters that make a spreadsheet evaluate a cell as a formula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_csv_cell(value: Any) -> Any:
+    """Prefix text that a spreadsheet would run as a formula with a quote, so it is shown as text."""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+async def stream_partitions(
+    session: AsyncSession, query: Select[Any], scalars: bool = False
+) -> AsyncGenerator[Sequence[Any], None]:
+    """
+    Run a query on a server-side cursor and yield its rows one partition at a time.
+
+    Only one partition of rows is held in memory at a time, so memory use does not depend on
+    the size of the result. The query runs once the response body starts being sent, which is
+    after request-scoped dependencies have been torn down, so the generator closes the session
+    itself when the stream ends and the route must not use the session after handing it over.
+
+    Args:
+        session: Database session, owned by the stream from now on
+        query: The query to stream
+        scalars: Whether rows hold a single ORM entity rather than labelled columns
+    """
+    try:
+        result = await session.stream(query.execution_options(yield_per=STREAM_PARTITION_SIZE))
+        rows = result.scalars() if scalars else result
+        async for partition in rows.partitions():
+            yield partition
+    finally:
+        await session.close()
+
+
+async def stream_ndjson(
+    session: AsyncSession,
+    query: Select[Any],
+    serializer: RowSerializer,
+    scalars: bool = False,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream the rows of a query as NDJSON, one line per row, see `stream_partitions`.
+
+    Args:
+        session: Database session, owned by the stream from now on
+        query: The query to stream
+        serializer: Serializer of the read schema each row is encoded as
+        scalars: Whether rows hold a single ORM entity rather than labelled columns
+    """
+    async for partition in stream_partitions(session, query, scalars):
+        yield serializer.dumps_lines(partition)
+
+
+async def stream_csv(session: AsyncSession, query: Select[Any], header: Sequence[str]) -> AsyncGenerator[bytes, None]:
+    """
+    Stream the rows of a query as UTF-8 CSV after a header line, see `stream_partitions`.
+
+    Columns are written in the order the query selects them; None becomes an empty cell.
+    Text cells are escaped with `escape_csv_cell`, as user input may be opened in a spreadsheet.
+
+    Args:
+        session: Database session, owned by the stream from now on
+        query: The query to stream
+        header: Column names written on the first line
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    async for partition in stream_partitions(session, query):
+        writer.writerows([escape_csv_cell(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()